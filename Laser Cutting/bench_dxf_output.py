@@ -0,0 +1,98 @@
+#Vihaan Shah
+#UNI: vvs2119
+#MECE4606 Digital Manufacturing
+#Laser Cutting Project - DXF vs SVG output benchmark
+#
+# First checks that every CUT polyline read back from write_box_dxf is the
+# panel outline at its layout position (y flipped, within the written
+# precision), then compares DXF against write_box_svg for file size, write
+# time and peak Python memory (tracemalloc) on a few box sizes.
+#
+# Usage:
+#   python bench_dxf_output.py
+
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+import dxf_export
+import laser_cutting_fixed as lcf
+
+# =========================
+# Round-trip check
+# =========================
+def check_round_trip(out_dir, precision=3):
+    """Every panel of a spread of boxes. Returns the number of outlines checked."""
+    rng = np.random.default_rng(0)
+    path = os.path.join(out_dir, "check.dxf")
+    cases = 0
+    for w, h, d in rng.uniform(100, 600, size=(40, 3)).round(2):
+        panels = lcf.generate_box_panels(w, h, d)
+        layout = lcf.layout_box(w, h, d)
+        dxf_export.write_box_dxf(path, panels, layout, validate=False, precision=precision)
+        polylines = dxf_export.read_polylines(path)
+        if len(polylines) != len(lcf.PANEL_NAMES):
+            raise AssertionError(f"{w}x{h}x{d}: {len(polylines)} polylines for {len(lcf.PANEL_NAMES)} panels")
+        for name, poly in zip(lcf.PANEL_NAMES, polylines):
+            expected = np.asarray(panels[name]) + np.asarray(layout.centers[name])
+            if np.array_equal(expected[0], expected[-1]):
+                expected = expected[:-1]
+            expected[:, 1] = layout.view_h - expected[:, 1]
+            if not poly.closed or poly.layer != "CUT" or poly.points.shape != expected.shape:
+                raise AssertionError(f"{w}x{h}x{d} {name}: wrong polyline")
+            if np.abs(poly.points - expected).max() > 0.5 * 10 ** -precision + 1e-9:
+                raise AssertionError(f"{w}x{h}x{d} {name}: vertices do not match the outline")
+            cases += 1
+    return cases
+
+# =========================
+# Size / time / memory
+# =========================
+def _measure(write, path, repeat):
+    best = float("inf")
+    for _ in range(3):
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            write(path)
+        best = min(best, (time.perf_counter() - t0) / repeat)
+    tracemalloc.start()
+    write(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, os.path.getsize(path), peak
+
+def bench(label, w, h, d, tw_=lcf.tw, repeat=20, out_dir="."):
+    panels = lcf.generate_box_panels(w, h, d, tw=tw_)
+    layout = lcf.layout_box(w, h, d)
+    n_pts = sum(len(p) for p in panels.values())
+    writers = [
+        ("svg polygon", "bench.svg",
+         lambda p: lcf.write_box_svg(p, panels, layout, validate=False, expand_instances=True)),
+        ("svg path p=3", "bench.svg",
+         lambda p: lcf.write_box_svg(p, panels, layout, validate=False, outline_format="path", expand_instances=True)),
+        ("dxf p=3", "bench.dxf", lambda p: dxf_export.write_box_dxf(p, panels, layout, validate=False)),
+    ]
+    base = None
+    for i, (name, file_name, write) in enumerate(writers):
+        t, size, peak = _measure(write, os.path.join(out_dir, file_name), repeat)
+        base = base or (t, size)
+        label_col = f"{label:<28} {n_pts:>6} pts" if i == 0 else f"{'':<28} {'':>6}    "
+        print(f"  {label_col}  {name:<13}{size:>9} B {t * 1e3:8.2f} ms {peak / 1024:8.0f} KiB peak "
+              f"(x{size / base[1]:4.2f} size, x{base[0] / t:4.2f} speed)")
+
+def main():
+    with tempfile.TemporaryDirectory() as out_dir:
+        t0 = time.perf_counter()
+        cases = check_round_trip(out_dir)
+        print(f"Round trip: {cases} DXF polylines match the panel outlines ({time.perf_counter() - t0:.1f} s)")
+
+        print("Write time (best of 3), file size and peak memory against the SVG writer:")
+        bench("200 x 120 x 150 box", 200.0, 120.0, 150.0, out_dir=out_dir)
+        bench("600 x 400 x 500 box", 600.0, 400.0, 500.0, out_dir=out_dir)
+        bench("1500 x 1000 x 1200, 3 mm tabs", 1500.0, 1000.0, 1200.0, tw_=3.0, repeat=5, out_dir=out_dir)
+
+if __name__ == "__main__":
+    main()
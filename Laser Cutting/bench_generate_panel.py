@@ -0,0 +1,246 @@
+#Vihaan Shah
+#UNI: vvs2119
+#MECE4606 Digital Manufacturing
+#Laser Cutting Project - generate_panel benchmark
+#
+# Checks that generate_panel (the per-side loop) and the NumPy edge kernel
+# behind generate_panel_array return exactly the same points as the original
+# per-segment loops, then times all three on small boxes and on large
+# fine-tab panels. generate_panel must be no slower than the original at any
+# size: every box job goes through it.
+#
+# Usage:
+#   python bench_generate_panel.py
+
+import itertools
+import sys
+import time
+
+import laser_cutting_fixed as lcf
+from laser_cutting_fixed import _segments_count, mt, tw, cl, cr
+
+# ==========================================================
+# Reference: the original per-segment loop implementation
+# ==========================================================
+def generate_panel_loop(face_w, face_h, edge_mode, slot_parity=0, mt=mt, tw=tw, cl=cl, cr=cr):
+    """
+    edge_mode: dict with keys {"top","right","bottom","left"} each in {"TAB","SLOT","NONE"}
+      TAB  => protrude outward on odd segments
+      SLOT => indent inward on slot_parity segments
+      NONE => straight edge (no tabs/slots)
+    """
+    half_w = face_w / 2.0
+    half_h = face_h / 2.0
+
+    n_w = _segments_count(face_w, tw, cl, cr)
+    n_h = _segments_count(face_h, tw, cl, cr)
+
+    pts = []
+
+    # ---------- TOP edge ----------
+    x0, y0 = -half_w,  half_h
+    pts.append((x0, y0))
+
+    if edge_mode["top"] == "NONE":
+        pts.append((half_w, y0))
+    else:
+        x = x0 + cl
+        y = y0
+        pts.append((x, y))
+
+        for i in range(n_w):
+            if edge_mode["top"] == "TAB":
+                if i % 2 == 1:
+                    pts.append((x, y + mt))
+                    x += tw
+                    pts.append((x, y + mt))
+                    pts.append((x, y))
+                else:
+                    x += tw
+                    pts.append((x, y))
+            else:  # SLOT
+                if i % 2 == slot_parity:
+                    pts.append((x, y - mt))
+                    x += tw
+                    pts.append((x, y - mt))
+                    pts.append((x, y))
+                else:
+                    x += tw
+                    pts.append((x, y))
+
+        x = half_w
+        pts.append((x, y))
+
+    # ---------- RIGHT edge ----------
+    x = half_w
+
+    if edge_mode["right"] == "NONE":
+        pts.append((x, -half_h))
+    else:
+        y = half_h - cl
+        pts.append((x, y))
+
+        for i in range(n_h):
+            if edge_mode["right"] == "TAB":
+                if i % 2 == 1:
+                    pts.append((x + mt, y))
+                    y -= tw
+                    pts.append((x + mt, y))
+                    pts.append((x, y))
+                else:
+                    y -= tw
+                    pts.append((x, y))
+            else:  # SLOT
+                if i % 2 == slot_parity:
+                    pts.append((x - mt, y))
+                    y -= tw
+                    pts.append((x - mt, y))
+                    pts.append((x, y))
+                else:
+                    y -= tw
+                    pts.append((x, y))
+
+        y = -half_h
+        pts.append((x, y))
+
+    # ---------- BOTTOM edge ----------
+    y = -half_h
+
+    if edge_mode["bottom"] == "NONE":
+        pts.append((-half_w, y))
+    else:
+        x = half_w - cl
+        pts.append((x, y))
+
+        for i in range(n_w):
+            if edge_mode["bottom"] == "TAB":
+                if i % 2 == 1:
+                    pts.append((x, y - mt))
+                    x -= tw
+                    pts.append((x, y - mt))
+                    pts.append((x, y))
+                else:
+                    x -= tw
+                    pts.append((x, y))
+            else:  # SLOT
+                if i % 2 == slot_parity:
+                    pts.append((x, y + mt))
+                    x -= tw
+                    pts.append((x, y + mt))
+                    pts.append((x, y))
+                else:
+                    x -= tw
+                    pts.append((x, y))
+
+        x = -half_w
+        pts.append((x, y))
+
+    # ---------- LEFT edge ----------
+    x = -half_w
+
+    if edge_mode["left"] == "NONE":
+        pts.append((x, half_h))
+    else:
+        y = -half_h + cl
+        pts.append((x, y))
+
+        for i in range(n_h):
+            if edge_mode["left"] == "TAB":
+                if i % 2 == 1:
+                    pts.append((x - mt, y))
+                    y += tw
+                    pts.append((x - mt, y))
+                    pts.append((x, y))
+                else:
+                    y += tw
+                    pts.append((x, y))
+            else:  # SLOT
+                if i % 2 == slot_parity:
+                    pts.append((x + mt, y))
+                    y += tw
+                    pts.append((x + mt, y))
+                    pts.append((x, y))
+                else:
+                    y += tw
+                    pts.append((x, y))
+
+        y = half_h
+        pts.append((x, y))
+
+    return pts
+
+# =========================
+# Exactness check
+# =========================
+MODES = ("TAB", "SLOT", "NONE")
+SIDES = ("top", "right", "bottom", "left")
+
+def check_exact():
+    """Every edge-mode combination, both parities, a spread of sizes and materials."""
+    cases = 0
+    sizes = (20.0, 37.5, 100.0, 123.4, 250.0, 601.0, 2000.0)
+    materials = ((3.0, 9.0), (6.0, 12.0), (3.0, 3.0))
+    for face_w, face_h in itertools.product(sizes, repeat=2):
+        for m, t in materials:
+            for modes in itertools.product(MODES, repeat=4):
+                edge_mode = dict(zip(SIDES, modes))
+                for parity in (0, 1):
+                    old = generate_panel_loop(face_w, face_h, edge_mode, parity, mt=m, tw=t)
+                    new = lcf.generate_panel(face_w, face_h, edge_mode, parity, mt=m, tw=t)
+                    kernel = lcf._kernel_points(face_w, face_h, edge_mode, parity, m, t, cl, cr)
+                    if old != new or old != list(zip(kernel[:, 0].tolist(), kernel[:, 1].tolist())):
+                        raise AssertionError(f"mismatch for {face_w}x{face_h} {edge_mode} parity={parity} mt={m} tw={t}")
+                    cases += 1
+    return cases
+
+# =========================
+# Timing
+# =========================
+NOISE = 1.10  # list time / original time still counted as "no slower"
+
+def _time(fns, repeat, rounds=11):
+    """Best time per call of each function; the functions take turns each round so drift hits all alike."""
+    best = [float("inf")] * len(fns)
+    for _ in range(rounds):
+        for k, fn in enumerate(fns):
+            t0 = time.perf_counter()
+            for _ in range(repeat):
+                fn()
+            best[k] = min(best[k], (time.perf_counter() - t0) / repeat)
+    return best
+
+def bench(label, face_w, face_h, edge_mode, parity, mt_=mt, tw_=tw, repeat=200):
+    """Prints one timing row; returns list time / original loop time."""
+    args = (face_w, face_h, edge_mode, parity)
+    t_loop, t_list, t_array = _time((lambda: generate_panel_loop(*args, mt=mt_, tw=tw_),
+                                     lambda: lcf.generate_panel(*args, mt=mt_, tw=tw_),
+                                     lambda: lcf.generate_panel_array(*args, mt=mt_, tw=tw_)), repeat)
+    n_pts = len(lcf.generate_panel_array(*args, mt=mt_, tw=tw_))
+    print(f"  {label:<30} {n_pts:>6} pts  original {t_loop * 1e6:8.1f} us  "
+          f"list {t_list * 1e6:8.1f} us (x{t_loop / t_list:4.2f})  "
+          f"array {t_array * 1e6:8.1f} us (x{t_loop / t_array:4.2f})")
+    return t_list / t_loop
+
+def main():
+    t0 = time.perf_counter()
+    cases = check_exact()
+    print(f"Exactness: {cases} panels identical, list and kernel ({time.perf_counter() - t0:.1f} s)")
+
+    print("Timing (best of 11 interleaved rounds). list = generate_panel (tuples), array = generate_panel_array:")
+    ratios = [
+        bench("200 x 120 box face, 9 mm tabs", 200.0, 120.0, lcf.EDGE_MAP_FRONT_BACK, 1, repeat=2000),
+        bench("100 x 100 top, 9 mm tabs", 100.0, 100.0, lcf.EDGE_MAP_TOP_BOTTOM, 0, repeat=2000),
+        bench("600 x 600 top, 9 mm tabs", 600.0, 600.0, lcf.EDGE_MAP_TOP_BOTTOM, 0, repeat=1000),
+        bench("2000 x 1000 side, 3 mm tabs", 2000.0, 1000.0, lcf.EDGE_MAP_SIDES, 1, tw_=3.0, repeat=100),
+        bench("2000 x 2000 top, 3 mm tabs", 2000.0, 2000.0, lcf.EDGE_MAP_TOP_BOTTOM, 0, tw_=3.0, repeat=100),
+        bench("5000 x 5000 top, 3 mm tabs", 5000.0, 5000.0, lcf.EDGE_MAP_TOP_BOTTOM, 0, tw_=3.0, repeat=20),
+    ]
+    # Tiny faces take under 10 us either way, where run-to-run noise is a few percent
+    worst = max(ratios)
+    ok = worst <= NOISE
+    print(f"generate_panel vs the original loop: worst case x{1 / worst:.2f} "
+          f"({'no slower' if ok else 'SLOWER'}, {(NOISE - 1) * 100:.0f}% noise allowed)")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
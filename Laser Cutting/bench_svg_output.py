@@ -0,0 +1,125 @@
+#Vihaan Shah
+#UNI: vvs2119
+#MECE4606 Digital Manufacturing
+#Laser Cutting Project - SVG outline output benchmark
+#
+# Compares write_box_svg's two outline formats: the original translated
+# <polygon> with full float points, and the compact <path> with relative
+# h/v moves (points_to_path_d), each written out per panel or once per
+# distinct outline as <symbol>/<use>. First checks that every path decodes back
+# to the polygon corners within half a unit of the last decimal (the path
+# leaves out vertices in the middle of straight runs), then
+# reports file size and write time for a few box sizes and precisions.
+#
+# Usage:
+#   python bench_svg_output.py
+
+import os
+import re
+import tempfile
+import time
+
+import numpy as np
+
+import laser_cutting_fixed as lcf
+
+# =========================
+# Round-trip check
+# =========================
+_COMMAND = re.compile(r"([MhvlzHVLZ])([^MhvlzHVLZ]*)")
+
+def decode_path_d(d):
+    """Absolute vertices of a points_to_path_d string (M, h, v, l, z only)."""
+    pts = []
+    x = y = 0.0
+    for cmd, args in _COMMAND.findall(d):
+        nums = [float(v) for v in args.replace(",", " ").split()]
+        if cmd == "M":
+            x, y = nums
+        elif cmd == "h":
+            x += nums[0]
+        elif cmd == "v":
+            y += nums[0]
+        elif cmd == "l":
+            x += nums[0]
+            y += nums[1]
+        elif cmd == "z":
+            continue
+        else:
+            raise ValueError(f"unexpected command {cmd!r}")
+        pts.append((x, y))
+    return np.array(pts)
+
+def corners(pts):
+    """Closed outline without its repeated last point and without straight-through vertices."""
+    pts = np.asarray(pts, dtype=float)
+    if len(pts) > 1 and np.allclose(pts[0], pts[-1]):
+        pts = pts[:-1]
+    step_in = pts - np.roll(pts, 1, axis=0)
+    step_out = np.roll(pts, -1, axis=0) - pts
+    cross = step_in[:, 0] * step_out[:, 1] - step_in[:, 1] * step_out[:, 0]
+    dot = (step_in * step_out).sum(axis=1)
+    keep = (np.abs(cross) > 1e-9) | (dot <= 0)
+    keep[0] = True
+    return pts[keep]
+
+def check_round_trip(precisions=(0, 1, 2, 3, 4)):
+    """Every panel of a spread of boxes, every precision. Returns the number of outlines checked."""
+    rng = np.random.default_rng(0)
+    cases = 0
+    for w, h, d in rng.uniform(100, 600, size=(40, 3)).round(2):
+        panels = lcf.generate_box_panels(w, h, d)
+        layout = lcf.layout_box(w, h, d)
+        for name, pts in panels.items():
+            expected = corners(pts) + np.asarray(layout.centers[name])
+            for p in precisions:
+                got = decode_path_d(lcf.points_to_path_d(pts, p, layout.centers[name]))
+                # One rounding of the absolute point, then exact integer steps
+                tol = 0.5 * 10 ** -p + 1e-9
+                if got.shape != expected.shape or np.abs(got - expected).max() > tol:
+                    raise AssertionError(f"{w}x{h}x{d} {name} precision {p}: path does not match polygon")
+                cases += 1
+    return cases
+
+# =========================
+# Size / time
+# =========================
+def _write(path, panels, layout, repeat, **options):
+    best = float("inf")
+    for _ in range(3):
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            lcf.write_box_svg(path, panels, layout, validate=False, **options)
+        best = min(best, (time.perf_counter() - t0) / repeat)
+    return best, os.path.getsize(path)
+
+def bench(label, w, h, d, tw_=lcf.tw, repeat=50, out_dir="."):
+    panels = lcf.generate_box_panels(w, h, d, tw=tw_)
+    layout = lcf.layout_box(w, h, d)
+    path = os.path.join(out_dir, "bench.svg")
+    n_pts = sum(len(p) for p in panels.values())
+    t_poly, size_poly = _write(path, panels, layout, repeat, expand_instances=True)
+    print(f"  {label:<28} {n_pts:>6} pts  polygon           {size_poly:>8} B {t_poly * 1e3:7.2f} ms")
+    variants = [("polygon, instanced", dict(outline_format="polygon"))]
+    for p in (3, 2, 1):
+        variants.append((f"path p={p}", dict(outline_format="path", precision=p, expand_instances=True)))
+    variants.append(("path p=3, instanced", dict(outline_format="path", precision=3)))
+    for name, options in variants:
+        t_other, size_other = _write(path, panels, layout, repeat, **options)
+        print(f"  {'':<28} {'':>6}      {name:<19}{size_other:>8} B {t_other * 1e3:7.2f} ms "
+              f"({size_other / size_poly * 100:5.1f}% size, x{t_poly / t_other:4.2f} speed)")
+
+def main():
+    t0 = time.perf_counter()
+    cases = check_round_trip()
+    print(f"Round trip: {cases} outlines decode to the polygon points ({time.perf_counter() - t0:.1f} s)")
+
+    print("Write time (best of 3) and file size against one full <polygon> per panel:")
+    with tempfile.TemporaryDirectory() as out_dir:
+        bench("200 x 120 x 150 box", 200.0, 120.0, 150.0, out_dir=out_dir)
+        bench("123.4 x 217.9 x 301.3 box", 123.4, 217.9, 301.3, out_dir=out_dir)
+        bench("600 x 400 x 500 box", 600.0, 400.0, 500.0, repeat=20, out_dir=out_dir)
+        bench("1500 x 1000 x 1200, 3 mm tabs", 1500.0, 1000.0, 1200.0, tw_=3.0, repeat=5, out_dir=out_dir)
+
+if __name__ == "__main__":
+    main()
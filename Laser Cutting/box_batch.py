@@ -0,0 +1,356 @@
+#Vihaan Shah
+#UNI: vvs2119
+#MECE4606 Digital Manufacturing
+#Laser Cutting Project - BATCH MODE
+#
+# Generates many boxes from a CSV or JSON manifest without any prompts.
+# Each row becomes one SVG (same writer as laser_cutting_fixed.py), jobs are
+# spread across a multiprocessing pool and a timing report is written at the end.
+#
+# Manifest columns / keys (only length, width, height are required):
+#   name, length, width, height, material_thickness, tab_width,
+#   art_path, art_target, text, text_target, text_size, material, kerf
+# material is a kerf.py MATERIALS name; it supplies the thickness and kerf
+# unless material_thickness / kerf are given explicitly.
+#
+# Every box also goes through fit_check.verify_box; the result is reported
+# (fit column, fit_* keys in the JSON) but does not fail the job.
+#
+# Usage:
+#   python box_batch.py boxes.csv --out out_svgs --processes 8 --report report.json
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+from types import SimpleNamespace
+
+import fit_check
+import kerf
+import laser_cutting_fixed as lcf
+import panel_cache
+import profiling
+
+# =========================
+# Manifest loading
+# =========================
+NUMBER_FIELDS = ("length", "width", "height", "material_thickness", "tab_width", "text_size", "kerf")
+# Not allowed in a box name, which becomes the output file name
+NAME_FORBIDDEN = set('/\\:*?"<>|')
+
+def _clean_row(row, index):
+    """Normalise one manifest row (CSV strings or JSON values) into a job spec."""
+    if not isinstance(row, dict):
+        raise ValueError(f"row {index}: expected an object with length, width, height, got {row!r}")
+    row = {k.strip(): v for k, v in row.items() if k is not None}
+    for key, value in list(row.items()):
+        if isinstance(value, str):
+            value = value.strip()
+            row[key] = value if value != "" else None
+
+    for key in NUMBER_FIELDS:
+        if row.get(key) is not None:
+            try:
+                row[key] = float(row[key])
+            except (TypeError, ValueError):
+                raise ValueError(f"row {index}: {key} must be a number, got {row[key]!r}")
+
+    for key in ("length", "width", "height"):
+        if row.get(key) is None:
+            raise ValueError(f"row {index}: missing {key}")
+
+    mat = None
+    if row.get("material"):
+        try:
+            mat = kerf.material(row["material"])
+        except ValueError as e:
+            raise ValueError(f"row {index}: {e}")
+    thickness = row.get("material_thickness")
+    if thickness is None:
+        thickness = mat.thickness if mat else lcf.material_thickness
+    tab_width = row.get("tab_width")
+    if tab_width is None:
+        tab_width = lcf.tab_width
+    if thickness <= 0 or tab_width <= 0:
+        raise ValueError(f"row {index}: material_thickness and tab_width must be > 0")
+    kerf_mm = row.get("kerf")
+    if kerf_mm is None:
+        kerf_mm = mat.kerf if mat else 0.0
+    if kerf_mm < 0:
+        raise ValueError(f"row {index}: kerf must be >= 0")
+
+    name = row.get("name")
+    if name is None:
+        name = f"box_{index:04d}"
+    name = str(name)
+    if name.startswith(".") or any(c in NAME_FORBIDDEN or ord(c) < 32 for c in name):
+        raise ValueError(f"row {index}: name {name!r} cannot be used as a file name "
+                         "(no path separators, leading '.' or :*?\"<>|)")
+    return SimpleNamespace(
+        index=index,
+        name=name,
+        length=row["length"],
+        width=row["width"],
+        height=row["height"],
+        material_thickness=thickness,
+        tab_width=tab_width,
+        art_path=row.get("art_path"),
+        art_target=(row.get("art_target") or "FRONT").upper(),
+        text=row.get("text"),
+        text_target=(row.get("text_target") or "FRONT").upper(),
+        text_size=row.get("text_size"),
+        material=mat.name if mat else None,
+        kerf=kerf_mm,
+    )
+
+@profiling.timed("input_parsing")
+def load_manifest(path):
+    """
+    Reads a .csv (header row) or .json manifest.
+    JSON may be a list of objects or {"boxes": [...]}.
+    Box names must be unique, since each names its output file.
+    """
+    if path.lower().endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get("boxes", [])
+        if not isinstance(data, list):
+            raise ValueError('JSON manifest must be a list of boxes or {"boxes": [...]}')
+        rows = data
+    else:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+
+    specs = [_clean_row(row, i) for i, row in enumerate(rows)]
+    first = {}
+    for spec in specs:
+        if spec.name in first:
+            raise ValueError(f"row {spec.index}: duplicate name {spec.name!r} (also row {first[spec.name]})")
+        first[spec.name] = spec.index
+    return specs
+
+# =========================
+# One job (runs in a worker)
+# =========================
+# One panel cache per process, made by the first job that runs there
+_panel_cache = None
+
+def _worker_cache(options):
+    global _panel_cache
+    if not options.get("panel_cache", True):
+        return None
+    if _panel_cache is None:
+        _panel_cache = panel_cache.PanelCache()
+    return _panel_cache
+
+def run_job(job):
+    """
+    Generates one box SVG. Never raises: failures are reported in the result
+    so one bad row does not stop the batch.
+    """
+    spec, out_dir, options = job
+    out_path = os.path.join(out_dir, f"{spec.name}.svg")
+    result = {
+        "index": spec.index,
+        "name": spec.name,
+        "output": out_path,
+        "ok": False,
+        "error": None,
+        "generate_s": 0.0,
+        "write_s": 0.0,
+        "total_s": 0.0,
+        "bytes": 0,
+        "fit_ok": None,
+        "fit_mismatch_mm": None,
+        "fit_flipped": [],
+        "cache_hits": 0,
+        "cache_misses": 0,
+    }
+
+    t_start = time.perf_counter()
+    try:
+        lcf.validate_box_dimensions(spec.length, spec.width, spec.height)
+
+        w = spec.width
+        h = spec.height
+        d = spec.length
+        mt = spec.material_thickness
+
+        cache = _worker_cache(options)
+        if cache is not None:
+            looked_up = cache.hits
+            generated = cache.misses
+        panels = kerf.apply_kerf(lcf.generate_box_panels(w, h, d, mt=mt, tw=spec.tab_width, cache=cache), spec.kerf)
+        if cache is not None:
+            result["cache_hits"] = cache.hits - looked_up
+            result["cache_misses"] = cache.misses - generated
+        layout = lcf.layout_box(w, h, d, mt=mt)
+        t_generated = time.perf_counter()
+
+        art = None
+        if spec.art_path:
+            if spec.art_target not in lcf.PANEL_NAMES:
+                raise ValueError(f"unknown art_target {spec.art_target!r}")
+            art = lcf.load_art(spec.art_path, spec.art_target)
+            if art is None:
+                raise ValueError(f"could not read/parse PNG {spec.art_path!r}")
+
+        text = None
+        if spec.text:
+            if spec.text_target not in lcf.PANEL_NAMES:
+                raise ValueError(f"unknown text_target {spec.text_target!r}")
+            font_size = spec.text_size
+            if not font_size or font_size <= 0:
+                pw, ph = layout.sizes[spec.text_target]
+                font_size = lcf.calculate_auto_font_size(spec.text, pw, ph)
+            text = SimpleNamespace(content=spec.text, target=spec.text_target, font_size=font_size)
+
+        lcf.write_box_svg(out_path, panels, layout, art=art, text=text,
+                          optimise_order=options.get("optimise_order", False),
+                          image_mode=options.get("image_mode", "embed"),
+                          outline_format=options.get("outline_format", "polygon"),
+                          precision=options.get("precision", lcf.path_precision),
+                          expand_instances=options.get("expand_instances", False))
+        t_written = time.perf_counter()
+
+        fit = fit_check.verify_box(panels, w, h, d, mt=mt, kerf=spec.kerf)
+        result["fit_ok"] = fit.ok
+        result["fit_mismatch_mm"] = round(fit.mismatch_mm, 3)
+        result["fit_flipped"] = fit.flipped
+
+        result["ok"] = True
+        result["generate_s"] = t_generated - t_start
+        result["write_s"] = t_written - t_generated
+        result["bytes"] = os.path.getsize(out_path)
+    except Exception as e:
+        result["error"] = str(e)
+
+    result["total_s"] = time.perf_counter() - t_start
+    return result
+
+def _pool_job(job):
+    """run_job in a pool worker; the worker's profile counters go back with the result."""
+    result = run_job(job)
+    if profiling.ENABLED:
+        result["_stages"] = profiling.take_stages()
+    return result
+
+# =========================
+# Batch driver and report
+# =========================
+def run_batch(specs, out_dir, processes=None, **options):
+    """
+    Runs every spec through a multiprocessing pool.
+    processes=None uses os.cpu_count(); processes=1 runs in this process.
+    options are passed to every job (optimise_order=True, image_mode="link",
+    outline_format="path", precision=2, expand_instances=True,
+    panel_cache=False).
+    Returns (results sorted by manifest order, wall-clock seconds).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(spec, out_dir, options) for spec in specs]
+
+    t_start = time.perf_counter()
+    if processes == 1 or len(jobs) <= 1:
+        results = [run_job(job) for job in jobs]
+    else:
+        n_proc = processes or os.cpu_count() or 1
+        chunksize = max(1, len(jobs) // (n_proc * 4))
+        with Pool(processes=n_proc, initializer=profiling.reset) as pool:
+            results = list(pool.imap_unordered(_pool_job, jobs, chunksize=chunksize))
+        for r in results:
+            profiling.merge_stages(r.pop("_stages", {}))
+    wall_s = time.perf_counter() - t_start
+
+    results.sort(key=lambda r: r["index"])
+    return results, wall_s
+
+def summarize(results, wall_s):
+    ok = [r for r in results if r["ok"]]
+    times = sorted(r["total_s"] for r in ok)
+    summary = {
+        "jobs": len(results),
+        "succeeded": len(ok),
+        "failed": len(results) - len(ok),
+        "wall_s": wall_s,
+        "cpu_s": sum(r["total_s"] for r in results),
+        "jobs_per_s": (len(results) / wall_s) if wall_s > 0 else 0.0,
+        "bytes_written": sum(r["bytes"] for r in ok),
+        "job_s_min": times[0] if times else 0.0,
+        "job_s_median": times[len(times) // 2] if times else 0.0,
+        "job_s_max": times[-1] if times else 0.0,
+        "fit_failed": sum(1 for r in ok if r["fit_ok"] is False),
+        "cache_hits": sum(r["cache_hits"] for r in results),
+        "cache_misses": sum(r["cache_misses"] for r in results),
+    }
+    return summary
+
+def print_report(results, summary):
+    print("=" * 60)
+    print("BATCH SUMMARY:")
+    print("=" * 60)
+    for r in results:
+        status = "ok  " if r["ok"] else "FAIL"
+        line = f"  {status} {r['name']:<24} {r['total_s'] * 1000:8.2f} ms"
+        if r["fit_ok"] is not None:
+            line += "  fit ok" if r["fit_ok"] else f"  fit {r['fit_mismatch_mm']:.2f} mm off"
+        if r["error"]:
+            line += f"  ({r['error']})"
+        print(line)
+    print("-" * 60)
+    print(f"  Jobs:      {summary['succeeded']}/{summary['jobs']} succeeded")
+    print(f"  Wall time: {summary['wall_s']:.3f} s ({summary['jobs_per_s']:.1f} jobs/s)")
+    print(f"  Job time:  min {summary['job_s_min'] * 1000:.2f} ms, "
+          f"median {summary['job_s_median'] * 1000:.2f} ms, max {summary['job_s_max'] * 1000:.2f} ms")
+    print(f"  Written:   {summary['bytes_written']} bytes")
+    print(f"  Fit:       {summary['succeeded'] - summary['fit_failed']}/{summary['succeeded']} boxes assemble cleanly")
+    lookups = summary["cache_hits"] + summary["cache_misses"]
+    if lookups:
+        print(f"  Panels:    {summary['cache_hits']}/{lookups} outlines from the panel cache")
+    print("=" * 60)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate box SVGs from a CSV/JSON manifest.")
+    parser.add_argument("manifest", help="CSV or JSON file with one box per row")
+    parser.add_argument("--out", default="batch_svgs", help="output directory for SVGs")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--report", default=None, help="write the JSON summary report here")
+    parser.add_argument("--optimise-order", action="store_true", help="order panels to minimise laser head travel")
+    parser.add_argument("--link-images", action="store_true", help="reference PNGs by path instead of embedding them")
+    parser.add_argument("--compact", action="store_true", help="write outlines as compact relative <path> data")
+    parser.add_argument("--precision", type=int, default=lcf.path_precision,
+                        choices=range(lcf.MAX_PATH_PRECISION + 1), help="decimals kept with --compact")
+    parser.add_argument("--expand-instances", action="store_true",
+                        help="write every panel in full instead of <symbol>/<use> (for cutters without <use>)")
+    parser.add_argument("--no-cache", action="store_true", help="generate every panel from scratch")
+    args = parser.parse_args(argv)
+
+    try:
+        specs = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"Could not read manifest: {e}")
+        return 1
+
+    results, wall_s = run_batch(specs, args.out, processes=args.processes,
+                                optimise_order=args.optimise_order,
+                                image_mode="link" if args.link_images else "embed",
+                                outline_format="path" if args.compact else "polygon",
+                                precision=args.precision,
+                                expand_instances=args.expand_instances,
+                                panel_cache=not args.no_cache)
+    summary = summarize(results, wall_s)
+    print_report(results, summary)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "jobs": results}, f, indent=2)
+        print(f"Wrote {args.report}")
+
+    return 0 if summary["failed"] == 0 else 2
+
+if __name__ == "__main__":
+    sys.exit(main())
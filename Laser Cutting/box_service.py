@@ -0,0 +1,388 @@
+#Vihaan Shah
+#UNI: vvs2119
+#MECE4606 Digital Manufacturing
+#Laser Cutting Project - LOCAL HTTP BOX SERVICE
+#
+# Lets the ordering front-end ask for a box over HTTP instead of starting
+# laser_cutting_fixed.py and typing into its stdin. Standard library only
+# (http.server), bound to 127.0.0.1.
+#
+#   POST /box      JSON box spec -> SVG (image/svg+xml)
+#                  keys as in a box_batch.py manifest row: length, width,
+#                  height, material_thickness, tab_width, material, kerf,
+#                  text, text_target, text_size; art is sent inline as
+#                  "art_png" (base64 PNG) plus art_target. Options:
+#                  compact, precision, optimise_order, expand_instances.
+#   GET  /metrics  JSON: request counts, p50/p99 latency, cache hit rates
+#   GET  /health   "ok"
+#
+# Generation runs on a multiprocessing pool started once. Each worker keeps
+# its own panel_cache.PanelCache and stroke_font glyph cache between
+# requests (and renders one box at start-up so the first order is not the
+# slow one). Bad specs get 400 with {"error": ...}.
+#
+# Usage:
+#   python box_service.py --port 8765 --processes 4
+#   curl -s -X POST localhost:8765/box -d '{"length": 150, "width": 200, "height": 120, "text": "HI"}' > box.svg
+#   python box_service.py --bench 200 --concurrency 8   (starts a server, loads it, prints the metrics)
+
+import argparse
+import base64
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import Pool
+from types import SimpleNamespace
+
+import numpy as np
+
+import box_batch
+import kerf
+import laser_cutting_fixed as lcf
+import panel_cache
+import polygon_check
+import profiling
+import stroke_font
+
+HOST = "127.0.0.1"
+MAX_BODY = 16 * 1024 * 1024      # bytes of JSON (inline PNGs included)
+REQUEST_TIMEOUT_S = 60.0
+LATENCY_WINDOW = 10000           # requests kept for the percentiles
+
+# =========================
+# Worker side
+# =========================
+# One panel cache per worker process, made by _init_worker
+_panel_cache = None
+# True in pool workers, which send their profile counters back with each result
+_pooled = False
+
+def _init_worker(warm=True, pooled=False):
+    global _panel_cache, _pooled
+    _panel_cache = panel_cache.PanelCache()
+    if warm:
+        render_box({"length": 150, "width": 200, "height": 120, "text": "WARM UP"})
+        # Keep what the warm-up cached; requests are counted as before/after
+        # deltas, so only the panel cache's own totals need zeroing
+        _panel_cache.reset_counters()
+    if pooled:
+        profiling.reset()  # the parent's counters and the warm-up are not this worker's requests
+    _pooled = pooled
+
+def _cache_counts():
+    glyphs = stroke_font.glyph_paths.cache_info()
+    panels = _panel_cache.stats() if _panel_cache is not None else {"hits": 0, "misses": 0}
+    return (panels["hits"], panels["misses"], glyphs.hits, glyphs.misses)
+
+def render_box(payload):
+    """
+    One request: JSON payload -> result dict with the SVG text. Never raises;
+    bad input comes back as status 400, anything else as 500.
+    """
+    before = _cache_counts()
+    t0 = time.perf_counter()
+    result = {"status": 200, "svg": None, "error": None}
+    art_file = None
+    try:
+        if not isinstance(payload, dict):
+            raise ValueError("body must be a JSON object")
+        row = {k: v for k, v in payload.items()
+               if k not in ("art_png", "compact", "precision", "optimise_order", "expand_instances")}
+        if row.get("art_path"):
+            raise ValueError("send artwork inline as art_png (base64), not art_path")
+        spec = box_batch._clean_row(row, 0)
+        lcf.validate_box_dimensions(spec.length, spec.width, spec.height)
+        outline_format = "path" if payload.get("compact") else "polygon"
+        precision = payload.get("precision", lcf.path_precision)
+        lcf.check_svg_options("embed", outline_format, precision)
+
+        w, h, d, mt = spec.width, spec.height, spec.length, spec.material_thickness
+        panels = kerf.apply_kerf(lcf.generate_box_panels(w, h, d, mt=mt, tw=spec.tab_width, cache=_panel_cache),
+                                 spec.kerf)
+        layout = lcf.layout_box(w, h, d, mt=mt)
+        polygon_check.require_valid(polygon_check.check_box(panels, layout, mt=mt, kerf=spec.kerf), "box")
+
+        art = None
+        if payload.get("art_png"):
+            if spec.art_target not in lcf.PANEL_NAMES:
+                raise ValueError(f"unknown art_target {spec.art_target!r}")
+            try:
+                png = base64.b64decode(payload["art_png"], validate=True)
+            except (TypeError, ValueError):
+                raise ValueError("art_png is not valid base64")
+            fd, art_file = tempfile.mkstemp(suffix=".png")
+            with os.fdopen(fd, "wb") as f:
+                f.write(png)
+            art = lcf.load_art(art_file, spec.art_target)
+            if art is None:
+                raise ValueError("art_png is not a PNG")
+
+        text = None
+        if spec.text:
+            if spec.text_target not in lcf.PANEL_NAMES:
+                raise ValueError(f"unknown text_target {spec.text_target!r}")
+            font_size = spec.text_size
+            if not font_size or font_size <= 0:
+                font_size = lcf.calculate_auto_font_size(spec.text, *layout.sizes[spec.text_target])
+            text = SimpleNamespace(content=spec.text, target=spec.text_target, font_size=font_size)
+
+        out = io.StringIO()
+        lcf.render_box_svg(out, panels, layout, art, text, optimise_order=bool(payload.get("optimise_order")),
+                           outline_format=outline_format, precision=precision,
+                           expand_instances=bool(payload.get("expand_instances")))
+        result["svg"] = out.getvalue()
+    except ValueError as e:
+        result["status"] = 400
+        result["error"] = str(e)
+    except Exception as e:
+        result["status"] = 500
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        if art_file is not None:
+            os.remove(art_file)
+
+    after = _cache_counts()
+    result["generate_s"] = time.perf_counter() - t0
+    result["panel_hits"], result["panel_misses"], result["glyph_hits"], result["glyph_misses"] = (
+        a - b for a, b in zip(after, before))
+    if _pooled and profiling.ENABLED:
+        result["_stages"] = profiling.take_stages()
+    return result
+
+# =========================
+# Server side
+# =========================
+class Metrics:
+    """Request counters and a sliding window of latencies; thread-safe."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.latencies = deque(maxlen=window)
+        self.generate = deque(maxlen=window)
+        self.status = {}
+        self.cache = {"panel_hits": 0, "panel_misses": 0, "glyph_hits": 0, "glyph_misses": 0}
+
+    def record(self, status, latency_s, result=None):
+        with self.lock:
+            self.status[status] = self.status.get(status, 0) + 1
+            self.latencies.append(latency_s)
+            if result is not None:
+                self.generate.append(result["generate_s"])
+                for key in self.cache:
+                    self.cache[key] += result.get(key, 0)
+
+    def snapshot(self):
+        with self.lock:
+            lat = np.array(self.latencies) * 1000
+            gen = np.array(self.generate) * 1000
+            status = dict(self.status)
+            cache = dict(self.cache)
+        pct = lambda a, q: round(float(np.percentile(a, q)), 3) if len(a) else None
+        rate = lambda hits, misses: round(hits / (hits + misses), 4) if hits + misses else None
+        return {
+            "uptime_s": round(time.time() - self.started, 1),
+            "requests": sum(status.values()),
+            "status": {str(k): v for k, v in sorted(status.items())},
+            "latency_ms": {"p50": pct(lat, 50), "p99": pct(lat, 99), "max": pct(lat, 100), "window": len(lat)},
+            "generate_ms": {"p50": pct(gen, 50), "p99": pct(gen, 99)},
+            "panel_cache": {"hits": cache["panel_hits"], "misses": cache["panel_misses"],
+                            "hit_rate": rate(cache["panel_hits"], cache["panel_misses"])},
+            "glyph_cache": {"hits": cache["glyph_hits"], "misses": cache["glyph_misses"],
+                            "hit_rate": rate(cache["glyph_hits"], cache["glyph_misses"])},
+        }
+
+class BoxService:
+    """The worker pool (or inline renderer for processes=1) plus metrics."""
+
+    def __init__(self, processes=None, warm=True):
+        self.metrics = Metrics()
+        if processes == 1:
+            self.pool = None
+            self.lock = threading.Lock()  # the caches are not thread-safe
+            _init_worker(warm)
+        else:
+            self.lock = threading.Lock()  # guards the profile counters
+            self.pool = Pool(processes=processes or os.cpu_count() or 1,
+                             initializer=_init_worker, initargs=(warm, True))
+
+    def render(self, payload):
+        if self.pool is None:
+            with self.lock:
+                return render_box(payload)
+        result = self.pool.apply_async(render_box, (payload,)).get(REQUEST_TIMEOUT_S)
+        stages = result.pop("_stages", None)
+        if stages:
+            with self.lock:
+                profiling.merge_stages(stages)
+        return result
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+
+def make_handler(service, verbose=False):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status, body, content_type, headers=()):
+            data = body.encode("utf-8") if isinstance(body, str) else body
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _send_json(self, status, obj):
+            self._send(status, json.dumps(obj), "application/json")
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, "ok\n", "text/plain")
+            elif self.path == "/metrics":
+                self._send_json(200, service.metrics.snapshot())
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            t0 = time.perf_counter()
+            if self.path != "/box":
+                self._send_json(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+            except ValueError:
+                self.close_connection = True
+                self._send_json(400, {"error": "Content-Length is not a number"})
+                service.metrics.record(400, time.perf_counter() - t0)
+                return
+            if length <= 0 or length > MAX_BODY:
+                self.close_connection = True
+                self._send_json(413 if length > MAX_BODY else 411, {"error": "missing or oversized body"})
+                service.metrics.record(413 if length > MAX_BODY else 411, time.perf_counter() - t0)
+                return
+            try:
+                payload = json.loads(self.rfile.read(length))
+            except ValueError:
+                self._send_json(400, {"error": "body is not JSON"})
+                service.metrics.record(400, time.perf_counter() - t0)
+                return
+
+            try:
+                result = service.render(payload)
+            except Exception as e:  # worker died or timed out
+                result = {"status": 503, "error": f"{type(e).__name__}: {e}", "generate_s": 0.0}
+            if result["status"] == 200:
+                self._send(200, result["svg"], "image/svg+xml",
+                           [("X-Generate-Ms", f"{result['generate_s'] * 1000:.2f}")])
+            else:
+                self._send_json(result["status"], {"error": result["error"]})
+            service.metrics.record(result["status"], time.perf_counter() - t0, result)
+
+        def log_message(self, format, *args):
+            if verbose:
+                super().log_message(format, *args)
+
+    return Handler
+
+def start_server(port=8765, processes=None, warm=True, verbose=False):
+    """Returns (ThreadingHTTPServer, BoxService); call serve_forever() on the server."""
+    service = BoxService(processes, warm)
+    server = ThreadingHTTPServer((HOST, port), make_handler(service, verbose))
+    server.daemon_threads = True
+    return server, service
+
+# =========================
+# Load test
+# =========================
+BENCH_BOXES = [
+    {"length": 150, "width": 200, "height": 120},
+    {"length": 150, "width": 200, "height": 120, "text": "HELLO"},
+    {"length": 300, "width": 250, "height": 180, "text": "ORDER 42", "text_target": "TOP"},
+    {"length": 120, "width": 120, "height": 120, "compact": True},
+    {"length": 400, "width": 300, "height": 200, "material": "plywood_3mm", "optimise_order": True},
+]
+
+def run_bench(url, n, concurrency):
+    """n POST /box requests, cycling through BENCH_BOXES. Returns client-side latencies (s)."""
+    def one(i):
+        body = json.dumps(BENCH_BOXES[i % len(BENCH_BOXES)]).encode("utf-8")
+        req = urllib.request.Request(url + "/box", data=body, headers={"Content-Type": "application/json"})
+        t0 = time.perf_counter()
+        with urllib.request.urlopen(req) as resp:
+            resp.read()
+        return time.perf_counter() - t0
+
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        return list(ex.map(one, range(n)))
+
+def print_metrics(metrics):
+    print("=" * 60)
+    print("BOX SERVICE METRICS:")
+    print("=" * 60)
+    print(f"  Requests:    {metrics['requests']} {metrics['status']}")
+    lat = metrics["latency_ms"]
+    print(f"  Latency:     p50 {lat['p50']} ms, p99 {lat['p99']} ms, max {lat['max']} ms")
+    gen = metrics["generate_ms"]
+    print(f"  Generation:  p50 {gen['p50']} ms, p99 {gen['p99']} ms")
+    for name in ("panel_cache", "glyph_cache"):
+        c = metrics[name]
+        rate = f"{c['hit_rate'] * 100:.1f}%" if c["hit_rate"] is not None else "-"
+        print(f"  {name.replace('_', ' ').capitalize() + ':':<13}{rate} ({c['hits']} hits, {c['misses']} misses)")
+    print("=" * 60)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve box SVGs over HTTP on localhost.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: all cores; 1 = inline)")
+    parser.add_argument("--no-warm", action="store_true", help="skip the start-up render in each worker")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    parser.add_argument("--bench", type=int, default=0, metavar="N",
+                        help="start on a free port, send N requests, print the metrics and exit")
+    parser.add_argument("--concurrency", type=int, default=8, help="parallel clients for --bench")
+    args = parser.parse_args(argv)
+
+    try:
+        server, service = start_server(0 if args.bench else args.port, args.processes,
+                                       warm=not args.no_warm, verbose=args.verbose)
+    except (OSError, ValueError) as e:
+        print(f"Could not start: {e}")
+        return 1
+    url = f"http://{HOST}:{server.server_address[1]}"
+
+    if args.bench:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        t0 = time.perf_counter()
+        client = run_bench(url, args.bench, args.concurrency)
+        wall = time.perf_counter() - t0
+        server.shutdown()
+        service.close()
+        print(f"{args.bench} requests in {wall:.2f} s ({args.bench / wall:.0f}/s), "
+              f"client p50 {np.percentile(client, 50) * 1000:.2f} ms, p99 {np.percentile(client, 99) * 1000:.2f} ms")
+        print_metrics(service.metrics.snapshot())
+        return 0
+
+    print(f"Serving boxes on {url} (POST /box, GET /metrics, GET /health); Ctrl-C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+#Vihaan Shah
+#UNI: vvs2119
+#MECE4606 Digital Manufacturing
+#Laser Cutting Project - COMMON-LINE CUTTING
+#
+# When nested panels touch (spacing 0), neighbouring outlines run along the
+# same line and the laser would cut it twice. This pass:
+#   1. breaks every outline into segments and hashes each one by its line
+#      (quantised direction + quantised distance from the origin),
+#   2. groups neighbouring hash keys so lines that sit on a bucket boundary
+#      still meet, and projects each group onto one reference line,
+#   3. splits the line at every segment end point and keeps each piece
+#      once, however many outlines cover it,
+#   4. chains the surviving pieces back into as few polylines as possible.
+# The cut length saved is the length of every piece covered more than once.
+
+import math
+from types import SimpleNamespace
+
+import numpy as np
+
+# =========================
+# Segment index
+# =========================
+def _outline_segments(outline):
+    """(N, 4) array of x0, y0, x1, y1 for a closed outline."""
+    pts = np.asarray(outline, dtype=float)
+    nxt = np.roll(pts, -1, axis=0)
+    segs = np.hstack((pts, nxt))
+    lengths = np.hypot(segs[:, 2] - segs[:, 0], segs[:, 3] - segs[:, 1])
+    return segs[lengths > 0]
+
+def build_segment_index(outlines, tol=0.01, angle_tol=1e-4):
+    """
+    Hashes every segment of every outline by the line it lies on.
+    Returns {(angle_key, offset_key): [segment rows]} plus the segment array.
+    """
+    segs = np.vstack([_outline_segments(o) for o in outlines]) if outlines else np.zeros((0, 4))
+    dx = segs[:, 2] - segs[:, 0]
+    dy = segs[:, 3] - segs[:, 1]
+
+    # Direction folded into [0, pi) so a line and its reverse hash together
+    angle = np.mod(np.arctan2(dy, dx), math.pi)
+    angle[angle > math.pi - angle_tol / 2] = 0.0
+    # Signed distance of the line from the origin along its normal
+    offset = segs[:, 0] * -np.sin(angle) + segs[:, 1] * np.cos(angle)
+
+    angle_key = np.round(angle / angle_tol).astype(np.int64)
+    offset_key = np.round(offset / tol).astype(np.int64)
+
+    index = {}
+    for row, key in enumerate(zip(angle_key.tolist(), offset_key.tolist())):
+        index.setdefault(key, []).append(row)
+    return index, segs
+
+def _line_groups(index):
+    """Merges hash keys that differ by one offset step (same line, bucket edge)."""
+    by_angle = {}
+    for a_key, o_key in index:
+        by_angle.setdefault(a_key, []).append(o_key)
+
+    for a_key, o_keys in by_angle.items():
+        o_keys.sort()
+        group = [o_keys[0]]
+        for o_key in o_keys[1:]:
+            if o_key - group[-1] <= 1:
+                group.append(o_key)
+                continue
+            yield [row for k in group for row in index[(a_key, k)]]
+            group = [o_key]
+        yield [row for k in group for row in index[(a_key, k)]]
+
+# =========================
+# Merge
+# =========================
+def _merge_line(segs, tol):
+    """
+    segs: (k, 4) segments on one line.
+    Returns (pieces to cut as (m, 4), total length, cut length).
+    """
+    ref = segs[0]
+    d = np.array([ref[2] - ref[0], ref[3] - ref[1]])
+    d /= np.hypot(d[0], d[1])
+    # Canonical direction so every member projects the same way
+    if d[0] < 0 or (d[0] == 0 and d[1] < 0):
+        d = -d
+    origin = ref[:2]
+
+    t0 = (segs[:, 0] - origin[0]) * d[0] + (segs[:, 1] - origin[1]) * d[1]
+    t1 = (segs[:, 2] - origin[0]) * d[0] + (segs[:, 3] - origin[1]) * d[1]
+    lo = np.minimum(t0, t1)
+    hi = np.maximum(t0, t1)
+    total = float(np.sum(hi - lo))
+
+    # Break points, snapped together within tol
+    bps = np.sort(np.concatenate((lo, hi)))
+    keep = np.concatenate(([True], np.diff(bps) > tol))
+    bps = bps[keep]
+    if len(bps) < 2:
+        return np.zeros((0, 4)), total, 0.0
+
+    a = bps[:-1]
+    b = bps[1:]
+    # How many segments cover the middle of each piece
+    mid = (a + b) / 2
+    coverage = np.searchsorted(np.sort(lo), mid, side="right") - np.searchsorted(np.sort(hi), mid, side="left")
+    covered = coverage > 0
+    a = a[covered]
+    b = b[covered]
+
+    pieces = np.stack((origin[0] + a * d[0], origin[1] + a * d[1],
+                       origin[0] + b * d[0], origin[1] + b * d[1]), axis=1)
+    return pieces, total, float(np.sum(b - a))
+
+def _chain(pieces, tol):
+    """Joins pieces that share end points into polylines (lists of (x, y))."""
+    def key(x, y):
+        return (round(x / tol), round(y / tol))
+
+    ends = {}
+    for i, (x0, y0, x1, y1) in enumerate(pieces):
+        ends.setdefault(key(x0, y0), []).append(i)
+        ends.setdefault(key(x1, y1), []).append(i)
+
+    used = [False] * len(pieces)
+
+    def walk(i, x, y):
+        """Follow unused pieces from (x, y) starting with piece i."""
+        path = [(x, y)]
+        while i is not None:
+            used[i] = True
+            x0, y0, x1, y1 = pieces[i]
+            if key(x0, y0) == key(x, y):
+                x, y = x1, y1
+            else:
+                x, y = x0, y0
+            path.append((x, y))
+            i = next((j for j in ends[key(x, y)] if not used[j]), None)
+        return path
+
+    paths = []
+    # Start from odd-degree end points first so open chains come out whole
+    starts = sorted(ends, key=lambda k: len(ends[k]) % 2 == 0)
+    for k in starts:
+        for i in ends[k]:
+            if used[i]:
+                continue
+            x0, y0, x1, y1 = pieces[i]
+            if key(x0, y0) == k:
+                paths.append(walk(i, x0, y0))
+            else:
+                paths.append(walk(i, x1, y1))
+    return [_drop_collinear(p) for p in paths]
+
+def _drop_collinear(path, eps=1e-9):
+    if len(path) < 3:
+        return path
+    out = [path[0]]
+    for cur, nxt in zip(path[1:-1], path[2:]):
+        px, py = out[-1]
+        cross = (cur[0] - px) * (nxt[1] - py) - (cur[1] - py) * (nxt[0] - px)
+        if abs(cross) > eps:
+            out.append(cur)
+    out.append(path[-1])
+    return out
+
+def merge_common_lines(outlines, tol=0.01):
+    """
+    outlines: closed outlines in sheet coordinates (lists or (N, 2) arrays).
+    Returns SimpleNamespace(paths, original_length, cut_length, saved_length,
+    shared_lines), where paths are open/closed polylines to cut once each.
+    """
+    index, segs = build_segment_index(outlines, tol)
+    all_pieces = []
+    original = 0.0
+    cut = 0.0
+    shared_lines = 0
+    for rows in _line_groups(index):
+        pieces, total, length = _merge_line(segs[rows], tol)
+        original += total
+        cut += length
+        if total - length > tol:
+            shared_lines += 1
+        all_pieces.append(pieces)
+
+    pieces = np.vstack(all_pieces).tolist() if all_pieces else []
+    return SimpleNamespace(
+        paths=_chain(pieces, tol),
+        original_length=original,
+        cut_length=cut,
+        saved_length=original - cut,
+        shared_lines=shared_lines,
+    )
+
+def paths_to_svg_d(paths):
+    """SVG path data, closing polylines that end where they start."""
+    parts = []
+    for path in paths:
+        closed = len(path) > 2 and math.isclose(path[0][0], path[-1][0]) and math.isclose(path[0][1], path[-1][1])
+        pts = path[:-1] if closed else path
+        d = f"M{pts[0][0]},{pts[0][1]}" + "".join(f" L{x},{y}" for x, y in pts[1:])
+        parts.append(d + (" Z" if closed else ""))
+    return " ".join(parts)
+
+def print_common_line_report(merged):
+    saved_pct = (merged.saved_length / merged.original_length * 100) if merged.original_length else 0.0
+    print(f"  Common-line cutting: {merged.shared_lines} shared line(s), "
+          f"{merged.original_length:.1f} mm -> {merged.cut_length:.1f} mm "
+          f"(saved {merged.saved_length:.1f} mm, {saved_pct:.1f}%)")
@@ -0,0 +1,294 @@
+#Vihaan Shah
+#UNI: vvs2119
+#MECE4606 Digital Manufacturing
+#Laser Cutting Project - CUT ORDER
+#
+# Chooses the order, start point and direction of every contour on a sheet
+# so the head spends as little time as possible on rapid (laser off) moves.
+#
+#   1. Nesting depth: a contour inside another one (a slot cut-out inside a
+#      panel) is cut first, so parts never drop out before their holes are cut.
+#   2. Nearest neighbour: from the current head position, the closest
+#      possible start point of any uncut contour is found with a KD-tree of
+#      all start points (every vertex of a closed contour, both ends of an
+#      open one). Points of cut contours are removed from the tree.
+#   3. 2-opt: reverses runs of the tour while that shortens the travel, then
+#      re-picks the start vertex of each closed contour for its neighbours.
+#
+# Closed contours end where they start, so their direction never changes the
+# travel and they keep their drawn orientation. Open paths (e.g. from
+# common-line cutting) are reversed when entering at the other end is shorter.
+
+import math
+from types import SimpleNamespace
+
+import numpy as np
+
+# =========================
+# KD-tree of start points
+# =========================
+class _Node:
+    __slots__ = ("lo", "hi", "left", "right", "parent", "items", "alive")
+
+class KDTree:
+    """
+    Static 2-D KD-tree with removal. Each node keeps its bounding box and the
+    number of points still alive below it, so searches skip emptied branches.
+    """
+
+    def __init__(self, points, leaf_size=8):
+        self.points = np.asarray(points, dtype=float)
+        self.leaf_of = {}
+        self.root = self._build(np.arange(len(self.points)), None, leaf_size)
+
+    def _build(self, idx, parent, leaf_size):
+        node = _Node()
+        pts = self.points[idx]
+        node.lo = pts.min(axis=0) if len(idx) else np.zeros(2)
+        node.hi = pts.max(axis=0) if len(idx) else np.zeros(2)
+        node.parent = parent
+        node.alive = len(idx)
+        if len(idx) <= leaf_size:
+            node.items = set(idx.tolist())
+            node.left = node.right = None
+            for i in node.items:
+                self.leaf_of[i] = node
+            return node
+        axis = int(np.argmax(node.hi - node.lo))
+        order = idx[np.argsort(pts[:, axis], kind="stable")]
+        mid = len(order) // 2
+        node.items = None
+        node.left = self._build(order[:mid], node, leaf_size)
+        node.right = self._build(order[mid:], node, leaf_size)
+        return node
+
+    def remove(self, i):
+        node = self.leaf_of.pop(i, None)
+        if node is None:
+            return
+        node.items.discard(i)
+        while node is not None:
+            node.alive -= 1
+            node = node.parent
+
+    def nearest(self, q):
+        """Index of the closest alive point to q, or None when empty."""
+        qx, qy = float(q[0]), float(q[1])
+        best = [None, math.inf]
+        pts = self.points
+
+        def box_dist2(node):
+            dx = max(node.lo[0] - qx, 0.0, qx - node.hi[0])
+            dy = max(node.lo[1] - qy, 0.0, qy - node.hi[1])
+            return dx * dx + dy * dy
+
+        def visit(node):
+            if node.alive == 0 or box_dist2(node) >= best[1]:
+                return
+            if node.items is not None:
+                for i in node.items:
+                    dx = pts[i, 0] - qx
+                    dy = pts[i, 1] - qy
+                    d2 = dx * dx + dy * dy
+                    if d2 < best[1]:
+                        best[0], best[1] = i, d2
+                return
+            first, second = node.left, node.right
+            if box_dist2(second) < box_dist2(first):
+                first, second = second, first
+            visit(first)
+            visit(second)
+
+        visit(self.root)
+        return best[0]
+
+# =========================
+# Contours
+# =========================
+def _point_in_polygon(x, y, poly):
+    """Even-odd rule, vectorised over the polygon edges."""
+    px = poly[:, 0]
+    py = poly[:, 1]
+    nx = np.roll(px, -1)
+    ny = np.roll(py, -1)
+    crosses = (py > y) != (ny > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_at = px + (y - py) * (nx - px) / (ny - py)
+    return bool(np.count_nonzero(crosses & (x < x_at)) % 2)
+
+def nesting_depth(contours):
+    """How many other closed contours each contour lies inside."""
+    if not contours:
+        return []
+    lo = np.array([c.points.min(axis=0) for c in contours])
+    hi = np.array([c.points.max(axis=0) for c in contours])
+    # Only closed contours can hold others. Sorted by their left edge, the
+    # ones whose box can contain a given box are a prefix of that order; the
+    # box test runs over the prefix at once and point-in-polygon only on
+    # what survives it
+    holders = np.flatnonzero([c.closed for c in contours])
+    holders = holders[np.argsort(lo[holders, 0], kind="stable")]
+    left = lo[holders, 0]
+    depth = []
+    for i, c in enumerate(contours):
+        cand = holders[:np.searchsorted(left, lo[i, 0], side="right")]
+        olo = lo[cand]
+        ohi = hi[cand]
+        inside_box = (olo <= lo[i]).all(axis=1) & (ohi >= hi[i]).all(axis=1)
+        same_box = (olo == lo[i]).all(axis=1) & (ohi == hi[i]).all(axis=1)
+        x, y = c.points[0]
+        depth.append(sum(_point_in_polygon(x, y, contours[j].points) for j in cand[inside_box & ~same_box]))
+    return depth
+
+def make_contour(contour_id, points, closed=True):
+    return SimpleNamespace(id=contour_id, points=np.asarray(points, dtype=float), closed=closed)
+
+# =========================
+# Tour
+# =========================
+def _entry_exit(c, start, reverse):
+    """(entry point, exit point) of contour c cut from vertex `start`."""
+    if c.closed:
+        p = c.points[start]
+        return p, p
+    a, b = c.points[0], c.points[-1]
+    return (b, a) if reverse else (a, b)
+
+def _travel(tour, contours, origin):
+    pos = np.asarray(origin, dtype=float)
+    total = 0.0
+    for k, start, reverse in tour:
+        entry, exit_ = _entry_exit(contours[k], start, reverse)
+        total += float(np.hypot(*(entry - pos)))
+        pos = exit_
+    return total
+
+def _nearest_neighbour(members, contours, pos):
+    """Greedy tour over the given contour indices from head position pos."""
+    starts = []
+    owner = []
+    vertex = []
+    for k in members:
+        c = contours[k]
+        verts = range(len(c.points)) if c.closed else (0, len(c.points) - 1)
+        for v in verts:
+            starts.append(c.points[v])
+            owner.append(k)
+            vertex.append(v)
+    if not starts:
+        return [], pos
+
+    tree = KDTree(np.array(starts))
+    by_owner = {}
+    for i, k in enumerate(owner):
+        by_owner.setdefault(k, []).append(i)
+
+    tour = []
+    for _ in range(len(members)):
+        i = tree.nearest(pos)
+        k = owner[i]
+        c = contours[k]
+        if c.closed:
+            tour.append((k, vertex[i], False))
+        else:
+            tour.append((k, 0, vertex[i] != 0))
+        _entry, pos = _entry_exit(c, tour[-1][1], tour[-1][2])
+        for j in by_owner[k]:
+            tree.remove(j)
+    return tour, pos
+
+def _two_opt(tour, contours, pos0, max_passes=50):
+    """Block reversal 2-opt; reversing a block also reverses open paths in it."""
+    n = len(tour)
+    if n < 3:
+        return tour
+    tour = list(tour)
+    entries = np.empty((n, 2))
+    exits = np.empty((n, 2))
+    for i, (k, start, reverse) in enumerate(tour):
+        entries[i], exits[i] = _entry_exit(contours[k], start, reverse)
+    origin = np.asarray(pos0, dtype=float)
+
+    for _ in range(max_passes):
+        improved = False
+        for i in range(n - 1):
+            prev = origin if i == 0 else exits[i - 1]
+            j = np.arange(i + 1, n)
+            # Reversing tour[i..j]: prev now goes to exit(j), entry(i) goes on to entry(j + 1)
+            old = np.hypot(*(entries[i] - prev))
+            new = np.hypot(*(exits[j] - prev).T)
+            link = np.zeros(len(j))
+            jn = j[j + 1 < n]
+            link[:len(jn)] = (np.hypot(*(entries[jn + 1] - entries[i]).T)
+                              - np.hypot(*(entries[jn + 1] - exits[jn]).T))
+            delta = new + link - old
+            best = int(np.argmin(delta))
+            if delta[best] >= -1e-9:
+                continue
+            jj = int(j[best])
+            tour[i:jj + 1] = [(k, s, not r) for k, s, r in reversed(tour[i:jj + 1])]
+            entries[i:jj + 1], exits[i:jj + 1] = exits[i:jj + 1][::-1].copy(), entries[i:jj + 1][::-1].copy()
+            improved = True
+        if not improved:
+            break
+    return tour
+
+def _repick_starts(tour, contours, pos0):
+    """Moves each closed contour's start to the vertex nearest its neighbours."""
+    out = list(tour)
+    for i, (k, start, reverse) in enumerate(out):
+        c = contours[k]
+        if not c.closed:
+            continue
+        prev = np.asarray(pos0, dtype=float) if i == 0 else _entry_exit(contours[out[i - 1][0]], out[i - 1][1], out[i - 1][2])[1]
+        cost = np.hypot(*(c.points - prev).T)
+        if i + 1 < len(out):
+            nk, ns, nr = out[i + 1]
+            nxt = _entry_exit(contours[nk], ns, nr)[0]
+            cost = cost + np.hypot(*(c.points - nxt).T)
+        out[i] = (k, int(np.argmin(cost)), reverse)
+    return out
+
+def optimise_cut_order(contours, origin=(0.0, 0.0), two_opt=True):
+    """
+    contours: from make_contour, in their current (drawn) order.
+    Returns SimpleNamespace(order, travel_before, travel_after) where order
+    is a list of SimpleNamespace(index, id, start, reverse, points) and
+    points is the contour re-ordered to begin at its chosen start.
+    Inner contours (higher nesting depth) always come before outer ones.
+    """
+    if not contours:
+        return SimpleNamespace(order=[], travel_before=0.0, travel_after=0.0)
+
+    before = _travel([(k, 0, False) for k in range(len(contours))], contours, origin)
+
+    depth = nesting_depth(contours)
+    pos = np.asarray(origin, dtype=float)
+    tour = []
+    for level in sorted(set(depth), reverse=True):
+        members = [k for k, d in enumerate(depth) if d == level]
+        level_start = pos
+        part, pos = _nearest_neighbour(members, contours, pos)
+        if two_opt:
+            part = _two_opt(part, contours, level_start)
+            part = _repick_starts(part, contours, level_start)
+            last = part[-1]
+            pos = _entry_exit(contours[last[0]], last[1], last[2])[1]
+        tour.extend(part)
+
+    after = _travel(tour, contours, origin)
+    order = []
+    for k, start, reverse in tour:
+        c = contours[k]
+        if c.closed:
+            pts = np.roll(c.points, -start, axis=0)
+        else:
+            pts = c.points[::-1] if reverse else c.points
+        order.append(SimpleNamespace(index=k, id=c.id, start=start, reverse=reverse, points=pts))
+    return SimpleNamespace(order=order, travel_before=before, travel_after=after)
+
+def print_cut_order_report(result):
+    saved = result.travel_before - result.travel_after
+    pct = (saved / result.travel_before * 100) if result.travel_before else 0.0
+    print(f"  Rapid travel: {result.travel_before:.1f} mm -> {result.travel_after:.1f} mm "
+          f"(saved {saved:.1f} mm, {pct:.1f}%)")
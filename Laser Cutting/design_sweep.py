@@ -0,0 +1,314 @@
+#Vihaan Shah
+#UNI: vvs2119
+#MECE4606 Digital Manufacturing
+#Laser Cutting Project - DESIGN SWEEP
+#
+# Quotes a whole grid of boxes (width x height x length x thickness x tab
+# width) without generating or writing any SVG. Every metric comes from the
+# same rules generate_panel and layout_box follow, written as closed-form
+# array expressions so one NumPy pass handles a whole chunk of the grid:
+#   - a side of length L has n = max(2, round((L - cl - cr) / tw)) segments;
+#     its cut length is cl + n*tw + |L - cl - n*tw| plus 2*mt for every
+#     raised (tab or slot) segment,
+#   - every tab adds tw*mt of material and every slot removes it,
+#   - the sheet is the layout_box canvas, the engrave area is the fit_art
+#     rectangle of an image with the given aspect ratio.
+# The panels, edge maps and canvas arithmetic are lcf's own (BOX_PANELS,
+# layout_frame). The per-side formulas are checked against generated
+# outlines for a few boxes of the grid before every sweep, so a change to
+# generate_panel that they miss stops the sweep instead of skewing it.
+# Laser time = cut length / cut feed (x passes) + raster rows x row length /
+# raster feed, using the laser_gcode.py layer defaults.
+# The grid is split into index ranges and spread across a multiprocessing
+# pool; each worker rebuilds its own slice from the axes, so only the axes
+# and the result columns cross process boundaries.
+#
+# Usage:
+#   python design_sweep.py --width 100:400:10 --height 100:300:10 --length 100:400:10 \
+#       --thickness 3,6 --tab-width 6,9,12 --art-aspect 1.5 --out sweep.csv
+#   python design_sweep.py --check 200   (compares N random boxes against generated outlines)
+
+import argparse
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+import laser_cutting_fixed as lcf
+import laser_gcode
+
+AXES = ("width", "height", "length", "thickness", "tab_width")
+
+COLUMNS = ("width", "height", "length", "thickness", "tab_width",
+           "cut_length_mm", "part_area_mm2", "sheet_w_mm", "sheet_h_mm", "utilisation",
+           "engrave_area_mm2", "cut_s", "engrave_s", "laser_s")
+
+# Grid points compared with generated outlines before each sweep
+CHECK_SAMPLE = 8
+# Largest closed-form error (mm, mm^2) that still counts as agreeing
+CHECK_TOLERANCE = 1e-6
+
+# =========================
+# Closed-form metrics
+# =========================
+def _side(length, mode, slot_parity, mt, tw, cl, cr):
+    """(cut length, area change) of one panel side, elementwise over arrays."""
+    if mode == "NONE":
+        return length, 0.0
+    # np.round rounds halves to even, like round() in _segments_count
+    n = np.maximum(2, np.round((length - cl - cr) / tw)).astype(np.int64)
+    parity = 1 if mode == "TAB" else slot_parity
+    raised = (n + 1 - parity) // 2  # segments i < n with i % 2 == parity
+    cut = cl + n * tw + np.abs(length - cl - n * tw) + 2 * mt * raised
+    sign = 1.0 if mode == "TAB" else -1.0
+    return cut, sign * raised * tw * mt
+
+def box_metrics(width, height, length, thickness, tab_width, cl=lcf.cl, cr=lcf.cr):
+    """Cut length (mm) and panel area (mm^2) of whole boxes, elementwise."""
+    dims = {"w": width, "h": height, "d": length}
+    cut = np.zeros(np.shape(width))
+    area = np.zeros(np.shape(width))
+    for face_w_axis, face_h_axis, edge_map, slot_parity in lcf.BOX_PANELS.values():
+        face_w = dims[face_w_axis]
+        face_h = dims[face_h_axis]
+        area = area + face_w * face_h
+        for side in lcf.SIDES:
+            along = face_w if side in ("top", "bottom") else face_h
+            c, a = _side(along, edge_map[side], slot_parity, thickness, tab_width, cl, cr)
+            cut = cut + c
+            area = area + a
+    return cut, area
+
+def canvas_size(width, height, length, thickness):
+    """layout_box's view_w / view_h, elementwise."""
+    frame = lcf.layout_frame(width, height, length, thickness, maximum=np.maximum)
+    return frame.view_w, frame.view_h
+
+def art_size(panel_w, panel_h, aspect):
+    """fit_art's image width / height inside a panel, elementwise."""
+    usable_w = np.maximum(1.0, panel_w - 2 * lcf.art_margin)
+    usable_h = np.maximum(1.0, panel_h - 2 * lcf.art_margin)
+    wide = aspect >= usable_w / usable_h
+    return np.where(wide, usable_w, usable_h * aspect), np.where(wide, usable_w / aspect, usable_h)
+
+def evaluate(width, height, length, thickness, tab_width, art_aspect=None, art_target="FRONT",
+             line_step=0.1, cut_feed=None, cut_passes=None, raster_feed=None, cl=lcf.cl, cr=lcf.cr):
+    """
+    All metrics for equal-length parameter arrays. Returns {column: array}
+    in COLUMNS order. art_aspect=None means nothing is engraved.
+    """
+    width, height, length, thickness, tab_width = (
+        np.asarray(a, dtype=float) for a in (width, height, length, thickness, tab_width))
+    cut_feed = cut_feed or laser_gcode.LAYER_DEFAULTS["cut"]["feed"]
+    cut_passes = cut_passes or laser_gcode.LAYER_DEFAULTS["cut"]["passes"]
+    raster_feed = raster_feed or laser_gcode.LAYER_DEFAULTS["raster"]["feed"]
+
+    cut, area = box_metrics(width, height, length, thickness, tab_width, cl, cr)
+    sheet_w, sheet_h = canvas_size(width, height, length, thickness)
+
+    if art_aspect:
+        if art_target not in lcf.BOX_PANELS:
+            raise ValueError(f"unknown art_target {art_target!r}")
+        dims = {"w": width, "h": height, "d": length}
+        face_w_axis, face_h_axis = lcf.BOX_PANELS[art_target][:2]
+        img_w, img_h = art_size(dims[face_w_axis], dims[face_h_axis], float(art_aspect))
+        engrave_area = img_w * img_h
+        # One row per line_step; each row sweeps the image width plus the step over
+        engrave_s = np.ceil(img_h / line_step) * (img_w + line_step) / raster_feed * 60.0
+    else:
+        engrave_area = np.zeros_like(width)
+        engrave_s = np.zeros_like(width)
+
+    cut_s = cut * cut_passes / cut_feed * 60.0
+    return {
+        "width": width,
+        "height": height,
+        "length": length,
+        "thickness": thickness,
+        "tab_width": tab_width,
+        "cut_length_mm": cut,
+        "part_area_mm2": area,
+        "sheet_w_mm": sheet_w,
+        "sheet_h_mm": sheet_h,
+        "utilisation": area / (sheet_w * sheet_h),
+        "engrave_area_mm2": engrave_area,
+        "cut_s": cut_s,
+        "engrave_s": engrave_s,
+        "laser_s": cut_s + engrave_s,
+    }
+
+# =========================
+# Grid sweep
+# =========================
+def _grid_slice(axes, start, stop):
+    """Parameter arrays for flat grid indices start..stop-1 (C order over AXES)."""
+    shape = tuple(len(a) for a in axes)
+    index = np.unravel_index(np.arange(start, stop), shape)
+    return [np.asarray(a, dtype=float)[i] for a, i in zip(axes, index)]
+
+def _sweep_chunk(job):
+    axes, start, stop, options = job
+    return evaluate(*_grid_slice(axes, start, stop), **options)
+
+def sweep(widths, heights, lengths, thicknesses=(lcf.mt,), tab_widths=(lcf.tw,),
+          processes=None, chunk=20000, **options):
+    """
+    Evaluates every combination of the given axis values.
+    processes=None uses os.cpu_count(); processes=1 runs in this process.
+    options go to evaluate() (art_aspect, art_target, line_step, feeds...).
+    Returns {column: array}, one row per grid point.
+    """
+    axes = [tuple(float(v) for v in a) for a in (widths, heights, lengths, thicknesses, tab_widths)]
+    for name, values in zip(AXES, axes):
+        if not values:
+            raise ValueError(f"no values for {name}")
+    if min(axes[4]) <= 0:
+        raise ValueError("tab width must be > 0")
+    total = int(np.prod([len(a) for a in axes]))
+    jobs = [(axes, s, min(s + chunk, total), options) for s in range(0, total, chunk)]
+
+    if processes == 1 or len(jobs) <= 1:
+        parts = [_sweep_chunk(job) for job in jobs]
+    else:
+        with Pool(processes=processes or os.cpu_count() or 1) as pool:
+            parts = pool.map(_sweep_chunk, jobs)
+    return {c: np.concatenate([p[c] for p in parts]) for c in COLUMNS}
+
+def write_csv(table, path):
+    """Writes the columns as CSV with a header row."""
+    data = np.column_stack([table[c] for c in COLUMNS])
+    np.savetxt(path, data, delimiter=",", header=",".join(COLUMNS), comments="", fmt="%.6g")
+
+# =========================
+# Cross-check
+# =========================
+def _perimeter(points):
+    pts = np.asarray(points, dtype=float)
+    return float(np.hypot(*(np.roll(pts, -1, axis=0) - pts).T).sum())
+
+def compare(w, h, d, mt, tw):
+    """Max abs error of the closed forms against generated outlines and layout_box, per metric."""
+    import nesting
+
+    table = evaluate(w, h, d, mt, tw)
+    err = {"cut_length_mm": 0.0, "part_area_mm2": 0.0, "sheet_w_mm": 0.0, "sheet_h_mm": 0.0}
+    for i in range(len(table["width"])):
+        panels = lcf.generate_box_panels(w[i], h[i], d[i], mt=mt[i], tw=tw[i])
+        layout = lcf.layout_box(w[i], h[i], d[i], mt=mt[i])
+        actual = {
+            "cut_length_mm": sum(_perimeter(p) for p in panels.values()),
+            "part_area_mm2": sum(nesting.polygon_area(p) for p in panels.values()),
+            "sheet_w_mm": layout.view_w,
+            "sheet_h_mm": layout.view_h,
+        }
+        for key, value in actual.items():
+            err[key] = max(err[key], abs(float(table[key][i]) - value))
+    return err
+
+def check(n_boxes, seed=0):
+    """compare() for n_boxes random boxes."""
+    rng = np.random.default_rng(seed)
+    w, h, d = rng.uniform(100, 400, size=(3, n_boxes)).round(1)
+    mt = rng.choice([3.0, 6.0], size=n_boxes)
+    tw = rng.choice([6.0, 9.0, 12.0], size=n_boxes)
+    return compare(w, h, d, mt, tw)
+
+def check_sample(axes, n=CHECK_SAMPLE, seed=0):
+    """
+    compare() for n grid points (the first, the last and random ones in
+    between) of the axes a sweep is about to run.
+    """
+    total = int(np.prod([len(a) for a in axes]))
+    picks = {0, total - 1}
+    if total > 2:
+        picks.update(np.random.default_rng(seed).integers(0, total, size=max(0, n - 2)).tolist())
+    index = np.unravel_index(np.array(sorted(picks)), tuple(len(a) for a in axes))
+    return compare(*(np.asarray(a, dtype=float)[i] for a, i in zip(axes, index)))
+
+# =========================
+# CLI
+# =========================
+def parse_axis(text):
+    """'3,6' -> [3, 6]; '100:400:10' -> 100, 110, ..., 400 (stop included)."""
+    try:
+        if ":" in text:
+            start, stop, step = (float(v) for v in text.split(":"))
+            if step <= 0:
+                raise ValueError
+            return list(np.round(np.arange(start, stop + step / 2, step), 6))
+        return [float(v) for v in text.split(",") if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a,b,c or start:stop:step, got {text!r}")
+
+def print_sweep_report(table, elapsed):
+    n = len(table["width"])
+    print("=" * 60)
+    print("DESIGN SWEEP:")
+    print("=" * 60)
+    print(f"  Configurations: {n} in {elapsed:.3f} s ({n / max(elapsed, 1e-9):,.0f}/s)")
+    for column, unit in (("cut_length_mm", "mm"), ("utilisation", ""), ("laser_s", "s")):
+        values = table[column]
+        print(f"  {column:<15} min {values.min():10.2f}  median {np.median(values):10.2f}  "
+              f"max {values.max():10.2f} {unit}")
+    best = int(np.argmax(table["utilisation"]))
+    print(f"  Best utilisation: {table['utilisation'][best] * 100:.1f}% at "
+          f"{table['width'][best]:g} x {table['height'][best]:g} x {table['length'][best]:g} mm, "
+          f"mt {table['thickness'][best]:g}, tab {table['tab_width'][best]:g}")
+    print("=" * 60)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep box parameters and tabulate cost metrics (no SVG output).")
+    parser.add_argument("--width", type=parse_axis, default=parse_axis("100:400:10"))
+    parser.add_argument("--height", type=parse_axis, default=parse_axis("100:300:10"))
+    parser.add_argument("--length", type=parse_axis, default=parse_axis("100:400:10"))
+    parser.add_argument("--thickness", type=parse_axis, default=[lcf.mt])
+    parser.add_argument("--tab-width", type=parse_axis, default=[lcf.tw])
+    parser.add_argument("--art-aspect", type=float, default=None, help="engrave an image of this width/height ratio")
+    parser.add_argument("--art-target", default="FRONT", choices=lcf.PANEL_NAMES)
+    parser.add_argument("--line-step", type=float, default=0.1, help="raster line spacing (mm)")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--out", default=None, help="write the table as CSV here")
+    parser.add_argument("--check", type=int, default=None, metavar="N",
+                        help="compare the closed forms with N generated boxes and exit")
+    parser.add_argument("--no-check", action="store_true",
+                        help=f"skip comparing {CHECK_SAMPLE} grid points with generated boxes first")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        for key, value in check(args.check).items():
+            print(f"  {key:<15} max error {value:.2e}")
+        return 0
+
+    if not args.no_check:
+        axes = (args.width, args.height, args.length, args.thickness, args.tab_width)
+        try:
+            err = check_sample(axes) if all(axes) and min(args.tab_width) > 0 else {}
+        except ValueError as e:
+            print(f"Invalid sweep: {e}")
+            return 1
+        off = {key: value for key, value in err.items() if value > CHECK_TOLERANCE}
+        if off:
+            print("The closed forms no longer match generate_panel/layout_box on this grid:")
+            for key, value in off.items():
+                print(f"  {key:<15} max error {value:.2e}")
+            return 1
+
+    t0 = time.perf_counter()
+    try:
+        table = sweep(args.width, args.height, args.length, args.thickness, args.tab_width,
+                      processes=args.processes, art_aspect=args.art_aspect, art_target=args.art_target,
+                      line_step=args.line_step)
+    except ValueError as e:
+        print(f"Invalid sweep: {e}")
+        return 1
+    print_sweep_report(table, time.perf_counter() - t0)
+
+    if args.out:
+        write_csv(table, args.out)
+        print(f"Wrote {args.out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+#Vihaan Shah
+#UNI: vvs2119
+#MECE4606 Digital Manufacturing
+#Laser Cutting Project - DXF OUTPUT
+#
+# Writes DXF straight from the generate_panel outlines, so lasers and CNC
+# routers that read DXF natively skip the SVG -> DXF conversion (slow in the
+# CAM software, and it sometimes guesses the units wrong).
+#
+# Format: DXF R12 (AC1009), the version every CAM package reads. R12 has no
+# LWPOLYLINE, so each outline is a POLYLINE / VERTEX ... / SEQEND run.
+# Layers follow the SVG colour convention:
+#   CUT     (colour 1, red)  - panel outlines, closed
+#   ENGRAVE (colour 5, blue) - text strokes, open
+# Units are mm ($INSUNITS 4, $MEASUREMENT 1) and y points up, with the
+# origin at the bottom-left corner of the layout or sheet.
+#
+# Streams like laser_gcode.py: group codes come out of a generator (long
+# outlines in VERTEX_BLOCK pieces) and are written about WRITE_BYTES at a
+# time, so memory stays flat however big the sheet is.
+#
+# Usage:
+#   python dxf_export.py boxes.csv --out dxf
+#   python dxf_export.py boxes.csv --sheet 600x400 --spacing 3 --out dxf
+
+import argparse
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+
+import kerf
+import laser_cutting_fixed as lcf
+import laser_gcode
+import polygon_check
+import profiling
+import stroke_font
+
+WRITE_BYTES = 1 << 16   # characters per file.write()
+VERTEX_BLOCK = 512      # vertices formatted per chunk
+
+# layer kind (laser_gcode.make_layer) -> (DXF layer name, ACI colour)
+DXF_LAYERS = {
+    "cut": ("CUT", 1),
+    "engrave": ("ENGRAVE", 5),
+}
+
+# =========================
+# DXF stream
+# =========================
+def _header(view_w, view_h):
+    return (
+        "0\nSECTION\n2\nHEADER\n"
+        "9\n$ACADVER\n1\nAC1009\n"
+        "9\n$INSUNITS\n70\n4\n"
+        "9\n$MEASUREMENT\n70\n1\n"
+        f"9\n$EXTMIN\n10\n0\n20\n0\n30\n0\n"
+        f"9\n$EXTMAX\n10\n{laser_gcode.fmt(view_w)}\n20\n{laser_gcode.fmt(view_h)}\n30\n0\n"
+        "0\nENDSEC\n"
+    )
+
+def _tables():
+    layers = "".join(f"0\nLAYER\n2\n{name}\n70\n0\n62\n{colour}\n6\nCONTINUOUS\n"
+                     for name, colour in DXF_LAYERS.values())
+    return (
+        "0\nSECTION\n2\nTABLES\n"
+        "0\nTABLE\n2\nLTYPE\n70\n1\n"
+        "0\nLTYPE\n2\nCONTINUOUS\n70\n0\n3\nSolid line\n72\n65\n73\n0\n40\n0.0\n"
+        "0\nENDTAB\n"
+        f"0\nTABLE\n2\nLAYER\n70\n{len(DXF_LAYERS)}\n{layers}0\nENDTAB\n"
+        "0\nENDSEC\n"
+    )
+
+def polyline_chunks(points, layer, closed, view_h, precision=3):
+    """
+    One POLYLINE/VERTEX/SEQEND run, yielded VERTEX_BLOCK vertices at a
+    time so a long outline is never one big string; points in SVG mm (y down).
+    """
+    pts = np.asarray(points, dtype=float)
+    if closed and len(pts) > 2 and np.array_equal(pts[0], pts[-1]):
+        pts = pts[:-1]  # the closed flag (70 = 1) joins the ends
+    xy = np.empty_like(pts)
+    xy[:, 0] = pts[:, 0]
+    xy[:, 1] = view_h - pts[:, 1]
+    # -0.0 would come out as "-0.000"
+    xy = np.where(np.abs(xy) < 0.5 * 10.0 ** -precision, 0.0, xy)
+    vertex = f"0\nVERTEX\n8\n{layer}\n10\n%.{precision}f\n20\n%.{precision}f\n"
+    yield f"0\nPOLYLINE\n8\n{layer}\n66\n1\n10\n0\n20\n0\n30\n0\n70\n{1 if closed else 0}\n"
+    for i in range(0, len(xy), VERTEX_BLOCK):
+        block = xy[i:i + VERTEX_BLOCK]
+        # One % over a repeated template formats the whole block in C
+        yield (vertex * len(block)) % tuple(block.ravel().tolist())
+    yield f"0\nSEQEND\n8\n{layer}\n"
+
+def dxf_chunks(layers, view_w, view_h, precision=3):
+    """
+    Yields the DXF file in pieces: header, tables, entities, EOF.
+    layers are laser_gcode.make_layer layers of kind "cut" or "engrave"
+    ("raster" has no vector form and is refused).
+    """
+    yield _header(view_w, view_h)
+    yield _tables()
+    yield "0\nSECTION\n2\nENTITIES\n"
+    for layer in layers:
+        if layer.kind not in DXF_LAYERS:
+            raise ValueError(f"DXF output has no {layer.kind!r} layer")
+        name = DXF_LAYERS[layer.kind][0]
+        for path in layer.paths:
+            if len(path) < 2:
+                continue
+            yield from polyline_chunks(path, name, layer.closed, view_h, precision)
+    yield "0\nENDSEC\n0\nEOF\n"
+
+def write_dxf(path, layers, view_w, view_h, precision=3):
+    """Streams dxf_chunks into path in writes of about WRITE_BYTES. Returns bytes written."""
+    written = 0
+    with profiling.wrap_file(open(path, "w", encoding="ascii", buffering=1 << 16)) as f:
+        batch = []
+        pending = 0
+        for chunk in dxf_chunks(layers, view_w, view_h, precision):
+            batch.append(chunk)
+            pending += len(chunk)
+            if pending >= WRITE_BYTES:
+                f.write("".join(batch))
+                written += pending
+                batch.clear()
+                pending = 0
+        if batch:
+            f.write("".join(batch))
+            written += pending
+    return written
+
+# =========================
+# Boxes / sheets
+# =========================
+def write_box_dxf(path, panels, layout, text=None, optimise_order=False, validate=True, precision=3):
+    """
+    Same drawing as write_box_svg (layout_box placement) minus the raster
+    image. validate refuses (ValueError) invalid outlines like the SVG writer.
+    Returns bytes written.
+    """
+    if validate:
+        polygon_check.require_valid(polygon_check.check_box(panels, layout), os.path.basename(path))
+    layers = []
+    if text is not None:
+        layers.append(laser_gcode.make_layer("engrave", laser_gcode.box_text_paths(text, layout)))
+    layers.append(laser_gcode.make_layer("cut", laser_gcode.box_cut_paths(panels, layout.centers, optimise_order)))
+    return write_dxf(path, layers, layout.view_w, layout.view_h, precision)
+
+def write_sheet_dxf(path, sheet, optimise_order=False, validate=True, precision=3, specs=None):
+    """
+    One nested sheet (nesting.py) as DXF. specs ({box name: manifest row})
+    adds each box's text to the ENGRAVE layer on its placed panel.
+    Returns bytes written.
+    """
+    if validate:
+        polygon_check.require_valid(polygon_check.check_sheet(sheet), os.path.basename(path))
+    layers = []
+    if specs:
+        engrave = laser_gcode.sheet_engrave_paths(sheet, specs, raster=False).engrave
+        if engrave:
+            layers.append(laser_gcode.make_layer("engrave", engrave))
+    layers.append(laser_gcode.make_layer("cut", laser_gcode.sheet_cut_paths(sheet, optimise_order)))
+    return write_dxf(path, layers, sheet.width, sheet.height, precision)
+
+def read_polylines(path):
+    """
+    Reads back the POLYLINE entities of a DXF written here.
+    Returns [SimpleNamespace(layer, closed, points (N, 2), y up)].
+    """
+    with open(path, encoding="ascii") as f:
+        lines = f.read().split("\n")
+    pairs = list(zip(lines[0::2], lines[1::2]))
+    out = []
+    current = None
+    for code, value in pairs:
+        code = code.strip()
+        if code == "0" and value == "POLYLINE":
+            current = SimpleNamespace(layer=None, closed=False, points=[])
+            out.append(current)
+        elif code == "0" and value == "VERTEX" and current is not None:
+            current.points.append([None, None])
+        elif code == "0" and value == "SEQEND":
+            current = None
+        elif current is not None:
+            if code == "8" and current.layer is None:
+                current.layer = value
+            elif code == "70" and not current.points:
+                current.closed = bool(int(value) & 1)
+            elif code == "10" and current.points:
+                current.points[-1][0] = float(value)
+            elif code == "20" and current.points:
+                current.points[-1][1] = float(value)
+    for p in out:
+        p.points = np.array(p.points, dtype=float).reshape(-1, 2)
+    return out
+
+def main(argv=None):
+    import box_batch
+    import nesting
+
+    parser = argparse.ArgumentParser(description="Write DXF R12 cut/engrave files for every box in a manifest.")
+    parser.add_argument("manifest", help="CSV or JSON box manifest (see box_batch.py)")
+    parser.add_argument("--out", default="dxf", help="output directory")
+    parser.add_argument("--sheet", type=nesting.parse_sheet_size, default=None,
+                        help="nest all boxes onto sheets of this size (e.g. 600x400) instead of one file per box")
+    parser.add_argument("--spacing", type=float, default=3.0)
+    parser.add_argument("--precision", type=int, default=3,
+                        choices=range(lcf.MAX_PATH_PRECISION + 1), help="decimals written per coordinate")
+    parser.add_argument("--optimise-order", action="store_true", help="order contours to minimise head travel")
+    args = parser.parse_args(argv)
+
+    try:
+        specs = box_batch.load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"Could not read manifest: {e}")
+        return 1
+    os.makedirs(args.out, exist_ok=True)
+
+    if args.sheet is None:
+        for spec in specs:
+            try:
+                lcf.validate_box_dimensions(spec.length, spec.width, spec.height)
+                if spec.text:
+                    stroke_font.check_text(spec.text)
+            except ValueError as e:
+                print(f"{spec.name}: {e} Skipping.")
+                continue
+            w, h, d = spec.width, spec.height, spec.length
+            panels = kerf.apply_kerf(lcf.generate_box_panels(w, h, d, mt=spec.material_thickness, tw=spec.tab_width),
+                                     spec.kerf)
+            layout = lcf.layout_box(w, h, d, mt=spec.material_thickness)
+            text = laser_gcode.spec_text(spec, layout)
+            if spec.art_path:
+                print(f"{spec.name}: DXF has no raster layer, leaving out {spec.art_path!r}")
+            path = os.path.join(args.out, f"{spec.name}.dxf")
+            try:
+                size = write_box_dxf(path, panels, layout, text, args.optimise_order, precision=args.precision)
+            except ValueError as e:
+                print(f"{spec.name}: {e} Skipping.")
+                continue
+            print(f"Wrote {path} ({size} bytes)")
+        return 0
+
+    parts = nesting.manifest_parts(specs)
+    for spec in specs:
+        if spec.art_path:
+            print(f"{spec.name}: DXF has no raster layer, leaving out {spec.art_path!r}")
+    boxes = {spec.name: spec for spec in specs}
+    sheet_w, sheet_h = args.sheet
+    result = nesting.nest_parts(parts, sheet_w, sheet_h, spacing=args.spacing)
+    for s in result.sheets:
+        path = os.path.join(args.out, f"sheet_{s.index + 1:03d}.dxf")
+        try:
+            size = write_sheet_dxf(path, s, args.optimise_order, precision=args.precision, specs=boxes)
+        except ValueError as e:
+            print(f"Sheet {s.index + 1}: {e} Skipping.")
+            continue
+        print(f"Wrote {path} ({size} bytes)")
+    nesting.print_nesting_report(result)
+    return 0 if not result.unplaced else 2
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,460 @@
+#Vihaan Shah
+#UNI: vvs2119
+#MECE4606 Digital Manufacturing
+#Laser Cutting Project - N-FACE ENCLOSURES
+#
+# generate_box_panels only knows the closed six-panel box, with its edge
+# modes hard-coded in the EDGE_MAP_* tables. This builds enclosures from a
+# graph instead: every face is a rectangle with a 3-D frame (as in
+# fit_check.panel_frames) and the joints are found from the geometry.
+#
+#   corner joint  two faces share an edge. The face whose normal ranks
+#                 higher (up/down > front/back > left/right, the same order
+#                 the box uses) gets TAB, the other SLOT.
+#   T joint       a divider's side lies on the inside of a wall, one panel
+#                 thickness in. The divider gets TAB and the wall gets a
+#                 rectangular mortise cut-out for every tab.
+#   free side     no partner (open top, lid, top of a divider): NONE.
+#
+# Slot parity is picked per SLOT side (generate_panel takes a dict for
+# this): each side gets the parity whose slots leave the least of the
+# mating face's tabs uncovered, using the same checks as fit_check.py.
+#
+# A hinged lid is a loose face on top of walls one panel thickness lower,
+# with screw holes for hinges along the back edge of the lid and the top of
+# the back wall.
+#
+# Outlines are generated in one pass over the distinct faces (dividers are
+# usually identical), across a multiprocessing pool.
+#
+# Usage:
+#   python enclosure.py 300 120 200 --top open --x-dividers 3 --out tray.svg
+#   python enclosure.py 600 150 900 --top hinged --z-dividers 26 --processes 4
+
+import argparse
+import os
+import sys
+import time
+from multiprocessing import Pool
+from types import SimpleNamespace
+
+import numpy as np
+
+import fit_check
+import laser_cutting_fixed as lcf
+import polygon_check
+import profiling
+
+TOP_MODES = ("closed", "open", "hinged")
+
+# Normal axis -> rank; the higher-ranked face of a corner joint gets TAB
+NORMAL_RANK = {1: 2, 2: 1, 0: 0}  # Y (top/bottom), Z (front/back), X (left/right)
+
+HOLE_SEGMENTS = 24
+
+X = np.array([1.0, 0.0, 0.0])
+Y = np.array([0.0, 1.0, 0.0])
+Z = np.array([0.0, 0.0, 1.0])
+
+# =========================
+# Faces
+# =========================
+def make_face(name, size, origin, ex, ey, kind="wall", joined=True):
+    """
+    One flat part. size = (face_w, face_h); outline point (u, v) sits at
+    origin + u * ex + v * ey. Walls are drawn on their outside surface,
+    dividers on their mid-plane. joined=False keeps a face out of the joint
+    search (a lid that is not fixed to the walls).
+    """
+    ex = np.asarray(ex, dtype=float)
+    ey = np.asarray(ey, dtype=float)
+    normal = np.cross(ex, ey)
+    return SimpleNamespace(name=name, size=(float(size[0]), float(size[1])),
+                           origin=np.asarray(origin, dtype=float), ex=ex, ey=ey, normal=normal,
+                           kind=kind, joined=joined, hinge_to=None)
+
+def _side_ends(face):
+    """{side: (start, end)} 3-D corners of each side, walking the outline."""
+    out = {}
+    for side, (p0, p1) in fit_check._side_corners(*face.size).items():
+        a = face.origin + p0[0] * face.ex + p0[1] * face.ey
+        b = face.origin + p1[0] * face.ex + p1[1] * face.ey
+        out[side] = (a, b)
+    return out
+
+def _to_local(face, point):
+    rel = np.asarray(point, dtype=float) - face.origin
+    return float(rel @ face.ex), float(rel @ face.ey)
+
+def enclosure_faces(w, h, d, top="closed", x_dividers=0, z_dividers=0, mt=lcf.mt, hinges=2):
+    """
+    Faces of a w x h x d (outside) enclosure.
+    top: "closed" (TOP panel), "open" (no top) or "hinged" (loose lid on
+    walls one panel thickness lower).
+    x_dividers: walls parallel to LEFT/RIGHT, splitting the width into equal
+    compartments; z_dividers: parallel to FRONT/BACK, splitting the depth.
+    Crossing dividers would need half-lap notches, which generate_panel
+    cannot cut, so only one direction is allowed.
+    """
+    if top not in TOP_MODES:
+        raise ValueError(f"top must be one of {', '.join(TOP_MODES)}")
+    if x_dividers < 0 or z_dividers < 0:
+        raise ValueError("divider counts cannot be negative")
+    if x_dividers and z_dividers:
+        raise ValueError("crossing dividers are not supported; divide along one axis")
+
+    # A hinged lid sits on the walls, so they lose one panel thickness
+    wall_h = h - mt if top == "hinged" else h
+    wall_y = -mt / 2.0 if top == "hinged" else 0.0
+
+    faces = [
+        make_face("FRONT", (w, wall_h), Z * d / 2 + Y * wall_y, X, Y),
+        make_face("BACK", (w, wall_h), -Z * d / 2 + Y * wall_y, -X, Y),
+        make_face("LEFT", (d, wall_h), -X * w / 2 + Y * wall_y, Z, Y),
+        make_face("RIGHT", (d, wall_h), X * w / 2 + Y * wall_y, -Z, Y),
+        make_face("BOTTOM", (w, d), -Y * h / 2, X, Z),
+    ]
+    if top == "closed":
+        faces.append(make_face("TOP", (w, d), Y * h / 2, X, -Z))
+    elif top == "hinged":
+        lid = make_face("LID", (w, d), Y * h / 2, X, -Z, kind="lid", joined=False)
+        faces.append(lid)
+
+    # Dividers run from the inside of the bottom to the inside of the top
+    # (closed), to the top of the walls (open) or just under the lid (hinged)
+    y0 = -h / 2 + mt
+    y1 = h / 2 if top == "open" else h / 2 - mt
+    for count, span, axis, along, name in ((x_dividers, w, X, Z, "X_DIVIDER"),
+                                           (z_dividers, d, Z, X, "Z_DIVIDER")):
+        if not count:
+            continue
+        inner = span - 2 * mt
+        other = (d if axis is X else w) - 2 * mt
+        pitch = (inner - count * mt) / (count + 1)
+        if pitch < lcf.cl + lcf.cr:
+            raise ValueError(f"{count} dividers leave compartments of {pitch:.1f} mm; too narrow")
+        for i in range(count):
+            pos = -span / 2 + mt + (i + 1) * pitch + i * mt + mt / 2
+            faces.append(make_face(f"{name}_{i + 1}", (other, y1 - y0), axis * pos + Y * (y0 + y1) / 2,
+                                   along, Y, kind="divider"))
+
+    if top == "hinged" and hinges > 0:
+        faces[1].hinge_to = "LID"
+        lid.hinge_to = "BACK"
+    return faces
+
+# =========================
+# Joint graph
+# =========================
+def _normal_rank(face):
+    return NORMAL_RANK[int(np.argmax(np.abs(face.normal)))]
+
+def derive_joints(faces, mt=lcf.mt, tol=1e-6):
+    """
+    Finds every joint from the face geometry.
+    Returns SimpleNamespace(corners, tees, edge_mode) where
+      corners: (tab face, tab side, slot face, slot side, length, same)
+               with same=True when both sides start at the same 3-D corner
+      tees:    (divider, divider side, host face)
+      edge_mode: {face name: {side: "TAB" | "SLOT" | "NONE"}}
+    """
+    by_name = {f.name: f for f in faces}
+    if len(by_name) != len(faces):
+        raise ValueError("face names must be unique")
+    edge_mode = {f.name: {side: "NONE" for side in lcf.SIDES} for f in faces}
+    joined = [f for f in faces if f.joined]
+
+    # Corner joints: two sides with the same pair of 3-D end points
+    ends = {}
+    for f in joined:
+        for side, (a, b) in _side_ends(f).items():
+            a = tuple(np.round(a, 6))
+            b = tuple(np.round(b, 6))
+            ends.setdefault(frozenset((a, b)), []).append((f, side, a, b))
+    corners = []
+    for members in ends.values():
+        if len(members) == 1:
+            continue
+        if len(members) > 2:
+            raise ValueError(f"more than two faces meet on one edge ({', '.join(m[0].name for m in members)})")
+        (fa, sa, a0, a1), (fb, sb, b0, _b1) = members
+        ra, rb = _normal_rank(fa), _normal_rank(fb)
+        if ra == rb:
+            raise ValueError(f"{fa.name} and {fb.name} meet edge to edge in one plane")
+        if ra < rb:
+            fa, sa, fb, sb = fb, sb, fa, sa
+        edge_mode[fa.name][sa] = "TAB"
+        edge_mode[fb.name][sb] = "SLOT"
+        length = float(np.linalg.norm(np.subtract(a1, a0)))
+        corners.append((fa.name, sa, fb.name, sb, length, a0 == b0))
+
+    # T joints: a free divider side lying one thickness inside a wall
+    tees = []
+    hosts = [f for f in joined if f.kind != "divider"]
+    for f in joined:
+        if f.kind != "divider":
+            continue
+        for side, (a, b) in _side_ends(f).items():
+            if edge_mode[f.name][side] != "NONE":
+                continue
+            for host in hosts:
+                depth_a = (a - host.origin) @ host.normal
+                depth_b = (b - host.origin) @ host.normal
+                if abs(depth_a + mt) > tol or abs(depth_b + mt) > tol:
+                    continue
+                hw, hh = host.size[0] / 2 + tol, host.size[1] / 2 + tol
+                if all(abs(u) < hw and abs(v) < hh for u, v in (_to_local(host, a), _to_local(host, b))):
+                    edge_mode[f.name][side] = "TAB"
+                    tees.append((f.name, side, host.name))
+                    break
+    return SimpleNamespace(corners=corners, tees=tees, edge_mode=edge_mode)
+
+# =========================
+# Outline generation
+# =========================
+def _outline_job(job):
+    """One outline plus its side features; job = (size, modes, parity, mt, tw)."""
+    (fw, fh), modes, parity, mt, tw = job
+    edge_mode = dict(zip(lcf.SIDES, modes))
+    pts = lcf.generate_panel_array(fw, fh, edge_mode, dict(zip(lcf.SIDES, parity)), mt=mt, tw=tw)
+    return pts, fit_check.side_features(pts, fw, fh, mt=mt)
+
+def _run_jobs(jobs, pool):
+    if pool is None:
+        return [_outline_job(job) for job in jobs]
+    return pool.map(_outline_job, jobs)
+
+def _mortise(divider, side, tabs, host, mt):
+    """Host-frame rectangles for the divider's tabs on one side."""
+    a, b = _side_ends(divider)[side]
+    length = float(np.linalg.norm(b - a))
+    along = (b - a) / length
+    holes = []
+    for s, e in tabs:
+        corners = []
+        for t, k in ((s, -1), (e, -1), (e, 1), (s, 1)):
+            corners.append(_to_local(host, a + along * t + divider.normal * k * mt / 2))
+        holes.append(np.array(corners))
+    return holes
+
+def _circle(cx, cy, r):
+    angle = np.linspace(0.0, 2 * np.pi, HOLE_SEGMENTS, endpoint=False)
+    return np.column_stack((cx + r * np.cos(angle), cy + r * np.sin(angle)))
+
+def _hinge_holes(face, other, hinges, diameter, inset):
+    """Screw holes along the side of face nearest to the other face's plane."""
+    ends = _side_ends(face)
+    near = min(ends, key=lambda side: abs((ends[side][0] + ends[side][1]) / 2 - other.origin) @ np.abs(other.normal))
+    a, b = (np.array(_to_local(face, p)) for p in ends[near])
+    mid = (a + b) / 2
+    # Sides are axis-aligned in the face frame, so inward is along the larger coordinate
+    axis = 0 if abs(mid[0]) > abs(mid[1]) else 1
+    inward = np.zeros(2)
+    inward[axis] = -np.sign(mid[axis])
+    return [_circle(*(a + (b - a) * (i + 0.5) / hinges + inward * inset), diameter / 2)
+            for i in range(hinges)]
+
+def build_enclosure(faces, mt=lcf.mt, tw=lcf.tw, processes=None, hinges=2, hinge_hole=3.0, hinge_inset=8.0,
+                    clearance=0.0):
+    """
+    Outlines for every face of the graph in one pass.
+    processes=None uses os.cpu_count(); processes=1 runs in this process.
+    Returns SimpleNamespace(faces, corners, tees, mismatch_mm,
+    default_mismatch_mm, outlines_generated, elapsed). Each face carries
+    edge_mode, slot_parity ({side: 0/1}), outline (N, 2) and holes (list of
+    closed (M, 2) outlines) in its own frame. mismatch_mm is the tab
+    interference left over all corner joints; default_mismatch_mm is the
+    same with every slot parity 1, as generate_box_panels cuts them.
+    """
+    t0 = time.perf_counter()
+    graph = derive_joints(faces, mt)
+    by_name = {f.name: f for f in faces}
+    modes = {f.name: tuple(graph.edge_mode[f.name][side] for side in lcf.SIDES) for f in faces}
+
+    def key(f, parity):
+        return (f.size, modes[f.name], tuple(parity), mt, tw)
+
+    pool = None if processes == 1 else Pool(processes=processes or os.cpu_count() or 1)
+    try:
+        # Pass 1: each distinct face with all its slots at parity 0 and at parity 1
+        probe_keys = list(dict.fromkeys(key(f, (p,) * 4) for f in faces for p in (0, 1)))
+        outlines = dict(zip(probe_keys, _run_jobs(probe_keys, pool)))
+
+        # Pick each SLOT side's parity against the tabs of its mating face
+        parity = {f.name: {side: 1 for side in lcf.SIDES} for f in faces}
+        corners = []
+        mismatch = 0.0
+        default = 0.0
+        for na, sa, nb, sb, length, same in graph.corners:
+            tabs = outlines[key(by_name[na], (1,) * 4)][1][sa][0]
+            costs = []
+            for p in (0, 1):
+                slots = outlines[key(by_name[nb], (p,) * 4)][1][sb][1]
+                tree = fit_check.IntervalTree([(s, e, None) for s, e in slots])
+                costs.append(fit_check._edge_mismatch(tabs, tree, length, not same, clearance, 0.0)[0])
+            p = 0 if costs[0] < costs[1] - 1e-9 else 1
+            parity[nb][sb] = p
+            mismatch += costs[p]
+            default += costs[1]
+            corners.append(SimpleNamespace(tab=na, tab_side=sa, slot=nb, slot_side=sb, length=length,
+                                           parity=p, mismatch_mm=costs[p]))
+
+        # Pass 2: final outlines not already made by pass 1
+        final_keys = list(dict.fromkeys(key(f, [parity[f.name][s] for s in lcf.SIDES]) for f in faces))
+        missing = [k for k in final_keys if k not in outlines]
+        outlines.update(zip(missing, _run_jobs(missing, pool)))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    for f in faces:
+        f.edge_mode = graph.edge_mode[f.name]
+        f.slot_parity = parity[f.name]
+        f.outline, f.features = outlines[key(f, [f.slot_parity[s] for s in lcf.SIDES])]
+        f.holes = []
+
+    tees = []
+    for nd, side, nh in graph.tees:
+        divider, host = by_name[nd], by_name[nh]
+        holes = _mortise(divider, side, divider.features[side][0], host, mt)
+        host.holes.extend(holes)
+        tees.append(SimpleNamespace(divider=nd, side=side, host=nh, mortises=len(holes)))
+
+    if hinges > 0:
+        for f in faces:
+            if f.hinge_to is not None:
+                f.holes.extend(_hinge_holes(f, by_name[f.hinge_to], hinges, hinge_hole, hinge_inset))
+
+    return SimpleNamespace(
+        faces=faces,
+        corners=corners,
+        tees=tees,
+        mismatch_mm=mismatch,
+        default_mismatch_mm=default,
+        outlines_generated=len(set(probe_keys) | set(final_keys)),
+        elapsed=time.perf_counter() - t0,
+    )
+
+# =========================
+# Layout and SVG
+# =========================
+def layout_faces(faces, row_width=1000.0, spacing=10.0, mt=lcf.mt):
+    """
+    Shelf layout: tallest parts first, left to right, a new row when
+    row_width is reached. Returns SimpleNamespace(view_w, view_h, centers).
+    """
+    order = sorted(faces, key=lambda f: (-(f.size[1] + 2 * mt), f.name))
+    centers = {}
+    x = y = spacing
+    row_h = 0.0
+    view_w = 0.0
+    for f in order:
+        fw, fh = f.size[0] + 2 * mt, f.size[1] + 2 * mt  # room for the tabs
+        if x > spacing and x + fw + spacing > row_width:
+            x = spacing
+            y += row_h + spacing
+            row_h = 0.0
+        centers[f.name] = (x + fw / 2, y + fh / 2)
+        x += fw + spacing
+        row_h = max(row_h, fh)
+        view_w = max(view_w, x)
+    return SimpleNamespace(view_w=view_w, view_h=y + row_h + spacing, centers=centers)
+
+def check_holes(faces):
+    """Holes that cross their face's outline or each other, as problem strings."""
+    problems = []
+    for f in faces:
+        if not f.holes:
+            continue
+        names = ["outline"] + [f"hole {i + 1}" for i in range(len(f.holes))]
+        for p in polygon_check.part_overlaps([f.outline] + f.holes, names):
+            # A hole inside the outline is the point; anything else is not
+            if p.kind == "inside" and "outline" in (p.a, p.b):
+                continue
+            problems.append(f"{f.name}: {p.a} and {p.b} overlap ({p.kind}) at ({p.x:.3f}, {p.y:.3f})")
+    return problems
+
+def write_enclosure_svg(path, result, layout, validate=True):
+    """
+    Every face with its mortises and hinge holes, in the red cut group.
+    validate refuses (ValueError) crossed outlines, overlapping parts and
+    holes that break out of their face.
+    """
+    panels = {f.name: f.outline for f in result.faces}
+    if validate:
+        problems = polygon_check.check_box(panels, layout) + check_holes(result.faces)
+        polygon_check.require_valid(problems, os.path.basename(path))
+    with profiling.wrap_file(open(path, "w", encoding="utf-8")) as file:
+        lcf.write_svg_header(file, layout)
+        file.write(f'  <g stroke="red" stroke-width="{lcf.stroke_width}" fill="none">\n')
+        for f in result.faces:
+            cx, cy = layout.centers[f.name]
+            file.write(f'    <g transform="translate({cx}, {cy})">\n')
+            file.write(f'      <polygon points="{lcf.points_to_polyline(f.outline.tolist())}" />\n')
+            for hole in f.holes:
+                file.write(f'      <polygon points="{lcf.points_to_polyline(np.round(hole, 4).tolist())}" />\n')
+            file.write('    </g>\n')
+        file.write('  </g>\n')
+        file.write(lcf.SVG_FOOTER)
+
+# =========================
+# Report
+# =========================
+def print_enclosure_report(result):
+    print("=" * 60)
+    print(f"ENCLOSURE: {len(result.faces)} PARTS")
+    print("=" * 60)
+    short = {"TAB": "T", "SLOT": "S", "NONE": "-"}
+    for f in result.faces:
+        edges = "".join(short[f.edge_mode[side]] for side in lcf.SIDES)
+        parity = "".join(str(f.slot_parity[side]) if f.edge_mode[side] == "SLOT" else "." for side in lcf.SIDES)
+        extra = f"  {len(f.holes)} holes" if f.holes else ""
+        print(f"  {f.name:<13} {f.size[0]:7.1f} x {f.size[1]:7.1f}  edges {edges}  parity {parity}{extra}")
+    print("-" * 60)
+    print(f"  Corner joints: {len(result.corners)}")
+    print(f"  T joints:      {len(result.tees)} ({sum(t.mortises for t in result.tees)} mortises)")
+    print(f"  Interference:  {result.mismatch_mm:.2f} mm (all parities 1: {result.default_mismatch_mm:.2f} mm)")
+    for c in result.corners:
+        if c.mismatch_mm > 1e-6:
+            print(f"    {c.tab}.{c.tab_side} -> {c.slot}.{c.slot_side}: {c.mismatch_mm:.2f} mm")
+    print(f"  Outlines:      {result.outlines_generated} generated for {len(result.faces)} parts")
+    print(f"  Time:          {result.elapsed * 1000:.1f} ms")
+    print("=" * 60)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate an enclosure (open top, dividers, hinged lid) as one SVG.")
+    parser.add_argument("width", type=float)
+    parser.add_argument("height", type=float)
+    parser.add_argument("depth", type=float)
+    parser.add_argument("--top", choices=TOP_MODES, default="closed")
+    parser.add_argument("--x-dividers", type=int, default=0, help="dividers splitting the width")
+    parser.add_argument("--z-dividers", type=int, default=0, help="dividers splitting the depth")
+    parser.add_argument("--mt", type=float, default=lcf.mt, help="material thickness (mm)")
+    parser.add_argument("--tw", type=float, default=lcf.tw, help="tab width (mm)")
+    parser.add_argument("--hinges", type=int, default=2, help="hinges on a hinged lid")
+    parser.add_argument("--hinge-hole", type=float, default=3.0, help="hinge screw hole diameter (mm)")
+    parser.add_argument("--hinge-inset", type=float, default=8.0, help="hinge holes from the hinge edge (mm)")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (1 = no pool)")
+    parser.add_argument("--row-width", type=float, default=1000.0, help="layout row width (mm)")
+    parser.add_argument("--out", default="enclosure.svg")
+    args = parser.parse_args(argv)
+
+    try:
+        lcf.validate_box_dimensions(args.depth, args.width, args.height)
+        faces = enclosure_faces(args.width, args.height, args.depth, top=args.top, x_dividers=args.x_dividers,
+                                z_dividers=args.z_dividers, mt=args.mt, hinges=args.hinges)
+        result = build_enclosure(faces, mt=args.mt, tw=args.tw, processes=args.processes, hinges=args.hinges,
+                                 hinge_hole=args.hinge_hole, hinge_inset=args.hinge_inset)
+        layout = layout_faces(result.faces, row_width=args.row_width, mt=args.mt)
+        write_enclosure_svg(args.out, result, layout)
+    except ValueError as e:
+        print(f"Could not build the enclosure: {e}")
+        return 1
+
+    print_enclosure_report(result)
+    print(f"\nWrote {args.out} ({layout.view_w:.0f} x {layout.view_h:.0f} mm)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
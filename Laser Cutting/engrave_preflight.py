@@ -0,0 +1,275 @@
+#Vihaan Shah
+#UNI: vvs2119
+#MECE4606 Digital Manufacturing
+#Laser Cutting Project - ENGRAVE PREFLIGHT
+#
+# fit_art places the PNG on its panel but says nothing about how long the
+# raster engrave will take, and that depends on how much of the picture is
+# dark. This answers it before the job is sent, without dithering:
+#   decode     png_raster.decode_png + to_gray
+#   downsample area average onto the engraving grid at the chosen DPI
+#              (np.add.reduceat over each axis; nearest-neighbour along an
+#              axis where the grid is finer than the image)
+#   coverage   ink per grid cell = 1 - gray, the fraction of dots a
+#              Floyd-Steinberg or ordered dither burns there on average
+#              ("threshold" counts cells darker than 50% instead)
+#   time       the same model as png_raster.estimate_raster_time (each row
+#              swept from its first to its last inked cell at the raster
+#              feed, plus the step down between rows), plus a stop and
+#              restart at the end of every row at the machine acceleration
+#
+# A coarse heatmap shows where the ink is, per-scanline coverage can be
+# saved as CSV, and a job over the operator's budget gets a warning (exit
+# code 2). --check runs the full dither + scanline pipeline for comparison;
+# motion_time.py has the full planner figure for the finished G-code job.
+#
+# Usage:
+#   python engrave_preflight.py art.png --target FRONT --length 150 --width 200 --height 120 --budget 10
+#   python engrave_preflight.py --project gcode_file.project.json --dpi 300 --csv scanlines.csv
+
+import argparse
+import csv
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+import laser_cutting_fixed as lcf
+import laser_gcode
+import motion_time
+import png_raster
+import project
+
+DEFAULT_DPI = 254   # 0.1 mm between lines, the laser_gcode.py default line step
+INK_MIN = 0.02      # cells lighter than this are left blank by the dither
+SHADES = " .:-=+*#%@"
+HEATMAP_COLS = 56
+
+# =========================
+# Coverage
+# =========================
+def _axis_downsample(values, n, axis):
+    """Mean over the pixels landing in each of n cells along one axis."""
+    size = values.shape[axis]
+    if n > size:
+        idx = np.minimum(((np.arange(n) + 0.5) * size / n).astype(np.int64), size - 1)
+        return np.take(values, idx, axis=axis)
+    starts = (np.arange(n) * size) // n
+    sums = np.add.reduceat(values, starts, axis=axis)
+    counts = np.diff(np.append(starts, size))
+    shape = [1, 1]
+    shape[axis] = n
+    return sums / counts.reshape(shape)
+
+def area_downsample(gray, rows, cols):
+    """(rows, cols) grid of mean gray values."""
+    return _axis_downsample(_axis_downsample(gray.astype(np.float64), rows, 0), cols, 1)
+
+def engrave_coverage(png_path, width_mm, height_mm, dpi=DEFAULT_DPI, dither="floyd-steinberg"):
+    """
+    Ink on the engraving grid for the image placed at width_mm x height_mm.
+    Returns SimpleNamespace(ink (rows, cols) in [0, 1], coverage per row,
+    line_step, dot_step, width_mm, height_mm, image_px).
+    """
+    if dpi <= 0:
+        raise ValueError("dpi must be > 0")
+    if dither not in png_raster.DITHERS:
+        raise ValueError(f"unknown dither {dither!r}")
+    line_step = 25.4 / dpi
+    rows = max(1, int(round(height_mm / line_step)))
+    cols = max(1, int(round(width_mm / line_step)))
+    img = png_raster.decode_png(png_path)
+    grid = area_downsample(png_raster.to_gray(img), rows, cols)
+    ink = (grid < 0.5).astype(np.float64) if dither == "threshold" else 1.0 - grid
+    return SimpleNamespace(ink=ink, coverage=ink.mean(axis=1), line_step=line_step, dot_step=line_step,
+                           width_mm=width_mm, height_mm=height_mm, image_px=(img.width, img.height))
+
+def predict_raster_time(cov, feed, accel, passes=1):
+    """
+    Seconds to engrave cov (see the top of the file). feed in mm/min,
+    accel in mm/s^2. Returns SimpleNamespace(seconds, sweep_s, turnaround_s,
+    sweep_mm, burn_mm, rows, first_mm, last_mm) where first_mm/last_mm give
+    each row's inked span (NaN for blank rows).
+    """
+    inked = cov.ink >= INK_MIN
+    active = inked.any(axis=1)
+    n_cols = inked.shape[1]
+    first = np.where(active, inked.argmax(axis=1), -1)
+    last = np.where(active, n_cols - 1 - inked[:, ::-1].argmax(axis=1), -1)
+    first_mm = np.where(active, first * cov.dot_step, np.nan)
+    last_mm = np.where(active, (last + 1) * cov.dot_step, np.nan)
+
+    rows = np.flatnonzero(active)
+    sweep = float(np.nansum(last_mm - first_mm))
+    if len(rows):
+        sweep += (rows[-1] - rows[0]) * cov.line_step
+    v = feed / 60.0
+    sweep_s = passes * sweep / v
+    # Full stop at the end of each row and back up to speed: v / a extra per row
+    turnaround_s = passes * len(rows) * v / accel
+    return SimpleNamespace(
+        seconds=sweep_s + turnaround_s,
+        sweep_s=sweep_s,
+        turnaround_s=turnaround_s,
+        sweep_mm=sweep,
+        burn_mm=float(cov.ink.sum()) * cov.dot_step,
+        rows=len(rows),
+        first_mm=first_mm,
+        last_mm=last_mm,
+    )
+
+def preflight(art, fit, dpi=DEFAULT_DPI, dither="floyd-steinberg", feed=None, accel=None, passes=None,
+              budget_s=None):
+    """
+    Coverage and predicted time for art placed at fit (lcf.fit_art).
+    feed / passes default to the laser_gcode raster layer, accel to
+    motion_time's machine. Returns SimpleNamespace(art, fit, dpi, dither,
+    coverage, time, budget_s, over_budget, elapsed).
+    """
+    t0 = time.perf_counter()
+    raster = laser_gcode.LAYER_DEFAULTS["raster"]
+    feed = feed or raster["feed"]
+    passes = passes or raster["passes"]
+    accel = motion_time.machine(accel=accel).accel
+    cov = engrave_coverage(art.path, fit.w, fit.h, dpi, dither)
+    est = predict_raster_time(cov, feed, accel, passes)
+    return SimpleNamespace(
+        art=art,
+        fit=fit,
+        dpi=dpi,
+        dither=dither,
+        feed=feed,
+        passes=passes,
+        coverage=cov,
+        time=est,
+        budget_s=budget_s,
+        over_budget=budget_s is not None and est.seconds > budget_s,
+        elapsed=time.perf_counter() - t0,
+    )
+
+def full_raster_time(result):
+    """The dithered scanline estimate (png_raster) at the same grid, for --check."""
+    cov = result.coverage
+    raster = png_raster.raster_art(result.art.path, 0.0, 0.0, cov.width_mm, cov.height_mm,
+                                   line_step=cov.line_step, dither=result.dither)
+    est = png_raster.estimate_raster_time(raster.rows, result.feed, cov.line_step)
+    est.seconds *= result.passes
+    return est
+
+# =========================
+# Output
+# =========================
+def heatmap(ink, max_cols=HEATMAP_COLS):
+    """Text rows shading the mean ink per cell (terminal cells are about twice as tall as wide)."""
+    rows, cols = ink.shape
+    n_cols = max(1, min(max_cols, cols))
+    n_rows = max(1, min(rows, int(round(n_cols * rows / cols / 2.0))))
+    cells = area_downsample(ink, n_rows, n_cols)
+    levels = np.minimum((cells * len(SHADES)).astype(np.int64), len(SHADES) - 1)
+    return ["".join(SHADES[k] for k in row) for row in levels.tolist()]
+
+def write_scanline_csv(path, result):
+    cov = result.coverage
+    est = result.time
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["row", "y_mm", "coverage", "first_mm", "last_mm"])
+        for i, c in enumerate(cov.coverage.tolist()):
+            first = est.first_mm[i]
+            last = est.last_mm[i]
+            writer.writerow([i, f"{(i + 0.5) * cov.line_step:.3f}", f"{c:.4f}",
+                             "" if np.isnan(first) else f"{first:.3f}",
+                             "" if np.isnan(last) else f"{last:.3f}"])
+
+def print_preflight_report(result, full=None):
+    cov = result.coverage
+    est = result.time
+    print("=" * 60)
+    print(f"ENGRAVE PREFLIGHT: {os.path.basename(result.art.path)} on {result.art.target}")
+    print("=" * 60)
+    print(f"  Image:        {cov.image_px[0]} x {cov.image_px[1]} px, placed at "
+          f"{cov.width_mm:.1f} x {cov.height_mm:.1f} mm")
+    print(f"  Grid:         {cov.ink.shape[0]} lines x {cov.ink.shape[1]} dots at {result.dpi:g} DPI "
+          f"({cov.line_step:.3f} mm)")
+    print(f"  Coverage:     {cov.coverage.mean() * 100:.1f}% of the image ({result.dither})")
+    if est.rows:
+        busiest = int(np.argmax(cov.coverage))
+        print(f"  Busiest line: {cov.coverage[busiest] * 100:.1f}% at y = {(busiest + 0.5) * cov.line_step:.1f} mm")
+    print(f"  Lines to run: {est.rows} of {cov.ink.shape[0]} (blank lines are skipped)")
+    print("-" * 60)
+    for line in heatmap(cov.ink):
+        print(f"  |{line}|")
+    print("-" * 60)
+    print(f"  Burned:       {est.burn_mm / 1000:.2f} m of dots, swept {est.sweep_mm / 1000:.2f} m")
+    print(f"  Time:         {est.seconds / 60:.1f} min  (sweep {est.sweep_s / 60:.1f} min + "
+          f"row turnarounds {est.turnaround_s / 60:.1f} min, {result.passes} pass(es) at {result.feed:g} mm/min)")
+    if full is not None:
+        print(f"  Dithered:     {full.seconds / 60:.1f} min sweep over {full.rows} lines "
+              f"(preflight sweep {est.sweep_s / 60:.1f} min)")
+    if result.budget_s is not None:
+        if result.over_budget:
+            print(f"  WARNING: about {est.seconds / 60:.1f} min is over the {result.budget_s / 60:g} min budget; "
+                  f"lower the DPI or use a lighter image")
+        else:
+            print(f"  Budget:       within {result.budget_s / 60:g} min")
+    print(f"  Preflight:    {result.elapsed * 1000:.1f} ms")
+    print("=" * 60)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Predict raster engrave time and coverage for a PNG before cutting.")
+    parser.add_argument("png", nargs="?", default=None, help="PNG artwork (default: the project's art)")
+    parser.add_argument("--project", default=None, help="project file (project.py); takes the box and art from it")
+    parser.add_argument("--target", choices=lcf.PANEL_NAMES, default=None, help="panel the art goes on")
+    parser.add_argument("--length", type=float)
+    parser.add_argument("--width", type=float)
+    parser.add_argument("--height", type=float)
+    parser.add_argument("--dpi", type=float, default=DEFAULT_DPI, help="engraving lines per inch")
+    parser.add_argument("--dither", choices=sorted(png_raster.DITHERS), default="floyd-steinberg")
+    parser.add_argument("--feed", type=float, default=None, help="raster feed (mm/min)")
+    parser.add_argument("--passes", type=int, default=None)
+    parser.add_argument("--accel", type=float, default=None, help="mm/s^2")
+    parser.add_argument("--budget", type=float, default=None, help="warn when the engrave takes longer (minutes)")
+    parser.add_argument("--csv", default=None, help="write per-scanline coverage here")
+    parser.add_argument("--check", action="store_true", help="also run the full dither for comparison")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.project:
+            inputs = project.load_project(args.project)["inputs"]
+            layout, art, _text = project.resolve_inputs(inputs)
+            target = args.target or (art.target if art is not None else None)
+            png = args.png or (art.path if art is not None else None)
+        else:
+            if None in (args.length, args.width, args.height):
+                print("Give --project or --length, --width and --height")
+                return 1
+            lcf.validate_box_dimensions(args.length, args.width, args.height)
+            layout = lcf.layout_box(args.width, args.height, args.length)
+            target, png = args.target, args.png
+        if png is None or target is None:
+            print("Give the PNG and --target (or a project with art)")
+            return 1
+
+        art = lcf.load_art(png, target)
+        if art is None:
+            print(f"Could not read/parse PNG {png!r}")
+            return 1
+        fit = lcf.fit_art(art, layout.centers[target], layout.sizes[target])
+        budget_s = args.budget * 60.0 if args.budget is not None else None
+        result = preflight(art, fit, args.dpi, args.dither, args.feed, args.accel, args.passes, budget_s)
+        full = full_raster_time(result) if args.check else None
+        if args.csv:
+            write_scanline_csv(args.csv, result)
+    except (OSError, ValueError) as e:
+        print(f"Preflight failed: {e}")
+        return 1
+
+    print_preflight_report(result, full)
+    if args.csv:
+        print(f"\nWrote {args.csv}")
+    return 2 if result.over_budget else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,317 @@
+#Vihaan Shah
+#UNI: vvs2119
+#MECE4606 Digital Manufacturing
+#Laser Cutting Project - ASSEMBLY FIT CHECK
+#
+# Checks that the six panels actually go together: along every one of the
+# 12 box edges, each tab of one panel has to land in a slot of the panel it
+# meets, with the requested clearance.
+#
+#   1. Each panel's nominal rectangle is placed on the outside of the box
+#      (w x h x d) in 3-D. Two panel sides that land on the same box edge
+#      mate; that gives the edge-mating graph.
+#   2. The tab and slot intervals of every side are read back from the
+#      outline itself (edges parallel to the side, pushed out = tab, pushed
+#      in = slot), measured from the side's start corner.
+#   3. The other panel's slots go into an interval tree and every tab
+#      (plus clearance, minus kerf) is checked against them. Whatever part of
+#      a tab is not inside a slot is reported as interference in mm.
+# A panel can be put in facing out or turned over, which reverses the
+# direction its sides run along the box edges, so all 2^6 ways of turning
+# the panels over are tried and the best one is reported.
+#
+# Usage:
+#   python fit_check.py 200 120 150            (width height length, mm)
+#   python fit_check.py 200 120 150 --clearance 0.05 --kerf 0.15
+
+import argparse
+import itertools
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+
+import laser_cutting_fixed as lcf
+
+# =========================
+# Interval tree
+# =========================
+class IntervalTree:
+    """Static centred interval tree over (start, end, payload) tuples."""
+
+    def __init__(self, intervals):
+        self.root = self._build(sorted(intervals))
+
+    def _build(self, items):
+        if not items:
+            return None
+        ends = sorted(x for s, e, _ in items for x in (s, e))
+        center = ends[len(ends) // 2]
+        left = [it for it in items if it[1] < center]
+        right = [it for it in items if it[0] > center]
+        here = [it for it in items if it[0] <= center <= it[1]]
+        return SimpleNamespace(
+            center=center,
+            by_start=sorted(here),
+            by_end=sorted(here, key=lambda it: it[1], reverse=True),
+            left=self._build(left),
+            right=self._build(right),
+        )
+
+    def overlapping(self, lo, hi):
+        """Intervals with start <= hi and end >= lo, sorted by start."""
+        out = []
+        node = self.root
+        stack = [node] if node else []
+        while stack:
+            node = stack.pop()
+            if hi < node.center:
+                for it in node.by_start:
+                    if it[0] > hi:
+                        break
+                    out.append(it)
+                if node.left:
+                    stack.append(node.left)
+            elif lo > node.center:
+                for it in node.by_end:
+                    if it[1] < lo:
+                        break
+                    out.append(it)
+                if node.right:
+                    stack.append(node.right)
+            else:
+                out.extend(node.by_start)
+                if node.left:
+                    stack.append(node.left)
+                if node.right:
+                    stack.append(node.right)
+        out.sort()
+        return out
+
+def uncovered(tree, lo, hi):
+    """Length of [lo, hi] not covered by any interval in tree."""
+    covered = 0.0
+    reach = lo
+    for s, e, _ in tree.overlapping(lo, hi):
+        s = max(s, reach)
+        e = min(e, hi)
+        if e > s:
+            covered += e - s
+            reach = e
+    return max(0.0, (hi - lo) - covered)
+
+# =========================
+# Box geometry
+# =========================
+SIDE_NAMES = ("top", "right", "bottom", "left")
+
+def panel_frames(w, h, d):
+    """
+    Each panel's size and 3-D frame on the outside of the box, seen from
+    outside: (size, origin, local x axis, local y axis).
+    Box axes: X across the width, Y up, Z towards the front.
+    """
+    X = np.array([1.0, 0.0, 0.0])
+    Y = np.array([0.0, 1.0, 0.0])
+    Z = np.array([0.0, 0.0, 1.0])
+    return {
+        "FRONT":  ((w, h), Z * d / 2, X, Y),
+        "BACK":   ((w, h), -Z * d / 2, -X, Y),
+        "LEFT":   ((d, h), -X * w / 2, Z, Y),
+        "RIGHT":  ((d, h), X * w / 2, -Z, Y),
+        "TOP":    ((w, d), Y * h / 2, X, -Z),
+        "BOTTOM": ((w, d), -Y * h / 2, X, Z),
+    }
+
+def _side_corners(fw, fh):
+    """Start and end corner of each side, walking the outline (clockwise on screen)."""
+    hw, hh = fw / 2.0, fh / 2.0
+    return {
+        "top":    ((-hw, hh), (hw, hh)),
+        "right":  ((hw, hh), (hw, -hh)),
+        "bottom": ((hw, -hh), (-hw, -hh)),
+        "left":   ((-hw, -hh), (-hw, hh)),
+    }
+
+def mating_edges(w, h, d):
+    """
+    The 12 box edges as (panel A, side A, panel B, side B, length, same),
+    with every panel facing out. same=True when both sides start at the
+    same box corner (their distances along the edge agree).
+    """
+    ends = {}
+    for name, ((fw, fh), origin, ex, ey) in panel_frames(w, h, d).items():
+        for side, (p0, p1) in _side_corners(fw, fh).items():
+            a = tuple(np.round(origin + p0[0] * ex + p0[1] * ey, 6))
+            b = tuple(np.round(origin + p1[0] * ex + p1[1] * ey, 6))
+            ends.setdefault(frozenset((a, b)), []).append((name, side, a, b))
+    edges = []
+    for members in ends.values():
+        if len(members) != 2:
+            raise ValueError("box faces do not close up")
+        (na, sa, a0, a1), (nb, sb, b0, _b1) = members
+        length = float(np.linalg.norm(np.subtract(a1, a0)))
+        edges.append((na, sa, nb, sb, length, a0 == b0))
+    return edges
+
+# =========================
+# Tabs and slots from the outline
+# =========================
+def side_features(points, fw, fh, mt=lcf.mt):
+    """
+    {side: (tabs, slots)} read back from a closed outline. Each is a list
+    of (start, end) distances from the side's start corner.
+    """
+    pts = np.asarray(points, dtype=float)
+    a = pts
+    b = np.roll(pts, -1, axis=0)
+    hw, hh = fw / 2.0, fh / 2.0
+    horizontal = np.abs(a[:, 1] - b[:, 1]) < 1e-9
+    vertical = np.abs(a[:, 0] - b[:, 0]) < 1e-9
+
+    # side: (edge mask, across coordinate, base, outward sign, along coords -> distance)
+    sides = {
+        "top":    (horizontal, a[:, 1], hh, +1, lambda u: u + hw, (a[:, 0], b[:, 0])),
+        "right":  (vertical, a[:, 0], hw, +1, lambda u: hh - u, (a[:, 1], b[:, 1])),
+        "bottom": (horizontal, a[:, 1], -hh, -1, lambda u: hw - u, (a[:, 0], b[:, 0])),
+        "left":   (vertical, a[:, 0], -hw, -1, lambda u: u + hh, (a[:, 1], b[:, 1])),
+    }
+    out = {}
+    for side, (mask, across, base, sign, to_dist, (u0, u1)) in sides.items():
+        offset = (across - base) * sign
+        tabs = []
+        slots = []
+        for i in np.flatnonzero(mask & (np.abs(offset) > mt / 2) & (np.abs(offset) < mt * 1.5)).tolist():
+            s, e = sorted((to_dist(u0[i]), to_dist(u1[i])))
+            (tabs if offset[i] > 0 else slots).append((s, e))
+        out[side] = (sorted(tabs), sorted(slots))
+    return out
+
+# =========================
+# Verification
+# =========================
+def _edge_mismatch(tabs, slot_tree, length, flip, clearance, kerf):
+    """Interference (mm) and worst tab for one direction of one joint."""
+    total = 0.0
+    worst = None
+    for s, e in tabs:
+        if flip:
+            s, e = length - e, length - s
+        # As cut, a tab loses kerf/2 at each end and a slot gains it, so
+        # against the drawn slots the tab is a full kerf shorter per end
+        lo = s + kerf - clearance
+        hi = e - kerf + clearance
+        miss = uncovered(slot_tree, lo, hi)
+        if miss > 1e-6:
+            total += miss
+            if worst is None or miss > worst[2]:
+                worst = (s, e, miss)
+    return total, worst
+
+def verify_box(panels, w, h, d, mt=lcf.mt, clearance=0.0, kerf=0.0):
+    """
+    panels: {name: outline} from generate_box_panels (optionally kerf-offset).
+    clearance: gap (mm) wanted at each end of every tab.
+    kerf: beam width the panels will be cut with.
+    Returns SimpleNamespace(ok, flipped, mismatch_mm, joints, outward_mismatch_mm)
+    where joints lists every mating edge of the best assembly with its
+    interference in mm, and flipped lists the panels turned over in it.
+    """
+    frames = panel_frames(w, h, d)
+    # Turning a panel over = mirroring its outline left/right in its own frame.
+    # Opposite faces are usually identical, so each distinct outline is read once.
+    features = {}
+    slot_trees = {}
+    seen = {}
+    for n in lcf.PANEL_NAMES:
+        pts = np.asarray(panels[n], dtype=float)
+        size = frames[n][0]
+        key = (pts.tobytes(), size)
+        if key not in seen:
+            seen[key] = {}
+            for flipped, outline in ((False, pts), (True, pts * [-1.0, 1.0])):
+                sides = side_features(outline, *size, mt=mt)
+                trees = {side: IntervalTree([(s, e, None) for s, e in slots])
+                         for side, (_tabs, slots) in sides.items()}
+                seen[key][flipped] = (sides, trees)
+        for flipped, (sides, trees) in seen[key].items():
+            features[(n, flipped)] = sides
+            for side, tree in trees.items():
+                slot_trees[(n, flipped, side)] = tree
+
+    # Per edge, interference for each of the 4 (flip A, flip B) combinations
+    joints = []
+    for na, sa, nb, sb, length, same in mating_edges(w, h, d):
+        costs = {}
+        for fa, fb in itertools.product((False, True), repeat=2):
+            tabs_a = features[(na, fa)][sa][0]
+            tabs_b = features[(nb, fb)][sb][0]
+            ab = _edge_mismatch(tabs_a, slot_trees[(nb, fb, sb)], length, not same, clearance, kerf)
+            ba = _edge_mismatch(tabs_b, slot_trees[(na, fa, sa)], length, not same, clearance, kerf)
+            costs[(fa, fb)] = (ab[0] + ba[0], ab[1] or ba[1])
+        joints.append(SimpleNamespace(a=na, side_a=sa, b=nb, side_b=sb, length=length, costs=costs))
+
+    # Total interference of all 2^6 flip assignments at once
+    names = list(lcf.PANEL_NAMES)
+    states = np.array(list(itertools.product((0, 1), repeat=len(names))))
+    col = {n: k for k, n in enumerate(names)}
+    totals = np.zeros(len(states))
+    for j in joints:
+        table = np.array([[j.costs[(False, False)][0], j.costs[(False, True)][0]],
+                          [j.costs[(True, False)][0], j.costs[(True, True)][0]]])
+        totals += table[states[:, col[j.a]], states[:, col[j.b]]]
+    pick = int(np.argmin(totals))  # first minimum = fewest panels turned over among ties
+    best = (float(totals[pick]), {n: bool(states[pick, col[n]]) for n in names})
+    outward = float(totals[0])
+
+    total, flip = best
+    report = []
+    for j in joints:
+        miss, worst = j.costs[(flip[j.a], flip[j.b])]
+        report.append(SimpleNamespace(a=j.a, side_a=j.side_a, b=j.b, side_b=j.side_b,
+                                      mismatch_mm=miss, worst=worst))
+    return SimpleNamespace(
+        ok=total <= 1e-6,
+        flipped=[n for n in names if flip[n]],
+        mismatch_mm=total,
+        joints=report,
+        outward_mismatch_mm=outward,
+    )
+
+def print_fit_report(result):
+    print("=" * 60)
+    print("ASSEMBLY FIT:")
+    print("=" * 60)
+    if result.flipped:
+        print(f"  Turn over before assembly: {', '.join(result.flipped)}")
+    for j in result.joints:
+        status = "ok  " if j.mismatch_mm <= 1e-6 else "MISS"
+        line = f"  {status} {j.a + '.' + j.side_a:<13} <-> {j.b + '.' + j.side_b:<13} {j.mismatch_mm:6.2f} mm"
+        if j.worst:
+            s, e, miss = j.worst
+            line += f"  (tab {s:.1f}-{e:.1f} mm off its slot by {miss:.2f} mm)"
+        print(line)
+    print("-" * 60)
+    print(f"  Total interference: {result.mismatch_mm:.2f} mm "
+          f"(all panels facing out: {result.outward_mismatch_mm:.2f} mm)")
+    print("=" * 60)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that a box's tabs land in its slots.")
+    parser.add_argument("width", type=float)
+    parser.add_argument("height", type=float)
+    parser.add_argument("length", type=float)
+    parser.add_argument("--thickness", type=float, default=lcf.mt)
+    parser.add_argument("--tab-width", type=float, default=lcf.tw)
+    parser.add_argument("--clearance", type=float, default=0.0, help="gap wanted at each tab end (mm)")
+    parser.add_argument("--kerf", type=float, default=0.0, help="beam kerf the parts are cut with (mm)")
+    args = parser.parse_args(argv)
+
+    w, h, d = args.width, args.height, args.length
+    panels = lcf.generate_box_panels(w, h, d, mt=args.thickness, tw=args.tab_width)
+    result = verify_box(panels, w, h, d, mt=args.thickness, clearance=args.clearance, kerf=args.kerf)
+    print_fit_report(result)
+    return 0 if result.ok else 2
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,504 @@
+#Vihaan Shah
+#UNI: vvs2119
+#MECE4606 Digital Manufacturing
+#Laser Cutting Project - GOLDEN GEOMETRY REGRESSION OVER .history
+#
+# .history/ holds the timestamped editor snapshots of script_initial /
+# script_final. Every one of them asks its questions with input() and
+# writes an SVG into the current directory, so this harness runs each
+# snapshot in its own temp directory with input() answered from a script
+# (see ANSWER_RULES), several at a time. Each child is a bare interpreter
+# (CHILD), so the timings are the snapshot's own.
+#
+# The SVGs are reduced to geometry only: every vertex of every shape
+# (polygon, polyline, path, rect, line, circle, <use> of a <symbol>) with
+# its transforms applied, rounded to GRID_MM, deduplicated and sorted. The
+# hash of that point set ignores colours, attribute order, number
+# formatting and element order, so it only changes when the cut/engrave
+# geometry does. The matrix has one row per snapshot in time order and one
+# column per input case; "*" marks a row whose geometry differs from the
+# previous snapshot of the same script. Run times that jump by more than
+# SLOWDOWN_FACTOR are listed as well.
+#
+# Usage:
+#   python history_regress.py
+#   python history_regress.py --case cube=100,100,100 --csv matrix.csv --report regress.json
+#   python history_regress.py --only script_final --repeat 3 --processes 1
+
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from multiprocessing import Pool
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HISTORY_DIR = os.path.join(HERE, ".history")
+CURRENT_SCRIPTS = ("script_initial.py", "script_final.py", "laser_cutting_fixed.py")
+
+GRID_MM = 0.001
+TIMEOUT_S = 30.0
+MAX_PROMPTS = 100          # a snapshot still asking after this many is stuck in a loop
+SLOWDOWN_FACTOR = 2.0
+SLOWDOWN_MIN_MS = 5.0      # ignore jumps smaller than this (process noise)
+RESULT_FILE = "_history_regress_result.json"
+
+# name -> (length, width, height)
+DEFAULT_CASES = {
+    "box": (150.0, 200.0, 120.0),
+    "cube": (100.0, 100.0, 100.0),
+}
+
+# First matching pattern answers the prompt (lower-cased). The snapshots
+# spell their prompts many ways ("stroke widt", "fistrll color", ...).
+ANSWER_RULES = (
+    (r"stroke wid", "stroke_width"),
+    (r"fill|fistrll", "fill_color"),
+    (r"colou?r", "stroke_color"),
+    (r"\bx co", "x"),
+    (r"\by co", "y"),
+    (r"\bz co", "z"),
+    (r"length", "length"),
+    (r"width", "width"),
+    (r"height", "height"),
+    (r"\(y/n\)", "no"),
+)
+FIXED_ANSWERS = {"x": "0", "y": "0", "z": "0", "stroke_width": "0.25", "fill_color": "none",
+                 "stroke_color": "red", "no": "n"}
+
+# =========================
+# Running one snapshot (child process)
+# =========================
+# Runs in a bare interpreter (python -c) so every child only pays for the
+# snapshot's own imports, not for numpy and this module.
+CHILD = r"""
+import builtins, json, os, re, runpy, sys, time
+script, answers, rules, max_prompts, result_file = json.loads(sys.argv[1])
+log = {"prompts": 0, "unanswered": []}
+
+def answer(prompt=""):
+    log["prompts"] += 1
+    if log["prompts"] > max_prompts:
+        raise EOFError("too many prompts")
+    text = str(prompt).lower()
+    for pattern, key in rules:
+        if re.search(pattern, text):
+            return answers[key]
+    log["unanswered"].append(str(prompt).strip())
+    return ""
+
+builtins.input = answer
+sys.argv = [script]
+sys.path.insert(0, os.path.dirname(script))
+status = "ok"
+t0 = time.perf_counter()
+try:
+    runpy.run_path(script, run_name="__main__")
+except SystemExit as e:
+    if e.code not in (None, 0):
+        status = "exit"
+except SyntaxError:
+    status = "syntax"
+except EOFError:
+    status = "stuck"
+except Exception as e:
+    status = "error:" + type(e).__name__
+log.update(status=status, exec_s=time.perf_counter() - t0)
+with open(result_file, "w") as f:
+    json.dump(log, f)
+"""
+
+def child_args(script, case):
+    """Argument for CHILD: the answers for one (length, width, height) case."""
+    answers = dict(FIXED_ANSWERS, length=repr(case[0]), width=repr(case[1]), height=repr(case[2]))
+    return json.dumps([os.path.abspath(script), answers, ANSWER_RULES, MAX_PROMPTS, RESULT_FILE])
+
+# =========================
+# Geometry canonicalisation
+# =========================
+_NUMBER = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+_TOKEN = re.compile(rf"([MmLlHhVvZzCcSsQqTtAa])|({_NUMBER})")
+_TRANSFORM = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+_PATH_ARGS = {"M": 2, "L": 2, "H": 1, "V": 1, "Z": 0, "C": 6, "S": 4, "Q": 4, "T": 2, "A": 7}
+
+def _numbers(text):
+    return [float(v) for v in re.findall(_NUMBER, text or "")]
+
+def parse_transform(text):
+    """3x3 affine matrix for an SVG transform attribute."""
+    m = np.eye(3)
+    for name, args in _TRANSFORM.findall(text or ""):
+        v = _numbers(args)
+        t = np.eye(3)
+        if name == "matrix" and len(v) == 6:
+            t[:2] = [[v[0], v[2], v[4]], [v[1], v[3], v[5]]]
+        elif name == "translate" and v:
+            t[:2, 2] = [v[0], v[1] if len(v) > 1 else 0.0]
+        elif name == "scale" and v:
+            t[0, 0], t[1, 1] = v[0], v[1] if len(v) > 1 else v[0]
+        elif name == "rotate" and v:
+            a = np.radians(v[0])
+            c, s = np.cos(a), np.sin(a)
+            cx, cy = (v[1], v[2]) if len(v) == 3 else (0.0, 0.0)
+            t[:2] = [[c, -s, cx - c * cx + s * cy], [s, c, cy - s * cx - c * cy]]
+        elif name == "skewX" and v:
+            t[0, 1] = np.tan(np.radians(v[0]))
+        elif name == "skewY" and v:
+            t[1, 0] = np.tan(np.radians(v[0]))
+        m = m @ t
+    return m
+
+def path_vertices(d):
+    """End points (and control points) of every path segment, absolute."""
+    pts = []
+    x = y = x0 = y0 = 0.0
+    cmd = None
+    args = []
+
+    def flush(cmd, args):
+        nonlocal x, y, x0, y0
+        upper = cmd.upper()
+        n = _PATH_ARGS[upper]
+        rel = cmd.islower()
+        if n == 0:
+            x, y = x0, y0
+            return
+        for i in range(0, len(args) - n + 1, n):
+            a = args[i:i + n]
+            bx, by = (x, y) if rel else (0.0, 0.0)
+            if upper == "H":
+                x = a[0] + (x if rel else 0.0)
+            elif upper == "V":
+                y = a[0] + (y if rel else 0.0)
+            elif upper == "A":
+                x, y = a[5] + bx, a[6] + by
+            else:
+                for j in range(0, n - 2, 2):
+                    pts.append((a[j] + bx, a[j + 1] + by))
+                x, y = a[n - 2] + bx, a[n - 1] + by
+            pts.append((x, y))
+            if upper == "M" and i == 0:
+                x0, y0 = x, y
+            if upper == "M":
+                # Extra pairs after a moveto are linetos
+                upper, n = "L", 2
+
+    for letter, number in _TOKEN.findall(d or ""):
+        if letter:
+            if cmd is not None:
+                flush(cmd, args)
+            cmd, args = letter, []
+        else:
+            args.append(float(number))
+    if cmd is not None:
+        flush(cmd, args)
+    return pts
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+def _attr(el, name, default=0.0):
+    """First number of a length attribute ("12.5", "12.5mm"), or default."""
+    v = _numbers(el.get(name))
+    return v[0] if v else default
+
+def element_vertices(el):
+    """Vertices of one basic shape in its own coordinates."""
+    tag = _local(el.tag)
+    get = lambda name: _attr(el, name)
+    if tag in ("polygon", "polyline"):
+        v = _numbers(el.get("points"))
+        return list(zip(v[0::2], v[1::2]))
+    if tag == "path":
+        return path_vertices(el.get("d"))
+    if tag == "rect":
+        x, y, w, h = get("x"), get("y"), get("width"), get("height")
+        return [(x, y), (x + w, y), (x + w, y + h), (x, y + h)]
+    if tag == "line":
+        return [(get("x1"), get("y1")), (get("x2"), get("y2"))]
+    if tag in ("circle", "ellipse"):
+        cx, cy = get("cx"), get("cy")
+        rx = get("r") if tag == "circle" else get("rx")
+        ry = get("r") if tag == "circle" else get("ry")
+        return [(cx - rx, cy), (cx + rx, cy), (cx, cy - ry), (cx, cy + ry)]
+    return []
+
+_NOT_DRAWN = ("defs", "symbol", "clipPath", "mask", "marker", "pattern", "title", "desc", "metadata")
+
+def svg_points(root):
+    """(N, 2) array of every drawn vertex of a parsed SVG, transforms applied."""
+    ids = {el.get("id"): el for el in root.iter() if el.get("id")}
+    out = []
+
+    def walk(el, m, depth):
+        if depth > 32:
+            return  # <use> cycle
+        tag = _local(el.tag)
+        if tag in _NOT_DRAWN:
+            return
+        m = m @ parse_transform(el.get("transform"))
+        if tag == "use":
+            href = el.get("href") or el.get("{http://www.w3.org/1999/xlink}href") or ""
+            target = ids.get(href.lstrip("#"))
+            if target is not None:
+                place = parse_transform(f"translate({_attr(el, 'x')}, {_attr(el, 'y')})")
+                if _local(target.tag) == "symbol":
+                    # The symbol's viewBox is fitted into the x/y/width/height viewport
+                    vb = _numbers(target.get("viewBox"))
+                    if len(vb) == 4 and vb[2] > 0 and vb[3] > 0:
+                        sx = _attr(el, "width", vb[2]) / vb[2]
+                        sy = _attr(el, "height", vb[3]) / vb[3]
+                        place = place @ parse_transform(f"scale({sx}, {sy}) translate({-vb[0]}, {-vb[1]})")
+                    children = list(target)
+                else:
+                    children = [target]
+                for child in children:
+                    walk(child, m @ place, depth + 1)
+            return
+        pts = element_vertices(el)
+        if pts:
+            p = np.asarray(pts, dtype=float)
+            out.append(p @ m[:2, :2].T + m[:2, 2])
+        for child in el:
+            walk(child, m, depth)
+
+    walk(root, np.eye(3), 0)
+    return np.concatenate(out) if out else np.zeros((0, 2))
+
+def geometry_hash(points, grid=GRID_MM):
+    """Hash of the rounded, deduplicated point set; (hash, number of distinct points)."""
+    q = np.unique(np.rint(np.asarray(points) / grid).astype(np.int64), axis=0)
+    return hashlib.blake2b(q.tobytes(), digest_size=8).hexdigest(), len(q)
+
+def canonical_geometry(svg_paths):
+    """Geometry hash over every SVG a run produced; status "bad-svg" if one will not parse."""
+    pts = []
+    for path in sorted(svg_paths):
+        try:
+            pts.append(svg_points(ET.parse(path).getroot()))
+        except ET.ParseError:
+            return "bad-svg", None, 0
+    if not pts:
+        return "no-svg", None, 0
+    digest, n = geometry_hash(np.concatenate(pts))
+    return "ok", digest, n
+
+# =========================
+# Harness
+# =========================
+def snapshot_key(path):
+    """Sort/grouping key: (timestamp, family). Current scripts sort after all snapshots."""
+    name = os.path.basename(path)
+    m = re.match(r"(.+)_(\d{14})\.py$", name)
+    if m:
+        return m.group(2), m.group(1)
+    return "99999999999999", name[:-3]
+
+def find_snapshots(only=None, include_current=True):
+    paths = glob.glob(os.path.join(HISTORY_DIR, "*.py"))
+    if include_current:
+        paths += [os.path.join(HERE, name) for name in CURRENT_SCRIPTS]
+    paths = [p for p in paths if os.path.exists(p) and (only is None or only in os.path.basename(p))]
+    return sorted(paths, key=snapshot_key)
+
+def _run_child(script, case, work):
+    """Runs CHILD once in work; returns (run dict, wall seconds)."""
+    t0 = time.perf_counter()
+    try:
+        subprocess.run([sys.executable, "-c", CHILD, child_args(script, case)],
+                       cwd=work, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, timeout=TIMEOUT_S)
+    except subprocess.TimeoutExpired:
+        wall_s = time.perf_counter() - t0
+        return {"status": "timeout", "exec_s": wall_s, "prompts": 0, "unanswered": []}, wall_s
+    wall_s = time.perf_counter() - t0
+    try:
+        with open(os.path.join(work, RESULT_FILE), encoding="utf-8") as f:
+            return json.load(f), wall_s
+    except (OSError, ValueError):
+        return {"status": "crashed", "exec_s": wall_s, "prompts": 0, "unanswered": []}, wall_s
+
+def run_job(job):
+    """
+    One (snapshot, case) in a fresh temp dir, run repeat times; times are
+    the best of the repeats, geometry is from the last one. Returns a result dict.
+    """
+    script, case_name, case, repeat = job
+    with tempfile.TemporaryDirectory(prefix="history_regress_") as work:
+        exec_s = wall_s = float("inf")
+        for _ in range(max(1, repeat)):
+            run, wall = _run_child(script, case, work)
+            exec_s = min(exec_s, run["exec_s"])
+            wall_s = min(wall_s, wall)
+            if run["status"] == "timeout":
+                break
+        run["exec_s"] = exec_s
+        svgs = glob.glob(os.path.join(work, "*.svg"))
+        geometry, digest, n_points = canonical_geometry(svgs)
+
+    timestamp, family = snapshot_key(script)
+    return {
+        "snapshot": os.path.relpath(script, HERE),
+        "family": family,
+        "timestamp": timestamp,
+        "case": case_name,
+        "status": run["status"],
+        "geometry": geometry,
+        "hash": digest,
+        "points": n_points,
+        "svg_files": sorted(os.path.basename(p) for p in svgs),
+        "exec_s": run["exec_s"],
+        "wall_s": wall_s,
+        "prompts": run["prompts"],
+        "unanswered": run["unanswered"],
+    }
+
+def run_all(scripts, cases, processes=None, repeat=1):
+    """
+    Every script against every case, each run repeat times (best time kept).
+    processes=None uses os.cpu_count(); processes=1 runs one at a time in
+    this process. Returns (results in script, case order, wall-clock seconds).
+    """
+    jobs = [(script, name, case, repeat) for script in scripts for name, case in cases.items()]
+    t_start = time.perf_counter()
+    if processes == 1 or len(jobs) <= 1:
+        results = [run_job(job) for job in jobs]
+    else:
+        # Each job mostly waits on its child process, so more workers than cores is fine
+        n_proc = processes or os.cpu_count() or 1
+        with Pool(processes=n_proc) as pool:
+            results = pool.map(run_job, jobs, chunksize=1)
+    return results, time.perf_counter() - t_start
+
+def regression_matrix(results, cases):
+    """
+    Rows {snapshot, family, cells: {case: result}} in time order, with
+    result["changed"] set when the hash differs from the family's previous
+    snapshot that produced geometry, and result["slowdown"] when exec time jumped.
+    """
+    rows = {}
+    for r in results:
+        rows.setdefault(r["snapshot"], {"snapshot": r["snapshot"], "family": r["family"], "cells": {}})
+        rows[r["snapshot"]]["cells"][r["case"]] = r
+    rows = list(rows.values())
+
+    last = {}
+    for row in rows:
+        for name in cases:
+            r = row["cells"][name]
+            prev = last.get((row["family"], name))
+            r["changed"] = r["hash"] is not None and prev is not None and prev["hash"] != r["hash"]
+            r["slowdown"] = (prev is not None and r["status"] == "ok" and prev["exec_s"] > 0
+                             and r["exec_s"] > SLOWDOWN_FACTOR * prev["exec_s"]
+                             and (r["exec_s"] - prev["exec_s"]) * 1000 > SLOWDOWN_MIN_MS)
+            if r["hash"] is not None:
+                last[(row["family"], name)] = r
+    return rows
+
+def _cell(r):
+    if r["hash"] is None:
+        return r["geometry"] if r["status"] == "ok" else r["status"]
+    return r["hash"][:10] + ("*" if r["changed"] else "")
+
+def print_matrix(rows, cases, wall_s):
+    width = max(len(row["snapshot"]) for row in rows)
+    print("=" * 60)
+    print("GEOMETRY REGRESSION MATRIX (* = geometry changed since the previous snapshot):")
+    print("=" * 60)
+    print(f"  {'snapshot':<{width}}  " + "  ".join(f"{name:<11} {'ms':>7}" for name in cases))
+    for row in rows:
+        cells = "  ".join(f"{_cell(row['cells'][n]):<11} {row['cells'][n]['exec_s'] * 1000:7.1f}" for n in cases)
+        print(f"  {row['snapshot']:<{width}}  {cells}")
+
+    print("-" * 60)
+    print("Geometry changes:")
+    for name in cases:
+        changes = [row["snapshot"] for row in rows if row["cells"][name]["changed"]]
+        print(f"  {name}: {len(changes)}" + (f" ({', '.join(changes)})" if changes else ""))
+    slow = [(row["snapshot"], n, row["cells"][n]["exec_s"]) for row in rows for n in cases
+            if row["cells"][n]["slowdown"]]
+    if slow:
+        print(f"Slowdowns (> x{SLOWDOWN_FACTOR:g} against the previous snapshot):")
+        for snapshot, name, exec_s in slow:
+            print(f"  {snapshot} [{name}] {exec_s * 1000:.1f} ms")
+
+    counts = {}
+    for row in rows:
+        for n in cases:
+            r = row["cells"][n]
+            key = r["geometry"] if r["status"] == "ok" else r["status"]
+            counts[key] = counts.get(key, 0) + 1
+    print("-" * 60)
+    print(f"  Runs:      {sum(counts.values())} ({', '.join(f'{k} {v}' for k, v in sorted(counts.items()))})")
+    print(f"  Wall time: {wall_s:.2f} s")
+    print("=" * 60)
+
+def write_matrix_csv(rows, cases, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        header = ["snapshot", "family"]
+        for name in cases:
+            header += [f"{name}_status", f"{name}_hash", f"{name}_points", f"{name}_changed", f"{name}_exec_ms"]
+        writer.writerow(header)
+        for row in rows:
+            line = [row["snapshot"], row["family"]]
+            for name in cases:
+                r = row["cells"][name]
+                line += [r["status"] if r["status"] != "ok" else r["geometry"], r["hash"] or "", r["points"],
+                         int(r["changed"]), f"{r['exec_s'] * 1000:.3f}"]
+            writer.writerow(line)
+
+def parse_case(text):
+    """'name=length,width,height' -> (name, (length, width, height))"""
+    name, sep, dims = text.partition("=")
+    values = dims.split(",")
+    if not sep or not name or len(values) != 3:
+        raise argparse.ArgumentTypeError(f"expected name=length,width,height, got {text!r}")
+    try:
+        return name, tuple(float(v) for v in values)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected numbers in {text!r}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run every .history snapshot headlessly and compare geometry.")
+    parser.add_argument("--case", type=parse_case, action="append",
+                        help="input case name=length,width,height (repeatable; default: box and cube)")
+    parser.add_argument("--only", default=None, help="only snapshots whose file name contains this")
+    parser.add_argument("--no-current", action="store_true", help="leave out the current scripts")
+    parser.add_argument("--processes", type=int, default=None, help="parallel runs (default: all cores)")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="runs per snapshot and case; the best time is reported (use 3+ when hunting slowdowns)")
+    parser.add_argument("--csv", default=None, help="write the matrix here")
+    parser.add_argument("--report", default=None, help="write every run as JSON here")
+    args = parser.parse_args(argv)
+
+    cases = dict(args.case) if args.case else dict(DEFAULT_CASES)
+    scripts = find_snapshots(args.only, include_current=not args.no_current)
+    if not scripts:
+        print("No snapshots found.")
+        return 1
+
+    results, wall_s = run_all(scripts, cases, processes=args.processes, repeat=args.repeat)
+    rows = regression_matrix(results, cases)
+    print_matrix(rows, cases, wall_s)
+
+    if args.csv:
+        write_matrix_csv(rows, cases, args.csv)
+        print(f"Matrix written to {args.csv}")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({"cases": cases, "wall_s": wall_s, "runs": results}, f, indent=2)
+        print(f"Report written to {args.report}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,42 +5,27 @@
 #
 # Generates 6 panels with finger joints that properly align and snap together
 # Writes SVG using ONLY file.write().
+#
+# Run directly for the interactive prompts. The helpers below can also be
+# imported (see box_batch.py) to generate boxes without typing anything.
+# "python project.py box.json --prompt" asks the same questions and keeps
+# the answers in a project file for quick edits.
 
 import base64
+import hashlib
+import itertools
+import mmap
 import os
+import urllib.request
+from functools import lru_cache
+from types import SimpleNamespace
 
-# =========================
-# Gather Input
-# =========================
-try:
-    x = float(input("Type x coordinate to start: "))
-    y = float(input("Type y coordinate to start: "))
-    z = float(input("Type z coordinate to start: "))
-    length = float(input("Type length (mm): "))   # depth of box
-    width  = float(input("Type width  (mm): "))   # width of box
-    height = float(input("Type height (mm): "))   # height of box
-    stroke_width = 0.25
-except ValueError:
-    print("Invalid input. All values must be numbers.")
-    exit()
-
-if width < 100 or height < 100 or length < 100:
-    print("Invalid input. Length, width, and height must be at least 100 mm.")
-    exit()
-if stroke_width <= 0:
-    print("Invalid input. Stroke width must be greater than 0.")
-    exit()
-
-# =========================
-# Layout sizing
-# =========================
-w = width
-h = height
-d = length  # depth (using length input)
-gap = 100
+import numpy as np
 
-svg_width  = 3 * w + 2 * gap
-svg_height = 2 * h + gap
+import cut_order
+import polygon_check
+import profiling
+import stroke_font
 
 # =========================
 # Material/tab parameters
@@ -55,26 +40,133 @@ tw = tab_width
 cl = corner_left
 cr = corner_right
 
+# =========================
+# Layout parameters
+# =========================
+gap = 100
+stroke_width = 0.25
+
+# mm margin inside the panel for the image bounding box
+art_margin = 10.0
+
+PANEL_NAMES = ("FRONT", "BACK", "LEFT", "RIGHT", "TOP", "BOTTOM")
+
+# Decimals kept by the compact <path> output; 0.001 mm is far below the beam width
+path_precision = 3
+# More than 1 nm of resolution is meaningless, and 10**precision must stay in int64
+MAX_PATH_PRECISION = 6
+
 # =========================
 # Helpers
 # =========================
+@profiling.timed("points_to_polyline", size=len)
 def points_to_polyline(points):
     return " ".join(f"{px},{py}" for px, py in points)
 
-def _segments_count(edge_len):
+@lru_cache(maxsize=4096)
+def _fixed(units, precision):
+    """A count of 10^-precision mm as the shortest decimal: 9000 -> "9", -2500 -> "-2.5"."""
+    if precision == 0:
+        return str(units)
+    whole, frac = divmod(abs(units), 10 ** precision)
+    frac = f"{frac:0{precision}d}".rstrip("0")
+    sign = "-" if units < 0 else ""
+    return f"{sign}{whole}.{frac}" if frac else f"{sign}{whole}"
+
+@profiling.timed("points_to_path_d", size=len)
+def points_to_path_d(points, precision=path_precision, offset=(0.0, 0.0)):
+    """
+    Compact path data for a closed outline: an absolute M to the first point
+    (plus offset), then relative h / v moves (l for anything diagonal) and z.
+    Coordinates are rounded to precision decimals before the differences are
+    taken, so the relative moves add up exactly and the outline cannot drift.
+    Vertices in the middle of a straight run (the corner clearance followed
+    by a flat segment) are dropped. Finger joints repeat the same few step
+    lengths, so the number strings come from a cache.
+    """
+    if isinstance(points, np.ndarray):
+        pts = points.astype(float).reshape(-1, 2)
+    else:
+        # fromiter is ~3x faster than asarray on a list of tuples
+        pts = np.fromiter(itertools.chain.from_iterable(points), dtype=float, count=2 * len(points)).reshape(-1, 2)
+    pts = pts + np.asarray(offset, dtype=float)
+    q = np.round(pts * 10 ** precision).astype(np.int64)
+    moved = np.ones(len(q), dtype=bool)
+    moved[1:] = (q[1:] != q[:-1]).any(axis=1)
+    q = q[moved]
+    if len(q) > 1 and (q[-1] == q[0]).all():
+        q = q[:-1]  # generate_panel repeats the first point; z closes instead
+    if len(q) > 2:
+        # Exact in integer units: same direction in and out = no corner
+        step_in = q - np.roll(q, 1, axis=0)
+        step_out = np.roll(q, -1, axis=0) - q
+        cross = step_in[:, 0] * step_out[:, 1] - step_in[:, 1] * step_out[:, 0]
+        dot = (step_in * step_out).sum(axis=1)
+        corner = (cross != 0) | (dot <= 0)
+        corner[0] = True  # keep the start point the cut order chose
+        q = q[corner]
+
+    x0, y0 = q[0].tolist()
+    parts = [f"M{_fixed(x0, precision)},{_fixed(y0, precision)}"]
+    fixed = _fixed
+    parts.extend(
+        "h" + fixed(dx, precision) if dy == 0 else
+        "v" + fixed(dy, precision) if dx == 0 else
+        f"l{fixed(dx, precision)},{fixed(dy, precision)}"
+        for dx, dy in np.diff(q, axis=0).tolist()
+    )
+    parts.append("z")
+    return "".join(parts)
+
+def outline_symbols(outlines):
+    """
+    Groups identical outlines for <symbol>/<use> output.
+    outlines: list of point lists / arrays. Returns (ids, symbols): ids[i]
+    is the symbol id of outlines[i], symbols maps each id to the first
+    outline with that geometry. The id is a hash of the float64 coordinates;
+    outlines that hash alike are compared point by point before sharing.
+    """
+    ids = []
+    symbols = {}
+    for pts in outlines:
+        arr = np.ascontiguousarray(pts, dtype=float)
+        sid = "outline_" + hashlib.blake2b(arr.tobytes(), digest_size=6).hexdigest()
+        while sid in symbols and not np.array_equal(symbols[sid], arr):
+            sid += "_"
+        symbols.setdefault(sid, arr)
+        ids.append(sid)
+    return ids, symbols
+
+def write_symbol(file, symbol_id, points, outline_format="polygon", precision=path_precision, indent="    "):
+    """
+    One outline as a <symbol> whose viewBox is its bounding box grown by a
+    stroke width (so the stroke is not clipped). Returns the (x, y, w, h)
+    a <use> needs to draw it 1:1 around the outline's own origin.
+    """
+    lo = points.min(axis=0) - stroke_width
+    size = points.max(axis=0) + stroke_width - lo
+    box = (float(lo[0]), float(lo[1]), float(size[0]), float(size[1]))
+    file.write(f'{indent}<symbol id="{symbol_id}" viewBox="{box[0]} {box[1]} {box[2]} {box[3]}" overflow="visible">\n')
+    if outline_format == "path":
+        file.write(f'{indent}  <path d="{points_to_path_d(points, precision)}" />\n')
+    else:
+        file.write(f'{indent}  <polygon points="{points_to_polyline(points.tolist())}" />\n')
+    file.write(f'{indent}</symbol>\n')
+    return box
+
+def use_tag(symbol_id, box, transform):
+    """<use> placing a write_symbol outline with the given transform."""
+    x, y, w, h = box
+    return (f'<use href="#{symbol_id}" xlink:href="#{symbol_id}" transform="{transform}" '
+            f'x="{x}" y="{y}" width="{w}" height="{h}" />')
+
+def _segments_count(edge_len, tw=tw, cl=cl, cr=cr):
     tab_section = edge_len - cl - cr
     n = int(round(tab_section / tw))
     if n < 2:
         n = 2
     return n
 
-def read_image_as_base64(path):
-    try:
-        with open(path, "rb") as f:
-            return base64.b64encode(f.read()).decode("ascii")
-    except:
-        return None
-
 def parse_png_size(path):
     """
     Returns (width_px, height_px) from PNG header (IHDR).
@@ -96,164 +188,234 @@ def parse_png_size(path):
     except:
         return None, None
 
+def validate_box_dimensions(length, width, height):
+    """Raise ValueError with the same message the prompts print."""
+    if width < 100 or height < 100 or length < 100:
+        raise ValueError("Invalid input. Length, width, and height must be at least 100 mm.")
+    if stroke_width <= 0:
+        raise ValueError("Invalid input. Stroke width must be greater than 0.")
+
+# ==========================================================
+# Finger-joint edge kernel (NumPy)
+# Every edge is the same step profile in its own (along, across) frame:
+#   along  = cumulative position, start + i * step
+#   across = edge line, pushed out/in by mt on raised segments
+# A raised segment emits 3 points and a flat one emits 1, so each side is
+# laid out as [first point, n x 3 candidate points, end corner] and a keep
+# mask built from the segment parity drops the unused candidates. All four
+# sides are computed together; the profile is rotated onto its side by
+# choosing which of (along, across) becomes x, which keeps every
+# coordinate bit-identical to the old per-segment loops.
+# ==========================================================
+SIDES = ("top", "right", "bottom", "left")
+
+# Per side, walking clockwise on screen from the top-left corner:
+# (outward sign, along-edge step sign, runs along x?)
+_EDGE_FRAMES = {
+    "top":    (+1, +1, True),
+    "right":  (+1, -1, False),
+    "bottom": (-1, -1, True),
+    "left":   (-1, +1, False),
+}
+
+# The same frames as (side, outward, direction, along_x) tuples in SIDES order
+_SIDE_FRAMES = tuple((side,) + _EDGE_FRAMES[side] for side in SIDES)
+
+def _edge_kernel(start, step, base, offset, n, parity, active, horizontal, end):
+    """
+    Per-side inputs are length-4 arrays in SIDES order:
+      start:  along-edge coordinate of the first segment
+      step:   signed along-edge length of one segment (+tw or -tw)
+      base:   across-edge coordinate of the edge line
+      offset: across-edge coordinate of raised segments (base +/- mt)
+      n:      segment count
+      parity: segment parity that is raised (1 for TAB, slot_parity for SLOT)
+      active: False for NONE sides (straight line to the end corner)
+      horizontal: True when the side runs along x
+      end:    (4, 2) corner each side finishes on
+    Returns the (N, 2) outline without the starting top-left corner.
+    """
+    n_max = int(n.max())
+    seg = np.arange(n_max)
+    valid = (seg < n[:, None]) & active[:, None]
+    raised = valid & (seg % 2 == parity[:, None])
+
+    steps = np.empty((4, n_max + 1))
+    steps[:, 0] = start
+    steps[:, 1:] = step[:, None]
+    along = np.cumsum(steps, axis=1)  # sequential sum => same rounding as x += tw
+
+    # Candidate points per side: first, then (a_i, off) (a_i+1, off) (a_i+1, base) per segment, then end
+    width = 3 * n_max + 2
+    cand_along = np.empty((4, width))
+    cand_across = np.empty((4, width))
+    cand_along[:, 0] = start
+    cand_across[:, 0] = base
+    cand_along[:, 1:-1:3] = along[:, :-1]
+    cand_along[:, 2:-1:3] = along[:, 1:]
+    cand_along[:, 3:-1:3] = along[:, 1:]
+    cand_across[:, 1:-1:3] = offset[:, None]
+    cand_across[:, 2:-1:3] = offset[:, None]
+    cand_across[:, 3:-1:3] = base[:, None]
+
+    keep = np.empty((4, width), dtype=bool)
+    keep[:, 0] = active
+    keep[:, 1:-1:3] = raised
+    keep[:, 2:-1:3] = raised
+    keep[:, 3:-1:3] = valid
+    keep[:, -1] = True
+
+    # Rotate onto each side: horizontal sides keep (along, across) as (x, y)
+    xs = np.where(horizontal[:, None], cand_along, cand_across)
+    ys = np.where(horizontal[:, None], cand_across, cand_along)
+    xs[:, -1] = end[:, 0]
+    ys[:, -1] = end[:, 1]
+    return np.stack((xs[keep], ys[keep]), axis=1)
+
 # ==========================================================
 # Panel generator with per-edge TAB/SLOT control
 # slot_parity controls which segments get slots:
 #   slot_parity=0 => slots on even indices (0,2,4,...)
 #   slot_parity=1 => slots on odd  indices (1,3,5,...)
+# or a dict {side: 0 or 1} to pick it per SLOT side (enclosure.py).
+# mt/tw/cl/cr default to the material parameters above; pass them
+# explicitly to generate panels for a different material.
 # ==========================================================
-def generate_panel(face_w, face_h, edge_mode, slot_parity=0):
+# generate_panel_array only: below this many segments (n_w + n_h) the loop
+# plus np.fromiter beats the kernel's fixed NumPy overhead. The list API
+# always uses the loop, since turning the kernel's array back into tuples
+# costs more than the loop saves (see bench_generate_panel.py).
+VECTOR_MIN_SEGMENTS = 80
+
+def _panel_points(face_w, face_h, edge_mode, slot_parity, mt, tw, cl, cr):
     """
-    edge_mode: dict with keys {"top","right","bottom","left"} each in {"TAB","SLOT","NONE"}
-      TAB  => protrude outward on odd segments
-      SLOT => indent inward on slot_parity segments
-      NONE => straight edge (no tabs/slots)
+    The outline as a list of (x, y) tuples, one segment at a time. Walks the
+    same per-side frames as the kernel, with along += step in the same
+    order, so both give bit-identical coordinates.
     """
     half_w = face_w / 2.0
     half_h = face_h / 2.0
 
-    n_w = _segments_count(face_w)
-    n_h = _segments_count(face_h)
-
-    pts = []
+    n_w = _segments_count(face_w, tw, cl, cr)
+    n_h = _segments_count(face_h, tw, cl, cr)
 
-    # ---------- TOP edge ----------
-    x0, y0 = -half_w,  half_h
-    pts.append((x0, y0))
-    
-    if edge_mode["top"] == "NONE":
-        pts.append((half_w, y0))
-    else:
-        x = x0 + cl
-        y = y0
-        pts.append((x, y))
-
-        for i in range(n_w):
-            if edge_mode["top"] == "TAB":
-                if i % 2 == 1:
-                    pts.append((x, y + mt))
-                    x += tw
-                    pts.append((x, y + mt))
-                    pts.append((x, y))
-                else:
-                    x += tw
-                    pts.append((x, y))
-            else:  # SLOT
-                if i % 2 == slot_parity:
-                    pts.append((x, y - mt))
-                    x += tw
-                    pts.append((x, y - mt))
-                    pts.append((x, y))
-                else:
-                    x += tw
-                    pts.append((x, y))
-
-        x = half_w
-        pts.append((x, y))
-
-    # ---------- RIGHT edge ----------
-    x = half_w
-    
-    if edge_mode["right"] == "NONE":
-        pts.append((x, -half_h))
-    else:
-        y = half_h - cl
-        pts.append((x, y))
-
-        for i in range(n_h):
-            if edge_mode["right"] == "TAB":
-                if i % 2 == 1:
-                    pts.append((x + mt, y))
-                    y -= tw
-                    pts.append((x + mt, y))
-                    pts.append((x, y))
-                else:
-                    y -= tw
-                    pts.append((x, y))
-            else:  # SLOT
-                if i % 2 == slot_parity:
-                    pts.append((x - mt, y))
-                    y -= tw
-                    pts.append((x - mt, y))
-                    pts.append((x, y))
-                else:
-                    y -= tw
-                    pts.append((x, y))
-
-        y = -half_h
-        pts.append((x, y))
-
-    # ---------- BOTTOM edge ----------
-    y = -half_h
-    
-    if edge_mode["bottom"] == "NONE":
-        pts.append((-half_w, y))
-    else:
-        x = half_w - cl
-        pts.append((x, y))
-
-        for i in range(n_w):
-            if edge_mode["bottom"] == "TAB":
-                if i % 2 == 1:
-                    pts.append((x, y - mt))
-                    x -= tw
-                    pts.append((x, y - mt))
-                    pts.append((x, y))
+    # Per side in SIDES order: along-edge start, base line, segment count, end corner
+    layout = (
+        (-half_w + cl, half_h,  n_w, (half_w, half_h)),
+        (half_h - cl,  half_w,  n_h, (half_w, -half_h)),
+        (half_w - cl,  -half_h, n_w, (-half_w, -half_h)),
+        (-half_h + cl, -half_w, n_h, (-half_w, half_h)),
+    )
+    per_side = isinstance(slot_parity, dict)
+
+    pts = [(-half_w, half_h)]
+    append = pts.append
+    for (side, outward, direction, along_x), (a, b, n_seg, corner) in zip(_SIDE_FRAMES, layout):
+        mode = edge_mode[side]
+        if mode == "NONE":
+            append(corner)
+            continue
+        if mode == "TAB":
+            off = b + mt if outward > 0 else b - mt
+            raised = 1
+        else:  # SLOT
+            off = b - mt if outward > 0 else b + mt
+            raised = slot_parity[side] if per_side else slot_parity
+        step = tw if direction > 0 else -tw
+
+        if along_x:
+            append((a, b))
+            for i in range(n_seg):
+                if i % 2 == raised:
+                    append((a, off))
+                    a += step
+                    append((a, off))
+                    append((a, b))
                 else:
-                    x -= tw
-                    pts.append((x, y))
-            else:  # SLOT
-                if i % 2 == slot_parity:
-                    pts.append((x, y + mt))
-                    x -= tw
-                    pts.append((x, y + mt))
-                    pts.append((x, y))
+                    a += step
+                    append((a, b))
+        else:
+            append((b, a))
+            for i in range(n_seg):
+                if i % 2 == raised:
+                    append((off, a))
+                    a += step
+                    append((off, a))
+                    append((b, a))
                 else:
-                    x -= tw
-                    pts.append((x, y))
+                    a += step
+                    append((b, a))
+        append(corner)
+    return pts
 
-        x = -half_w
-        pts.append((x, y))
+@profiling.timed("generate_panel")
+def generate_panel_array(face_w, face_h, edge_mode, slot_parity=0, mt=mt, tw=tw, cl=cl, cr=cr):
+    """Same outline as generate_panel, as an (N, 2) float array."""
+    if _segments_count(face_w, tw, cl, cr) + _segments_count(face_h, tw, cl, cr) < VECTOR_MIN_SEGMENTS:
+        pts = _panel_points(face_w, face_h, edge_mode, slot_parity, mt, tw, cl, cr)
+        return np.fromiter(itertools.chain.from_iterable(pts), dtype=float, count=2 * len(pts)).reshape(-1, 2)
+    return _kernel_points(face_w, face_h, edge_mode, slot_parity, mt, tw, cl, cr)
 
-    # ---------- LEFT edge ----------
-    x = -half_w
-    
-    if edge_mode["left"] == "NONE":
-        pts.append((x, half_h))
-    else:
-        y = -half_h + cl
-        pts.append((x, y))
-
-        for i in range(n_h):
-            if edge_mode["left"] == "TAB":
-                if i % 2 == 1:
-                    pts.append((x - mt, y))
-                    y += tw
-                    pts.append((x - mt, y))
-                    pts.append((x, y))
-                else:
-                    y += tw
-                    pts.append((x, y))
-            else:  # SLOT
-                if i % 2 == slot_parity:
-                    pts.append((x + mt, y))
-                    y += tw
-                    pts.append((x + mt, y))
-                    pts.append((x, y))
-                else:
-                    y += tw
-                    pts.append((x, y))
+def _kernel_points(face_w, face_h, edge_mode, slot_parity, mt, tw, cl, cr):
+    """The outline through _edge_kernel, all four sides at once."""
+    half_w = face_w / 2.0
+    half_h = face_h / 2.0
 
-        y = half_h
-        pts.append((x, y))
+    n_w = _segments_count(face_w, tw, cl, cr)
+    n_h = _segments_count(face_h, tw, cl, cr)
+
+    # Per side: along-edge start, base line, segment count, corner it ends on
+    layout = {
+        "top":    (-half_w + cl, half_h,  n_w, (half_w, half_h)),
+        "right":  (half_h - cl,  half_w,  n_h, (half_w, -half_h)),
+        "bottom": (half_w - cl,  -half_h, n_w, (-half_w, -half_h)),
+        "left":   (-half_h + cl, -half_w, n_h, (-half_w, half_h)),
+    }
+
+    start, step, base, offset, n, parity, active, horizontal, end = ([] for _ in range(9))
+    for side in SIDES:
+        s0, b, n_seg, corner = layout[side]
+        outward, direction, along_x = _EDGE_FRAMES[side]
+        mode = edge_mode[side]
+        if mode == "TAB":
+            off = b + mt if outward > 0 else b - mt
+        else:  # SLOT (ignored for NONE)
+            off = b - mt if outward > 0 else b + mt
+        start.append(s0)
+        step.append(tw if direction > 0 else -tw)
+        base.append(b)
+        offset.append(off)
+        n.append(n_seg)
+        side_parity = slot_parity[side] if isinstance(slot_parity, dict) else slot_parity
+        parity.append(1 if mode == "TAB" else side_parity)
+        active.append(mode != "NONE")
+        horizontal.append(along_x)
+        end.append(corner)
+
+    outline = _edge_kernel(
+        np.array(start, dtype=float), np.array(step, dtype=float),
+        np.array(base, dtype=float), np.array(offset, dtype=float),
+        np.array(n), np.array(parity), np.array(active), np.array(horizontal),
+        np.array(end, dtype=float),
+    )
+    return np.concatenate((np.array([[-half_w, half_h]]), outline))
 
-    return pts
+@profiling.timed("generate_panel")
+def generate_panel(face_w, face_h, edge_mode, slot_parity=0, mt=mt, tw=tw, cl=cl, cr=cr):
+    """
+    edge_mode: dict with keys {"top","right","bottom","left"} each in {"TAB","SLOT","NONE"}
+      TAB  => protrude outward on odd segments
+      SLOT => indent inward on slot_parity segments
+      NONE => straight edge (no tabs/slots)
+    Returns the outline as a list of (x, y) tuples.
+    """
+    return _panel_points(face_w, face_h, edge_mode, slot_parity, mt, tw, cl, cr)
 
 # =========================
 # EDGE MAPS FOR BOX ASSEMBLY
 # Box structure:
 # - Front/Back panels (w x h): tabs on left/right, slots on top/bottom
-# - Left/Right side panels (d x h): tabs on top/bottom, slots on left/right  
+# - Left/Right side panels (d x h): tabs on top/bottom, slots on left/right
 # - Top/Bottom panels (w x d): all tabs
 # =========================
 
@@ -282,233 +444,131 @@ EDGE_MAP_TOP_BOTTOM = {
 }
 
 # =========================
-# Generate panels
-# =========================
-# Panels for a box: Front, Back, Left, Right, Top, Bottom
-# Layout: Front, Back in first row; Left, Right in second row; Top, Bottom in third position
-
-front_pts = generate_panel(w, h, EDGE_MAP_FRONT_BACK, slot_parity=1)
-back_pts = generate_panel(w, h, EDGE_MAP_FRONT_BACK, slot_parity=1)
-
-left_pts = generate_panel(d, h, EDGE_MAP_SIDES, slot_parity=1)
-right_pts = generate_panel(d, h, EDGE_MAP_SIDES, slot_parity=1)
-
-top_pts = generate_panel(w, d, EDGE_MAP_TOP_BOTTOM, slot_parity=0)
-bottom_pts = generate_panel(w, d, EDGE_MAP_TOP_BOTTOM, slot_parity=0)
-
-front_str = points_to_polyline(front_pts)
-back_str = points_to_polyline(back_pts)
-left_str = points_to_polyline(left_pts)
-right_str = points_to_polyline(right_pts)
-top_str = points_to_polyline(top_pts)
-bottom_str = points_to_polyline(bottom_pts)
-
-# =========================
-# Ask for optional PNG artwork
+# Box panels and layout
 # =========================
-add_art = input("Add a PNG image onto one face? (y/n): ").strip().lower()
-
-png_data = None
-png_w_px = None
-png_h_px = None
-art_target = None
+# Per panel: (face width, face height, edge map, slot parity), the face
+# sides named by box dimension: w = width, h = height, d = depth
+BOX_PANELS = {
+    "FRONT":  ("w", "h", EDGE_MAP_FRONT_BACK, 1),
+    "BACK":   ("w", "h", EDGE_MAP_FRONT_BACK, 1),
+    "LEFT":   ("d", "h", EDGE_MAP_SIDES, 1),
+    "RIGHT":  ("d", "h", EDGE_MAP_SIDES, 1),
+    "TOP":    ("w", "d", EDGE_MAP_TOP_BOTTOM, 0),
+    "BOTTOM": ("w", "d", EDGE_MAP_TOP_BOTTOM, 0),
+}
 
-# mm margin inside the panel for the image bounding box
-art_margin = 10.0
+def generate_box_panels(w, h, d, mt=mt, tw=tw, cl=cl, cr=cr, cache=None):
+    """
+    Returns {panel name: point list} for the six faces of a w x h x d box.
+    Front/Back are w x h, Left/Right are d x h, Top/Bottom are w x d (BOX_PANELS).
+    cache: a panel_cache.PanelCache to reuse outlines already generated.
+    """
+    panel = cache.panel if cache is not None else generate_panel
+    dims = {"w": w, "h": h, "d": d}
+    return {name: panel(dims[face_w], dims[face_h], edge_map, slot_parity=parity, mt=mt, tw=tw, cl=cl, cr=cr)
+            for name, (face_w, face_h, edge_map, parity) in BOX_PANELS.items()}
 
-if add_art == "y":
-    png_path = input("Enter path to PNG file (e.g. /Users/.../image.png): ").strip()
+def layout_frame(w, h, d, mt=mt, maximum=max):
+    """
+    The pitches and canvas size layout_box places the panels with.
+    maximum=np.maximum evaluates it over arrays of boxes (design_sweep.py).
+    Returns SimpleNamespace(tab_margin, pitch_x, pitch_y, base_x, base_y, top_x, view_w, view_h).
+    """
+    # ---- SVG sizing and margins ----
+    tab_margin = mt + 5
 
-    png_data = read_image_as_base64(png_path)
-    png_w_px, png_h_px = parse_png_size(png_path)
+    # Column/row pitch is w + gap / h + gap, widened when the d-sized panels
+    # (LEFT/RIGHT across, TOP/BOTTOM down) would otherwise overlap
+    pitch_x = maximum(w + gap, d + 2 * tab_margin)
+    pitch_y = maximum(h + gap, d + 2 * tab_margin)
 
-    if png_data is None or png_w_px is None or png_h_px is None:
-        print("Could not read/parse PNG file. Skipping image.")
-        png_data = None
-        png_w_px = None
-        png_h_px = None
-    else:
-        print("Choose which panel to place it on:")
-        print("  FRONT = front panel")
-        print("  BACK = back panel")
-        print("  LEFT = left side panel")
-        print("  RIGHT = right side panel")
-        print("  TOP = top panel")
-        print("  BOTTOM = bottom panel")
-
-        art_target = input("Type one of: FRONT BACK LEFT RIGHT TOP BOTTOM: ").strip().upper()
-        if art_target not in {"FRONT","BACK","LEFT","RIGHT","TOP","BOTTOM"}:
-            print("Invalid panel choice. Skipping image.")
-            png_data = None
-            art_target = None
+    # ---- Panel placement coordinates ----
+    base_x = tab_margin + maximum(w, d) / 2
+    base_y = tab_margin + h / 2
+    top_x = base_x + 2 * pitch_x
 
-# =========================
-# Ask for optional text engraving
-# =========================
-add_text = input("Add engravable text onto one face? (y/n): ").strip().lower()
+    return SimpleNamespace(tab_margin=tab_margin, pitch_x=pitch_x, pitch_y=pitch_y, base_x=base_x, base_y=base_y,
+                           top_x=top_x, view_w=top_x + w / 2 + tab_margin,
+                           view_h=pitch_y + maximum(h, d) + 2 * tab_margin)
 
-text_content = None
-text_target = None
-text_font_size = 12.0
+def layout_box(w, h, d, mt=mt):
+    """
+    Fixed 3-column layout used by the prompts.
+    Layout: Front, Back in first row; Left, Right in second row; Top, Bottom in third position
+    Returns SimpleNamespace(view_w, view_h, centers, sizes).
+    """
+    frame = layout_frame(w, h, d, mt)
+    tab_margin = frame.tab_margin
+    pitch_x = frame.pitch_x
+    pitch_y = frame.pitch_y
+    base_x = frame.base_x
+    base_y = frame.base_y
+    top_x = frame.top_x
+
+    panel_centers = {
+        "FRONT": (base_x, base_y),
+        "BACK": (base_x + pitch_x, base_y),
+        "LEFT": (base_x, base_y + pitch_y),
+        "RIGHT": (base_x + pitch_x, base_y + pitch_y),
+        "TOP": (top_x, tab_margin + d/2),
+        "BOTTOM": (top_x, tab_margin + d/2 + pitch_y),
+    }
+
+    dims = {"w": w, "h": h, "d": d}
+    panel_sizes = {name: (dims[face_w], dims[face_h]) for name, (face_w, face_h, _, _) in BOX_PANELS.items()}
+
+    return SimpleNamespace(view_w=frame.view_w, view_h=frame.view_h, centers=panel_centers, sizes=panel_sizes)
 
 def calculate_auto_font_size(text, panel_width, panel_height):
     """
     Calculate font size to fit text within panel with margin.
-    Assumes average character width is ~0.6 * font_size for sans-serif.
+    Text width is measured exactly with the single-stroke font (stroke_font.py).
     """
     text_margin = 20.0  # mm margin on each side
     usable_width = panel_width - 2 * text_margin
     usable_height = panel_height - 2 * text_margin
-    
-    if len(text) == 0:
+
+    # Width of the text at font size 1; it scales linearly with the size
+    unit_width = stroke_font.text_width(text, 1.0)
+    if unit_width <= 0:
         return 12.0
-    
-    # Estimate: character width ≈ 0.6 * font_size for most sans-serif fonts
-    # Text width ≈ len(text) * 0.6 * font_size
-    # Solve for font_size: font_size = usable_width / (len(text) * 0.6)
-    font_size_by_width = usable_width / (len(text) * 0.6)
-    
+
+    font_size_by_width = usable_width / unit_width
+
     # Limit by height (font height ≈ font_size)
     font_size_by_height = usable_height * 0.5  # Use 50% of height for comfort
-    
+
     # Take the smaller of the two constraints
     auto_size = min(font_size_by_width, font_size_by_height)
-    
+
     # Clamp between reasonable bounds
     auto_size = max(4.0, min(auto_size, 50.0))
-    
-    return auto_size
 
-if add_text == "y":
-    text_content = input("Enter text to engrave: ").strip()
-    
-    if text_content:
-        print("Choose which panel to place text on:")
-        print("  FRONT = front panel")
-        print("  BACK = back panel")
-        print("  LEFT = left side panel")
-        print("  RIGHT = right side panel")
-        print("  TOP = top panel")
-        print("  BOTTOM = bottom panel")
-        
-        text_target = input("Type one of: FRONT BACK LEFT RIGHT TOP BOTTOM: ").strip().upper()
-        if text_target not in {"FRONT","BACK","LEFT","RIGHT","TOP","BOTTOM"}:
-            print("Invalid panel choice. Skipping text.")
-            text_content = None
-            text_target = None
-        else:
-            # Determine panel dimensions for auto-scaling
-            if text_target in {"FRONT", "BACK"}:
-                panel_w_for_text = w
-                panel_h_for_text = h
-            elif text_target in {"LEFT", "RIGHT"}:
-                panel_w_for_text = d
-                panel_h_for_text = h
-            else:  # TOP or BOTTOM
-                panel_w_for_text = w
-                panel_h_for_text = d
-            
-            # Calculate auto font size
-            text_font_size = calculate_auto_font_size(text_content, panel_w_for_text, panel_h_for_text)
-            
-            print(f"Auto-calculated font size: {text_font_size:.1f}mm")
-            override = input("Press Enter to accept, or type a custom size (mm): ").strip()
-            if override:
-                try:
-                    custom_size = float(override)
-                    if custom_size > 0:
-                        text_font_size = custom_size
-                except:
-                    pass  # Keep auto size
-    else:
-        print("No text entered. Skipping text.")
-
-# =========================
-# SVG sizing and margins
-# =========================
-tab_margin = mt + 5
-total_w = svg_width + 2 * tab_margin
-total_h = svg_height + 2 * tab_margin
-view_w = total_w
-view_h = total_h
-
-# =========================
-# Panel placement coordinates
-# =========================
-base_x = tab_margin + w / 2
-base_y = tab_margin + h / 2
-
-panel_centers = {
-    "FRONT": (base_x, base_y),
-    "BACK": (base_x + w + gap, base_y),
-    "LEFT": (base_x, base_y + h + gap),
-    "RIGHT": (base_x + w + gap, base_y + h + gap),
-    "TOP": (tab_margin + w/2 + 2*w + 2*gap, tab_margin + d/2),
-    "BOTTOM": (tab_margin + w/2 + 2*w + 2*gap, tab_margin + d/2 + h + gap),
-}
+    return auto_size
 
-panel_sizes = {
-    "FRONT": (w, h),
-    "BACK": (w, h),
-    "LEFT": (d, h),
-    "RIGHT": (d, h),
-    "TOP": (w, d),
-    "BOTTOM": (w, d),
-}
+def load_art(png_path, target=None):
+    """
+    Returns SimpleNamespace(path, w_px, h_px, target) or None if the PNG
+    cannot be read/parsed. The pixel data is not loaded here; the writer
+    streams it from disk (see write_base64).
+    """
+    png_w_px, png_h_px = parse_png_size(png_path)
+    if png_w_px is None or png_h_px is None:
+        return None
+    return SimpleNamespace(path=png_path, w_px=png_w_px, h_px=png_h_px, target=target)
 
-# =========================
-# Write SVG (ONLY file.write)
-# =========================
-file = open("gcode_file.svg", "w", encoding="utf-8")
-file.write('<?xml version="1.0" encoding="UTF-8" ?>\n')
-file.write('<svg xmlns="http://www.w3.org/2000/svg" version="1.1" ')
-file.write('xmlns:xlink="http://www.w3.org/1999/xlink" ')
-file.write(f'viewBox="0 0 {view_w} {view_h}" width="{view_w}mm" height="{view_h}mm">\n')
-
-# ---- CUT LINES group (red) ----
-file.write(f'  <g stroke="red" stroke-width="{stroke_width}" fill="none">\n')
-
-# FRONT panel
-file.write(f'    <g transform="translate({panel_centers["FRONT"][0]}, {panel_centers["FRONT"][1]})">\n')
-file.write(f'      <polygon points="{front_str}" />\n')
-file.write('    </g>\n')
-
-# BACK panel
-file.write(f'    <g transform="translate({panel_centers["BACK"][0]}, {panel_centers["BACK"][1]})">\n')
-file.write(f'      <polygon points="{back_str}" />\n')
-file.write('    </g>\n')
-
-# LEFT panel
-file.write(f'    <g transform="translate({panel_centers["LEFT"][0]}, {panel_centers["LEFT"][1]})">\n')
-file.write(f'      <polygon points="{left_str}" />\n')
-file.write('    </g>\n')
-
-# RIGHT panel
-file.write(f'    <g transform="translate({panel_centers["RIGHT"][0]}, {panel_centers["RIGHT"][1]})">\n')
-file.write(f'      <polygon points="{right_str}" />\n')
-file.write('    </g>\n')
-
-# TOP panel
-file.write(f'    <g transform="translate({panel_centers["TOP"][0]}, {panel_centers["TOP"][1]})">\n')
-file.write(f'      <polygon points="{top_str}" />\n')
-file.write('    </g>\n')
-
-# BOTTOM panel
-file.write(f'    <g transform="translate({panel_centers["BOTTOM"][0]}, {panel_centers["BOTTOM"][1]})">\n')
-file.write(f'      <polygon points="{bottom_str}" />\n')
-file.write('    </g>\n')
-
-file.write('  </g>\n')  # end cut group
-
-# ---- PNG artwork (centered, scaled, clipped) ----
-if png_data is not None and art_target is not None:
-    cx, cy = panel_centers[art_target]
-    pw, ph = panel_sizes[art_target]
+def fit_art(art, center, size):
+    """
+    Centres and scales the image inside the panel minus art_margin.
+    Returns SimpleNamespace(x, y, w, h, usable_w, usable_h) in mm.
+    """
+    cx, cy = center
+    pw, ph = size
 
     usable_w = max(1.0, pw - 2 * art_margin)
     usable_h = max(1.0, ph - 2 * art_margin)
 
-    img_aspect = png_w_px / png_h_px
+    img_aspect = art.w_px / art.h_px
     box_aspect = usable_w / usable_h
 
     if img_aspect >= box_aspect:
@@ -518,72 +578,352 @@ if png_data is not None and art_target is not None:
         img_h = usable_h
         img_w = usable_h * img_aspect
 
-    x_img = cx - img_w / 2.0
-    y_img = cy - img_h / 2.0
+    return SimpleNamespace(x=cx - img_w / 2.0, y=cy - img_h / 2.0, w=img_w, h=img_h,
+                           usable_w=usable_w, usable_h=usable_h)
 
-    clip_id = f"clip_{art_target}"
+# Multiple of 3 so chunk encodings join into one valid base64 string
+BASE64_CHUNK = 3 * 64 * 1024
+
+def write_base64(file, path, chunk_size=BASE64_CHUNK):
+    """
+    Streams the base64 encoding of a file into an open text file.
+    The source is memory-mapped and encoded chunk by chunk, so neither the
+    raw bytes nor the full base64 string is ever held in memory.
+    """
+    if chunk_size % 3:
+        raise ValueError("chunk_size must be a multiple of 3")
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for offset in range(0, size, chunk_size):
+                with profiling.stage("base64") as st:
+                    encoded = base64.b64encode(mm[offset:offset + chunk_size]).decode("ascii")
+                    st.add_bytes(len(encoded))
+                file.write(encoded)
+
+# =========================
+# Write SVG (ONLY file.write)
+# =========================
+def optimised_panel_order(panels, centers):
+    """
+    [(panel name, point list)] in the cut order chosen by cut_order.py,
+    each outline rotated to start at its chosen vertex.
+    """
+    names = list(PANEL_NAMES)
+    contours = [cut_order.make_contour(name, np.asarray(panels[name]) + np.asarray(centers[name]))
+                for name in names]
+    result = cut_order.optimise_cut_order(contours)
+    order = []
+    for item in result.order:
+        pts = panels[item.id]
+        order.append((item.id, pts[item.start:] + pts[:item.start]))
+    return order
+
+# =========================
+# SVG blocks
+# write_box_svg writes these in order; project.py reuses unchanged blocks
+# from the previous file, so each one only depends on its own arguments.
+# =========================
+SVG_FOOTER = '</svg>\n'
+
+def write_svg_header(file, layout):
+    view_w = layout.view_w
+    view_h = layout.view_h
+    file.write('<?xml version="1.0" encoding="UTF-8" ?>\n')
+    file.write('<svg xmlns="http://www.w3.org/2000/svg" version="1.1" ')
+    file.write('xmlns:xlink="http://www.w3.org/1999/xlink" ')
+    file.write(f'viewBox="0 0 {view_w} {view_h}" width="{view_w}mm" height="{view_h}mm">\n')
+
+def write_cut_block(file, panels, layout, optimise_order=False, outline_format="polygon", precision=path_precision,
+                    expand_instances=False):
+    """Panel outlines: the <symbol> defs (unless expanded) and the red cut group."""
+    panel_centers = layout.centers
+    if optimise_order:
+        panel_order = optimised_panel_order(panels, panel_centers)
+    else:
+        panel_order = [(name, panels[name]) for name in PANEL_NAMES]
+
+    # ---- Unique outlines, once each ----
+    if not expand_instances:
+        symbol_ids, symbols = outline_symbols([pts for _name, pts in panel_order])
+        file.write('  <defs>\n')
+        boxes = {sid: write_symbol(file, sid, pts, outline_format, int(precision))
+                 for sid, pts in symbols.items()}
+        file.write('  </defs>\n')
+
+    # ---- CUT LINES group (red) ----
+    file.write(f'  <g stroke="red" stroke-width="{stroke_width}" fill="none">\n')
+
+    for i, (name, pts) in enumerate(panel_order):
+        cx, cy = panel_centers[name]
+        if not expand_instances:
+            sid = symbol_ids[i]
+            file.write(f'    {use_tag(sid, boxes[sid], f"translate({cx}, {cy})")}\n')
+            continue
+        if outline_format == "path":
+            file.write(f'    <path d="{points_to_path_d(pts, int(precision), (cx, cy))}" />\n')
+            continue
+        file.write(f'    <g transform="translate({cx}, {cy})">\n')
+        file.write(f'      <polygon points="{points_to_polyline(pts)}" />\n')
+        file.write('    </g>\n')
+
+    file.write('  </g>\n')  # end cut group
+
+def write_art_block(file, art, layout, svg_path, image_mode="embed"):
+    """
+    PNG artwork (centered, scaled, clipped). The image is written once inside
+    <defs> and placed with <use>. image_mode="embed" streams it in as base64,
+    "link" points at the PNG file relative to svg_path.
+    """
+    fit = fit_art(art, layout.centers[art.target], layout.sizes[art.target])
+    cx, cy = layout.centers[art.target]
+
+    clip_id = f"clip_{art.target}"
+    image_id = f"art_{art.target}"
 
     file.write('  <defs>\n')
     file.write(f'    <clipPath id="{clip_id}">\n')
     file.write(
-        f'      <rect x="{(cx-usable_w/2):.3f}" y="{(cy-usable_h/2):.3f}" '
-        f'width="{usable_w:.3f}" height="{usable_h:.3f}" />\n'
+        f'      <rect x="{(cx-fit.usable_w/2):.3f}" y="{(cy-fit.usable_h/2):.3f}" '
+        f'width="{fit.usable_w:.3f}" height="{fit.usable_h:.3f}" />\n'
     )
     file.write('    </clipPath>\n')
-    file.write('  </defs>\n')
-
-    data_uri = f"data:image/png;base64,{png_data}"
-
-    file.write(f'  <g clip-path="url(#{clip_id})">\n')
     file.write(
-        f'    <image x="{x_img:.3f}" y="{y_img:.3f}" '
-        f'width="{img_w:.3f}" height="{img_h:.3f}" '
+        f'    <image id="{image_id}" x="{fit.x:.3f}" y="{fit.y:.3f}" '
+        f'width="{fit.w:.3f}" height="{fit.h:.3f}" '
         f'preserveAspectRatio="xMidYMid meet" '
-        f'href="{data_uri}" '
-        f'xlink:href="{data_uri}" />\n'
     )
+    if image_mode == "link":
+        href = os.path.relpath(os.path.abspath(art.path), os.path.dirname(os.path.abspath(svg_path)))
+        file.write(f'xlink:href="{urllib.request.pathname2url(href)}" />\n')
+    else:
+        file.write('xlink:href="data:image/png;base64,')
+        write_base64(file, art.path)
+        file.write('" />\n')
+    file.write('  </defs>\n')
+
+    file.write(f'  <g clip-path="url(#{clip_id})">\n')
+    file.write(f'    <use href="#{image_id}" xlink:href="#{image_id}" />\n')
     file.write('  </g>\n')
 
-# ---- Text engraving (centered on panel) ----
-if text_content is not None and text_target is not None:
-    tx, ty = panel_centers[text_target]
-    
-    # SVG text is positioned at baseline, so we center it at panel center
-    # Use text-anchor="middle" and dominant-baseline="middle" for centering
-    file.write(f'  <g stroke="blue" stroke-width="0.1" fill="blue">\n')
-    file.write(
-        f'    <text x="{tx:.3f}" y="{ty:.3f}" '
-        f'font-family="Arial, sans-serif" '
-        f'font-size="{text_font_size:.1f}" '
-        f'text-anchor="middle" '
-        f'dominant-baseline="middle">'
-    )
-    # Escape special XML characters
-    escaped_text = text_content.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-    file.write(escaped_text)
-    file.write('</text>\n')
+def write_text_block(file, text, layout):
+    """
+    Text engraving centred on its panel, as single-stroke polylines
+    (stroke_font.py), so no font is needed on the laser PC.
+    """
+    tx, ty = layout.centers[text.target]
+    rendered = stroke_font.render_text(text.content, text.font_size, tx, ty)
+
+    file.write(f'  <g stroke="blue" stroke-width="0.1" fill="none">\n')
+    for stroke in rendered.paths:
+        points = " ".join(f"{px:.3f},{py:.3f}" for px, py in stroke)
+        file.write(f'    <polyline points="{points}" />\n')
     file.write('  </g>\n')
 
-file.write('</svg>\n')
-file.close()
-
-print("\n" + "="*60)
-print("BOX ASSEMBLY GUIDE:")
-print("="*60)
-print("Panel Layout:")
-print("  Row 1: FRONT (left), BACK (middle)")
-print("  Row 2: LEFT (left), RIGHT (middle)")  
-print("  Row 3: TOP (right-top), BOTTOM (right-bottom)")
-print("\nAssembly:")
-print("1. FRONT/BACK panels have tabs on left/right edges")
-print("2. LEFT/RIGHT side panels have slots on all edges")
-print("3. TOP/BOTTOM panels have tabs on all edges")
-print("4. Tabs insert into matching slots to form a box")
-print("\nEngraving:")
-print("  Red lines = cut paths (panels)")
-if png_data is not None:
-    print(f"  Embedded image = raster engrave on {art_target} panel")
-if text_content is not None:
-    print(f"  Blue text = vector engrave on {text_target} panel")
-print("="*60)
-print(f"\nWrote gcode_file.svg")
+def check_svg_options(image_mode="embed", outline_format="polygon", precision=path_precision):
+    """Raises ValueError for option values the block writers do not know."""
+    if image_mode not in ("embed", "link"):
+        raise ValueError(f"unknown image_mode {image_mode!r}")
+    if outline_format not in ("polygon", "path"):
+        raise ValueError(f"unknown outline_format {outline_format!r}")
+    whole = isinstance(precision, (int, np.integer)) and not isinstance(precision, bool)
+    if not whole or not 0 <= precision <= MAX_PATH_PRECISION:
+        raise ValueError(f"precision must be a whole number of decimals from 0 to {MAX_PATH_PRECISION}")
+
+def write_box_svg(path, panels, layout, art=None, text=None, optimise_order=False, image_mode="embed", validate=True,
+                  outline_format="polygon", precision=path_precision, expand_instances=False):
+    """
+    panels: {panel name: point list} from generate_box_panels
+    layout: SimpleNamespace from layout_box
+    art:    SimpleNamespace from load_art, or None
+    text:   SimpleNamespace(content, target, font_size), or None
+    optimise_order: write panels in the cut order that minimises rapid
+                    travel (cut_order.py) instead of FRONT..BOTTOM
+    image_mode: "embed" streams the PNG into the file as base64,
+                "link" references the PNG file next to the SVG instead
+    validate: refuse (ValueError) to write panels that cross themselves,
+              overlap each other or leave the canvas (polygon_check.py)
+    outline_format: "polygon" writes each panel as a translated <polygon>
+                    with full-precision points, "path" as one compact
+                    <path> (see points_to_path_d) rounded to precision decimals
+    expand_instances: identical outlines (FRONT/BACK, LEFT/RIGHT, TOP/BOTTOM)
+                      are written once as a <symbol> and placed with <use>;
+                      True writes every panel out in full for cutters that
+                      do not understand <use>
+    """
+    check_svg_options(image_mode, outline_format, precision)
+    if validate:
+        polygon_check.require_valid(polygon_check.check_box(panels, layout), os.path.basename(path))
+
+    file = profiling.wrap_file(open(path, "w", encoding="utf-8"))
+    render_box_svg(file, panels, layout, art, text, optimise_order, image_mode, outline_format, precision,
+                   expand_instances, svg_path=path)
+    file.close()
+
+def render_box_svg(file, panels, layout, art=None, text=None, optimise_order=False, image_mode="embed",
+                   outline_format="polygon", precision=path_precision, expand_instances=False, svg_path=None):
+    """
+    The whole document of write_box_svg into any open text file (e.g.
+    io.StringIO), without the option checks and validation. svg_path is
+    only used to make linked image paths relative.
+    """
+    if art is not None and image_mode == "link" and svg_path is None:
+        raise ValueError("a linked image needs svg_path")
+    write_svg_header(file, layout)
+    write_cut_block(file, panels, layout, optimise_order, outline_format, precision, expand_instances)
+    if art is not None:
+        write_art_block(file, art, layout, svg_path, image_mode)
+    if text is not None:
+        write_text_block(file, text, layout)
+    file.write(SVG_FOOTER)
+
+def print_assembly_guide(art, text):
+    print("\n" + "="*60)
+    print("BOX ASSEMBLY GUIDE:")
+    print("="*60)
+    print("Panel Layout:")
+    print("  Row 1: FRONT (left), BACK (middle)")
+    print("  Row 2: LEFT (left), RIGHT (middle)")
+    print("  Row 3: TOP (right-top), BOTTOM (right-bottom)")
+    print("\nAssembly:")
+    print("1. FRONT/BACK panels have tabs on left/right edges")
+    print("2. LEFT/RIGHT side panels have slots on all edges")
+    print("3. TOP/BOTTOM panels have tabs on all edges")
+    print("4. Tabs insert into matching slots to form a box")
+    print("\nEngraving:")
+    print("  Red lines = cut paths (panels)")
+    if art is not None:
+        print(f"  Embedded image = raster engrave on {art.target} panel")
+    if text is not None:
+        print(f"  Blue text = vector engrave on {text.target} panel")
+    print("="*60)
+
+# =========================
+# Interactive prompts
+# =========================
+def print_panel_choices():
+    print("  FRONT = front panel")
+    print("  BACK = back panel")
+    print("  LEFT = left side panel")
+    print("  RIGHT = right side panel")
+    print("  TOP = top panel")
+    print("  BOTTOM = bottom panel")
+
+def prompt_art():
+    add_art = input("Add a PNG image onto one face? (y/n): ").strip().lower()
+    if add_art != "y":
+        return None
+
+    png_path = input("Enter path to PNG file (e.g. /Users/.../image.png): ").strip()
+    art = load_art(png_path)
+    if art is None:
+        print("Could not read/parse PNG file. Skipping image.")
+        return None
+
+    print("Choose which panel to place it on:")
+    print_panel_choices()
+
+    art.target = input("Type one of: FRONT BACK LEFT RIGHT TOP BOTTOM: ").strip().upper()
+    if art.target not in PANEL_NAMES:
+        print("Invalid panel choice. Skipping image.")
+        return None
+    return art
+
+def prompt_text(sizes):
+    add_text = input("Add engravable text onto one face? (y/n): ").strip().lower()
+    if add_text != "y":
+        return None
+
+    text_content = input("Enter text to engrave: ").strip()
+    if not text_content:
+        print("No text entered. Skipping text.")
+        return None
+    try:
+        stroke_font.check_text(text_content)
+    except ValueError as e:
+        print(f"Invalid text. {e} Skipping text.")
+        return None
+
+    print("Choose which panel to place text on:")
+    print_panel_choices()
+
+    text_target = input("Type one of: FRONT BACK LEFT RIGHT TOP BOTTOM: ").strip().upper()
+    if text_target not in PANEL_NAMES:
+        print("Invalid panel choice. Skipping text.")
+        return None
+
+    # Determine panel dimensions for auto-scaling
+    panel_w_for_text, panel_h_for_text = sizes[text_target]
+
+    # Calculate auto font size
+    text_font_size = calculate_auto_font_size(text_content, panel_w_for_text, panel_h_for_text)
+
+    print(f"Auto-calculated font size: {text_font_size:.1f}mm")
+    override = input("Press Enter to accept, or type a custom size (mm): ").strip()
+    auto_size = True
+    if override:
+        try:
+            custom_size = float(override)
+            if custom_size > 0:
+                text_font_size = custom_size
+                auto_size = False
+        except:
+            pass  # Keep auto size
+
+    # auto_size: the size was not typed in, so a rebuild may recompute it
+    return SimpleNamespace(content=text_content, target=text_target, font_size=text_font_size, auto_size=auto_size)
+
+def prompt_box():
+    """
+    Asks the interactive questions: start point, box size, image and text.
+    An invalid answer prints the problem and exits.
+    Returns SimpleNamespace(length, width, height, layout, art, text).
+    """
+    # =========================
+    # Gather Input
+    # =========================
+    try:
+        with profiling.stage("input_parsing"):
+            x = float(input("Type x coordinate to start: "))
+            y = float(input("Type y coordinate to start: "))
+            z = float(input("Type z coordinate to start: "))
+            length = float(input("Type length (mm): "))   # depth of box
+            width  = float(input("Type width  (mm): "))   # width of box
+            height = float(input("Type height (mm): "))   # height of box
+    except ValueError:
+        print("Invalid input. All values must be numbers.")
+        exit()
+
+    try:
+        validate_box_dimensions(length, width, height)
+    except ValueError as e:
+        print(e)
+        exit()
+
+    layout = layout_box(width, height, length)
+    art = prompt_art()
+    text = prompt_text(layout.sizes)
+    return SimpleNamespace(length=length, width=width, height=height, layout=layout, art=art, text=text)
+
+def main():
+    box = prompt_box()
+
+    w = box.width
+    h = box.height
+    d = box.length  # depth (using length input)
+
+    panels = generate_box_panels(w, h, d)
+
+    try:
+        write_box_svg("gcode_file.svg", panels, box.layout, art=box.art, text=box.text)
+    except ValueError as e:
+        print(e)
+        exit()
+
+    print_assembly_guide(box.art, box.text)
+    print(f"\nWrote gcode_file.svg")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+#Vihaan Shah
+#UNI: vvs2119
+#MECE4606 Digital Manufacturing
+#Laser Cutting Project - LASER G-CODE OUTPUT
+#
+# Writes GRBL-style laser G-code straight from the generate_panel outlines,
+# so a job no longer has to go through SVG and a CAM tool.
+#
+# A job is a list of layers, cut in order. Each layer has its own power,
+# feed and pass count, following the SVG colour convention:
+#   cut     (red)  - panel outlines, closed polygons
+#   engrave (blue) - text strokes, open polylines
+#   raster         - image scanline segments, open 2-point polylines
+# Lines come out of a generator and are written in fixed-size batches
+# through a buffered file, so memory stays flat however big the sheet is.
+#
+# Usage:
+#   python laser_gcode.py boxes.csv --out gcode
+#   python laser_gcode.py boxes.csv --sheet 600x400 --spacing 3 --out gcode
+
+import argparse
+import os
+import sys
+import zlib
+from types import SimpleNamespace
+
+import numpy as np
+
+import cut_order
+import kerf
+import laser_cutting_fixed as lcf
+import nesting
+import png_raster
+import polygon_check
+import profiling
+import stroke_font
+
+# =========================
+# Machine / layer settings
+# =========================
+S_MAX = 1000            # GRBL $30 (spindle max) - power 100% = S1000
+WRITE_BATCH = 4096      # lines per file.write()
+
+LAYER_DEFAULTS = {
+    "cut":     {"power": 100.0, "feed": 300.0,  "passes": 1},
+    "engrave": {"power": 30.0,  "feed": 1500.0, "passes": 1},
+    "raster":  {"power": 20.0,  "feed": 3000.0, "passes": 1},
+}
+
+def fmt(value):
+    text = f"{value:.3f}".rstrip("0").rstrip(".")
+    return "0" if text in ("-0", "") else text
+
+def make_layer(kind, paths, closed=None, name=None, **settings):
+    """
+    kind:   "cut", "engrave" or "raster"
+    paths:  iterable of polylines (lists or (N, 2) arrays in mm). May be a
+            generator; it is only consumed while writing.
+    closed: closed polygons return to their first point (default: cut only)
+    settings: power (% of S_MAX), feed (mm/min), passes
+    """
+    if kind not in LAYER_DEFAULTS:
+        raise ValueError(f"unknown layer kind {kind!r}")
+    opts = dict(LAYER_DEFAULTS[kind])
+    opts.update({k: v for k, v in settings.items() if v is not None})
+    if not 0 <= opts["power"] <= 100:
+        raise ValueError("power must be between 0 and 100 %")
+    if opts["feed"] <= 0 or opts["passes"] < 1:
+        raise ValueError("feed must be > 0 and passes >= 1")
+    return SimpleNamespace(
+        name=name or kind,
+        kind=kind,
+        paths=paths,
+        closed=(kind == "cut") if closed is None else closed,
+        power=float(opts["power"]),
+        feed=float(opts["feed"]),
+        passes=int(opts["passes"]),
+    )
+
+# =========================
+# G-code stream
+# =========================
+def gcode_lines(layers, sheet_height=None, title="laser job"):
+    """
+    Yields G-code lines for the layers in order.
+    Coordinates come in SVG-style (y down). With sheet_height given, y is
+    flipped so the machine origin is the bottom-left corner of the sheet.
+    """
+    def xy(pt):
+        x, y = float(pt[0]), float(pt[1])
+        if sheet_height is not None:
+            y = sheet_height - y
+        return f"X{fmt(x)} Y{fmt(y)}"
+
+    # The file is ASCII and a comment ends at the newline, whatever the box is called
+    title = " ".join(title.encode("ascii", "replace").decode("ascii").split())
+    yield f"; {title}"
+    yield "; generated by laser_gcode.py from generate_panel outlines"
+    yield "G21 ; mm units"
+    yield "G90 ; absolute XY"
+    yield "M5 ; laser off"
+
+    for layer in layers:
+        s_value = fmt(layer.power / 100.0 * S_MAX)
+        yield f"; --- layer {layer.name}: {layer.kind}, power {fmt(layer.power)}%, feed {fmt(layer.feed)} mm/min, passes {layer.passes} ---"
+        # M4 = dynamic power: GRBL scales power with speed, so corners do not burn
+        yield "M4 S0"
+        paths = layer.paths if layer.passes == 1 else list(layer.paths)
+        for p in range(layer.passes):
+            if layer.passes > 1:
+                yield f"; pass {p + 1}/{layer.passes}"
+            for path in paths:
+                if len(path) == 0:
+                    continue
+                start = xy(path[0])
+                yield f"G0 {start} S0"
+                last = start
+                first = True
+                for pt in path[1:]:
+                    target = xy(pt)
+                    if target == last:
+                        continue  # zero-length move after rounding
+                    if first:
+                        yield f"G1 {target} F{fmt(layer.feed)} S{s_value}"
+                        first = False
+                    else:
+                        yield f"G1 {target}"
+                    last = target
+                if layer.closed and len(path) > 2 and last != start:
+                    yield f"G1 {start}"
+        yield "M5"
+
+    yield "; --- end ---"
+    yield "M5 ; laser off"
+    yield "G0 X0 Y0"
+    yield "M2"
+
+def write_gcode(path, layers, sheet_height=None, title="laser job"):
+    """Streams gcode_lines into path in WRITE_BATCH-line writes. Returns bytes written."""
+    written = 0
+    with profiling.wrap_file(open(path, "w", encoding="ascii", buffering=1 << 16)) as f:
+        batch = []
+        for line in gcode_lines(layers, sheet_height=sheet_height, title=title):
+            batch.append(line)
+            if len(batch) >= WRITE_BATCH:
+                chunk = "\n".join(batch) + "\n"
+                f.write(chunk)
+                written += len(chunk)
+                batch.clear()
+        if batch:
+            chunk = "\n".join(batch) + "\n"
+            f.write(chunk)
+            written += len(chunk)
+    return written
+
+# =========================
+# Layers from boxes / sheets
+# =========================
+def box_cut_paths(panels, centers, optimise_order=False):
+    """Panel outlines moved to their layout centres, as a generator."""
+    if optimise_order:
+        for name, pts in lcf.optimised_panel_order(panels, centers):
+            yield np.asarray(pts) + np.asarray(centers[name])
+        return
+    for name in lcf.PANEL_NAMES:
+        yield np.asarray(panels[name]) + np.asarray(centers[name])
+
+def sheet_cut_paths(sheet, optimise_order=False):
+    """Placed outlines of one nested sheet (see nesting.py), as a generator."""
+    placements = sheet.placements
+    if optimise_order:
+        contours = [cut_order.make_contour(i, p.points) for i, p in enumerate(placements)]
+        for item in cut_order.optimise_cut_order(contours).order:
+            yield item.points
+        return
+    for p in placements:
+        yield p.points
+
+def box_raster_paths(art, layout, line_step=0.1, dither="floyd-steinberg"):
+    """
+    Scanline segments for the artwork on its target panel (same placement as
+    the SVG). Returns (generator of 2-point paths, estimate_raster_time result).
+    """
+    fit = lcf.fit_art(art, layout.centers[art.target], layout.sizes[art.target])
+    raster = png_raster.raster_art(art.path, fit.x, fit.y, fit.w, fit.h,
+                                   line_step=line_step, dither=dither)
+    estimate = png_raster.estimate_raster_time(raster.rows, LAYER_DEFAULTS["raster"]["feed"], line_step)
+    return png_raster.raster_paths(raster.rows), estimate
+
+def box_text_paths(text, layout):
+    """Single-stroke engrave polylines for the text on its target panel."""
+    tx, ty = layout.centers[text.target]
+    return stroke_font.render_text(text.content, text.font_size, tx, ty).paths
+
+def spec_text(spec, layout):
+    """A manifest row's text for box_text_paths, auto-sized to its panel when text_size is unset."""
+    if not spec.text or spec.text_target not in layout.sizes:
+        return None
+    font_size = spec.text_size
+    if not font_size or font_size <= 0:
+        font_size = lcf.calculate_auto_font_size(spec.text, *layout.sizes[spec.text_target])
+    return SimpleNamespace(content=spec.text, target=spec.text_target, font_size=font_size)
+
+def sheet_engrave_paths(sheet, specs, raster=True, line_step=0.1, dither="floyd-steinberg"):
+    """
+    Art and text of the boxes on one nested sheet, each on the placed panel
+    it targets (as nesting.write_sheet_svg draws them). specs maps box
+    name -> manifest row; raster=False leaves the artwork out.
+    Returns SimpleNamespace(raster, engrave, rows, seconds): path lists plus
+    the summed raster estimate. Art or text that cannot be drawn is
+    reported and left out.
+    """
+    out = SimpleNamespace(raster=[], engrave=[], rows=0, seconds=0.0)
+    for p in sheet.placements:
+        spec = specs.get(p.box)
+        if spec is None:
+            continue
+        on_art = raster and spec.art_path and spec.art_target == p.panel
+        on_text = spec.text and spec.text_target == p.panel
+        if not (on_art or on_text):
+            continue
+        layout = lcf.layout_box(spec.width, spec.height, spec.length, mt=spec.material_thickness)
+        # The panel's own frame: outline centred on (0, 0), same as generate_panel
+        local = SimpleNamespace(centers={p.panel: (0.0, 0.0)}, sizes={p.panel: layout.sizes[p.panel]})
+        if on_art:
+            art = lcf.load_art(spec.art_path, spec.art_target)
+            try:
+                if art is None:
+                    raise ValueError("not a PNG")
+                paths, estimate = box_raster_paths(art, local, line_step, dither)
+                out.raster.extend(nesting.placed_paths(p, paths))
+            except (OSError, ValueError, zlib.error) as e:
+                print(f"{spec.name}: could not decode {spec.art_path!r} ({e}), leaving out the artwork")
+            else:
+                out.rows += estimate.rows
+                out.seconds += estimate.seconds
+        if on_text:
+            try:
+                stroke_font.check_text(spec.text)
+            except ValueError as e:
+                print(f"{spec.name}: {e} Leaving out the text.")
+            else:
+                out.engrave.extend(nesting.placed_paths(p, box_text_paths(spec_text(spec, local), local)))
+    return out
+
+def main(argv=None):
+    import box_batch
+
+    parser = argparse.ArgumentParser(description="Write laser G-code for every box in a manifest.")
+    parser.add_argument("manifest", help="CSV or JSON box manifest (see box_batch.py)")
+    parser.add_argument("--out", default="gcode", help="output directory")
+    parser.add_argument("--sheet", type=nesting.parse_sheet_size, default=None,
+                        help="nest all boxes onto sheets of this size (e.g. 600x400) instead of one file per box")
+    parser.add_argument("--spacing", type=float, default=3.0)
+    parser.add_argument("--cut-power", type=float, default=None, help="cut layer power (%%)")
+    parser.add_argument("--cut-feed", type=float, default=None, help="cut layer feed (mm/min)")
+    parser.add_argument("--cut-passes", type=int, default=None)
+    parser.add_argument("--optimise-order", action="store_true", help="order contours to minimise head travel")
+    parser.add_argument("--line-step", type=float, default=0.1, help="raster line spacing (mm)")
+    parser.add_argument("--dither", choices=sorted(png_raster.DITHERS), default="floyd-steinberg")
+    args = parser.parse_args(argv)
+
+    try:
+        specs = box_batch.load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"Could not read manifest: {e}")
+        return 1
+    os.makedirs(args.out, exist_ok=True)
+    cut = dict(power=args.cut_power, feed=args.cut_feed, passes=args.cut_passes)
+
+    if args.sheet is None:
+        for spec in specs:
+            try:
+                lcf.validate_box_dimensions(spec.length, spec.width, spec.height)
+                if spec.text:
+                    stroke_font.check_text(spec.text)
+            except ValueError as e:
+                print(f"{spec.name}: {e} Skipping.")
+                continue
+            w, h, d = spec.width, spec.height, spec.length
+            panels = kerf.apply_kerf(lcf.generate_box_panels(w, h, d, mt=spec.material_thickness, tw=spec.tab_width),
+                                     spec.kerf)
+            layout = lcf.layout_box(w, h, d, mt=spec.material_thickness)
+            problems = polygon_check.check_box(panels, layout, mt=spec.material_thickness, kerf=spec.kerf)
+            if problems:
+                print(f"{spec.name}: invalid geometry, skipping: {problems[0]}")
+                continue
+            layers = []
+            if spec.art_path:
+                art = lcf.load_art(spec.art_path, spec.art_target)
+                if art is None or art.target not in layout.centers:
+                    print(f"{spec.name}: could not place PNG {spec.art_path!r}, skipping the raster layer")
+                else:
+                    try:
+                        paths, estimate = box_raster_paths(art, layout, args.line_step, args.dither)
+                    except (OSError, ValueError, zlib.error) as e:
+                        print(f"{spec.name}: could not decode {spec.art_path!r} ({e}), skipping the raster layer")
+                    else:
+                        # Engrave before cutting so the panel has not moved yet
+                        layers.append(make_layer("raster", paths))
+                        print(f"{spec.name}: raster {estimate.rows} lines, about {estimate.seconds / 60:.1f} min")
+            text = spec_text(spec, layout)
+            if text is not None:
+                layers.append(make_layer("engrave", box_text_paths(text, layout)))
+            layers.append(make_layer("cut", box_cut_paths(panels, layout.centers, args.optimise_order), **cut))
+            path = os.path.join(args.out, f"{spec.name}.gcode")
+            size = write_gcode(path, layers, sheet_height=layout.view_h, title=spec.name)
+            print(f"Wrote {path} ({size} bytes)")
+        return 0
+
+    parts = nesting.manifest_parts(specs)
+    boxes = {spec.name: spec for spec in specs}
+    sheet_w, sheet_h = args.sheet
+    result = nesting.nest_parts(parts, sheet_w, sheet_h, spacing=args.spacing)
+    for s in result.sheets:
+        try:
+            polygon_check.require_valid(polygon_check.check_sheet(s), f"sheet {s.index + 1}")
+        except ValueError as e:
+            print(f"Sheet {s.index + 1}: {e} Skipping.")
+            continue
+        marks = sheet_engrave_paths(s, boxes, line_step=args.line_step, dither=args.dither)
+        layers = []
+        # Engrave before cutting so the parts have not moved yet
+        if marks.raster:
+            layers.append(make_layer("raster", marks.raster))
+            print(f"Sheet {s.index + 1}: raster {marks.rows} lines, about {marks.seconds / 60:.1f} min")
+        if marks.engrave:
+            layers.append(make_layer("engrave", marks.engrave))
+        layers.append(make_layer("cut", sheet_cut_paths(s, args.optimise_order), **cut))
+        path = os.path.join(args.out, f"sheet_{s.index + 1:03d}.gcode")
+        size = write_gcode(path, layers, sheet_height=sheet_h,
+                           title=f"sheet {s.index + 1} {nesting.sheet_label(s)}")
+        print(f"Wrote {path} ({size} bytes)")
+    nesting.print_nesting_report(result)
+    return 0 if not result.unplaced else 2
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,365 @@
+#Vihaan Shah
+#UNI: vvs2119
+#MECE4606 Digital Manufacturing
+#Laser Cutting Project - MOTION-AWARE JOB TIME
+#
+# Path length / feed badly underestimates finger-joint jobs: an outline is
+# dozens of 3-9 mm segments joined by 90 degree corners, and the head spends
+# most of its time slowing down for a corner and speeding up again.
+#
+# This replays a laser_gcode.py job (same layers, same move order: G0 to the
+# start of every path, G1 along it, G0 home at the end) the way a GRBL-style
+# planner does:
+#   - corner speed from junction deviation:
+#       v^2 = a * jd * sin(t/2) / (1 - sin(t/2)), t = angle between moves,
+#     capped by the feed of both moves; the job start/end and every layer
+#     change (M4/M5) are full stops,
+#   - the backward/forward planner passes
+#       s[i] = min(s[i], s[i+1] + 2 a L[i])  and  s[i] = min(s[i], s[i-1] + 2 a L[i])
+#     (s = v^2) are running minima of s +/- 2 a * distance, so both are one
+#     np.minimum.accumulate over the whole job,
+#   - each move then takes the time of its trapezoid (or triangle) profile.
+# Everything is array math over all moves at once; only turning the paths
+# into one point array is a Python loop.
+#
+# Usage:
+#   python motion_time.py boxes.csv                  (per box / per panel)
+#   python motion_time.py boxes.csv --sheet 600x400  (per nested sheet)
+#   python motion_time.py measured.csv --validate    (manifest + measured_s column)
+
+import argparse
+import csv
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+
+import box_batch
+import kerf
+import laser_cutting_fixed as lcf
+import laser_gcode
+import nesting
+
+# =========================
+# Machine
+# =========================
+# Starting values for our lab laser (GRBL $120/$121, $11 and $110); measure
+# a few jobs with --validate and adjust when the controller settings change.
+MACHINE_DEFAULTS = {
+    "accel": 1000.0,             # mm/s^2
+    "junction_deviation": 0.01,  # mm
+    "rapid_feed": 6000.0,        # mm/min
+}
+
+def machine(**settings):
+    """SimpleNamespace(accel, junction_deviation, rapid_feed); None values keep the default."""
+    opts = dict(MACHINE_DEFAULTS)
+    opts.update({k: v for k, v in settings.items() if v is not None})
+    if opts["accel"] <= 0 or opts["rapid_feed"] <= 0 or opts["junction_deviation"] < 0:
+        raise ValueError("accel and rapid_feed must be > 0, junction_deviation >= 0")
+    return SimpleNamespace(**{k: float(v) for k, v in opts.items()})
+
+# =========================
+# Planner
+# =========================
+def _junction_limits(ux, uy, vmax, accel, jd):
+    """Squared speed limit at each interior node (between move i-1 and move i)."""
+    # GRBL convention: cos_theta = -(u_in . u_out); 1 = full reversal, -1 = straight on
+    cos_theta = -(ux[:-1] * ux[1:] + uy[:-1] * uy[1:])
+    np.clip(cos_theta, -1.0, 1.0, out=cos_theta)
+    sin_half = np.sqrt(0.5 * (1.0 - cos_theta))
+    with np.errstate(divide="ignore"):
+        limit = accel * jd * sin_half / (1.0 - sin_half)
+    limit[cos_theta < -0.999999] = np.inf
+    limit[cos_theta > 0.999999] = 0.0
+    return np.minimum(limit, np.minimum(vmax[:-1], vmax[1:]) ** 2)
+
+def plan_moves(points, vmax, stops, accel, jd):
+    """
+    points: (N+1, 2) positions; vmax: (N,) cruise speed of each move (mm/s);
+    stops:  (N+1,) True where the head must be at rest.
+    Returns the time (s) of each of the N moves.
+    """
+    delta = np.diff(points, axis=0)
+    length = np.hypot(delta[:, 0], delta[:, 1])
+    ux = delta[:, 0] / length
+    uy = delta[:, 1] / length
+
+    s = np.empty(len(points))
+    s[0] = s[-1] = 0.0
+    s[1:-1] = _junction_limits(ux, uy, vmax, accel, jd)
+    s[stops] = 0.0
+
+    # Backward then forward pass as running minima over the distance travelled
+    dist = 2.0 * accel * np.concatenate(([0.0], np.cumsum(length)))
+    s = np.minimum.accumulate((s + dist)[::-1])[::-1] - dist
+    s = np.minimum.accumulate(s - dist) + dist
+    np.maximum(s, 0.0, out=s)
+
+    v0sq, v1sq = s[:-1], s[1:]
+    v0, v1 = np.sqrt(v0sq), np.sqrt(v1sq)
+    ramp_up = (vmax ** 2 - v0sq) / (2.0 * accel)
+    ramp_down = (vmax ** 2 - v1sq) / (2.0 * accel)
+    cruise = length - ramp_up - ramp_down
+    trapezoid = (2.0 * vmax - v0 - v1) / accel + np.maximum(cruise, 0.0) / vmax
+    peak = np.sqrt(np.maximum((2.0 * accel * length + v0sq + v1sq) / 2.0, 0.0))
+    triangle = (2.0 * peak - v0 - v1) / accel
+    return np.where(cruise >= 0.0, trapezoid, triangle)
+
+# =========================
+# Jobs
+# =========================
+def _layer_points(layer):
+    """(points, point count per path) for a layer, closed outlines closed as in the G-code."""
+    paths = list(layer.paths)
+    if not layer.closed and paths:
+        # Raster layers are many equal-length paths: one conversion for all of them
+        try:
+            block = np.asarray(paths, dtype=float)
+        except ValueError:
+            block = None
+        if block is not None and block.ndim == 3:
+            return block.reshape(-1, 2), np.full(len(paths), block.shape[1])
+    arrays = []
+    for path in paths:
+        pts = np.asarray(path, dtype=float).reshape(-1, 2)
+        if layer.closed and len(pts) > 2 and not np.array_equal(pts[0], pts[-1]):
+            pts = np.vstack((pts, pts[:1]))
+        arrays.append(pts)
+    counts = np.array([len(a) for a in arrays], dtype=np.int64)
+    return (np.vstack(arrays) if arrays else np.empty((0, 2))), counts
+
+def estimate_layers(layers, labels=None, mach=None, origin=(0.0, 0.0)):
+    """
+    Times a list of laser_gcode layers in G-code order.
+    labels: optional per-layer lists naming the part each path belongs to
+    (e.g. the panel); travel into a path is charged to its label.
+    Returns SimpleNamespace(total_s, cut_s, engrave_s, travel_s, naive_s, parts)
+    where parts maps label -> {"cut": s, "engrave": s, "travel": s}.
+    raster layers count as engrave time.
+    """
+    mach = mach or machine()
+    rapid = mach.rapid_feed / 60.0
+    chunks = [np.asarray([origin], dtype=float)]
+    speed, kind, owner, stop_after = [], [], [], []
+    owners = []
+    for li, layer in enumerate(layers):
+        pts, counts = _layer_points(layer)
+        layer_labels = labels[li] if labels else [None] * len(counts)
+        first = (np.cumsum(counts) - counts)[counts > 0]
+        # The first move of every path is the G0 lead-in, the rest burn at the layer feed
+        sp = np.full(len(pts), layer.feed / 60.0)
+        sp[first] = rapid
+        kd = np.full(len(pts), 1 if layer.kind == "cut" else 2)
+        kd[first] = 0
+        ow = np.repeat(np.arange(len(counts)) + len(owners), counts)
+        owners.extend(layer_labels)
+        if not len(pts):
+            continue
+        st = np.zeros(len(pts) * layer.passes, dtype=bool)
+        st[-1] = True  # M5 at the end of the layer
+        chunks.append(np.tile(pts, (layer.passes, 1)))
+        speed.append(np.tile(sp, layer.passes))
+        kind.append(np.tile(kd, layer.passes))
+        owner.append(np.tile(ow, layer.passes))
+        stop_after.append(st)
+    chunks.append(np.asarray([origin], dtype=float))
+    speed.append(np.array([rapid]))
+    kind.append(np.array([0]))
+    owner.append(np.array([-1]))
+    stop_after.append(np.array([True]))
+
+    points = np.vstack(chunks)
+    speed = np.concatenate(speed)
+    kind = np.concatenate(kind)
+    owner = np.concatenate(owner)
+    stops = np.concatenate(([True], np.concatenate(stop_after)))
+
+    # Zero-length moves are skipped in the G-code; a stop on one moves back a node
+    delta = np.diff(points, axis=0)
+    moving = (delta[:, 0] != 0) | (delta[:, 1] != 0)
+    node_keep = np.concatenate(([True], moving))
+    node_index = np.cumsum(node_keep) - 1
+    kept_stops = np.zeros(int(node_keep.sum()), dtype=bool)
+    np.logical_or.at(kept_stops, node_index, stops)
+
+    result = SimpleNamespace(total_s=0.0, cut_s=0.0, engrave_s=0.0, travel_s=0.0, naive_s=0.0, parts={})
+    if not moving.any():
+        return result
+    times = plan_moves(points[node_keep], speed[moving], kept_stops, mach.accel, mach.junction_deviation)
+    length = np.hypot(delta[moving, 0], delta[moving, 1])
+    kind = kind[moving]
+    owner = owner[moving]
+
+    per_kind = np.bincount(kind, weights=times, minlength=3)
+    result.travel_s, result.cut_s, result.engrave_s = (float(t) for t in per_kind)
+    result.total_s = float(times.sum())
+    result.naive_s = float((length / speed[moving]).sum())
+
+    if owners:
+        named = owner >= 0
+        sums = np.zeros((len(owners), 3))
+        np.add.at(sums, (owner[named], kind[named]), times[named])
+        for label, (travel, cut, engrave) in zip(owners, sums):
+            part = result.parts.setdefault(label, {"cut": 0.0, "engrave": 0.0, "travel": 0.0})
+            part["cut"] += cut
+            part["engrave"] += engrave
+            part["travel"] += travel
+    return result
+
+def box_job(spec, line_step=0.1, dither="floyd-steinberg", optimise_order=False, **cut):
+    """
+    The layers laser_gcode.py writes for one manifest row, with panel labels.
+    Returns (layers, labels, sheet height).
+    """
+    w, h, d = spec.width, spec.height, spec.length
+    panels = kerf.apply_kerf(lcf.generate_box_panels(w, h, d, mt=spec.material_thickness, tw=spec.tab_width),
+                             spec.kerf)
+    layout = lcf.layout_box(w, h, d, mt=spec.material_thickness)
+    layers, labels = [], []
+    if spec.art_path:
+        art = lcf.load_art(spec.art_path, spec.art_target)
+        if art is None or art.target not in layout.centers:
+            raise ValueError(f"could not place PNG {spec.art_path!r}")
+        paths, _estimate = laser_gcode.box_raster_paths(art, layout, line_step, dither)
+        paths = list(paths)
+        layers.append(laser_gcode.make_layer("raster", paths))
+        labels.append([art.target] * len(paths))
+    if spec.text and spec.text_target in layout.sizes:
+        font_size = spec.text_size
+        if not font_size or font_size <= 0:
+            font_size = lcf.calculate_auto_font_size(spec.text, *layout.sizes[spec.text_target])
+        text = SimpleNamespace(content=spec.text, target=spec.text_target, font_size=font_size)
+        paths = laser_gcode.box_text_paths(text, layout)
+        layers.append(laser_gcode.make_layer("engrave", paths))
+        labels.append([spec.text_target] * len(paths))
+    if optimise_order:
+        order = lcf.optimised_panel_order(panels, layout.centers)
+    else:
+        order = [(name, panels[name]) for name in lcf.PANEL_NAMES]
+    layers.append(laser_gcode.make_layer(
+        "cut", [np.asarray(pts) + np.asarray(layout.centers[name]) for name, pts in order], **cut))
+    labels.append([name for name, _pts in order])
+    return layers, labels, layout.view_h
+
+def estimate_box(spec, mach=None, **options):
+    """estimate_layers for one manifest row; the origin is the sheet's bottom-left corner."""
+    layers, labels, sheet_h = box_job(spec, **options)
+    return estimate_layers(layers, labels, mach, origin=(0.0, sheet_h))
+
+def estimate_sheet(sheet, mach=None, **cut):
+    """estimate_layers for one nesting.py sheet, labelled 'box/PANEL'."""
+    paths = [p.points for p in sheet.placements]
+    layer = laser_gcode.make_layer("cut", paths, **cut)
+    return estimate_layers([layer], [[p.id for p in sheet.placements]], mach, origin=(0.0, sheet.height))
+
+# =========================
+# Reports
+# =========================
+def print_time_report(title, est):
+    print("=" * 60)
+    print(f"JOB TIME: {title}")
+    print("=" * 60)
+    print(f"  {'part':<22}{'cut':>9}{'engrave':>9}{'travel':>9}  (s)")
+    for label, t in est.parts.items():
+        print(f"  {str(label):<22}{t['cut']:9.1f}{t['engrave']:9.1f}{t['travel']:9.1f}")
+    print("-" * 60)
+    print(f"  Cut {est.cut_s:.1f} s, engrave {est.engrave_s:.1f} s, travel {est.travel_s:.1f} s")
+    print(f"  Total {est.total_s / 60:.2f} min (length / feed alone: {est.naive_s / 60:.2f} min)")
+    print("=" * 60)
+
+def validate(path, mach=None, **options):
+    """
+    Compares estimates with measured times. path is a box manifest (see
+    box_batch.py) with an extra measured_s column. Returns a list of
+    SimpleNamespace(name, measured_s, estimate_s, naive_s).
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    out = []
+    for i, row in enumerate(rows):
+        measured = row.pop("measured_s", None)
+        try:
+            measured = float(measured)
+        except (TypeError, ValueError):
+            raise ValueError(f"row {i}: measured_s must be a number, got {measured!r}")
+        spec = box_batch._clean_row(row, i)
+        est = estimate_box(spec, mach, **options)
+        out.append(SimpleNamespace(name=spec.name, measured_s=measured, estimate_s=est.total_s, naive_s=est.naive_s))
+    return out
+
+def print_validation(rows):
+    print("=" * 60)
+    print("ESTIMATE vs MEASURED:")
+    print("=" * 60)
+    print(f"  {'job':<20}{'measured':>10}{'estimate':>10}{'err':>8}{'naive err':>11}")
+    for r in rows:
+        err = (r.estimate_s - r.measured_s) / r.measured_s * 100
+        naive = (r.naive_s - r.measured_s) / r.measured_s * 100
+        print(f"  {r.name:<20}{r.measured_s:9.1f}s{r.estimate_s:9.1f}s{err:7.1f}%{naive:10.1f}%")
+    if rows:
+        mape = np.mean([abs(r.estimate_s - r.measured_s) / r.measured_s for r in rows]) * 100
+        naive = np.mean([abs(r.naive_s - r.measured_s) / r.measured_s for r in rows]) * 100
+        print("-" * 60)
+        print(f"  Mean abs error: {mape:.1f}% (length / feed: {naive:.1f}%)")
+    print("=" * 60)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estimate laser job time with acceleration and corner slowdowns.")
+    parser.add_argument("manifest", help="CSV or JSON box manifest (see box_batch.py)")
+    parser.add_argument("--sheet", type=nesting.parse_sheet_size, default=None,
+                        help="nest all boxes onto sheets of this size and time each sheet")
+    parser.add_argument("--spacing", type=float, default=3.0)
+    parser.add_argument("--validate", action="store_true",
+                        help="manifest has a measured_s column; compare estimates with it")
+    parser.add_argument("--accel", type=float, default=None, help="mm/s^2")
+    parser.add_argument("--junction-deviation", type=float, default=None, help="mm")
+    parser.add_argument("--rapid-feed", type=float, default=None, help="mm/min")
+    parser.add_argument("--cut-feed", type=float, default=None, help="cut layer feed (mm/min)")
+    parser.add_argument("--cut-passes", type=int, default=None)
+    parser.add_argument("--optimise-order", action="store_true")
+    parser.add_argument("--line-step", type=float, default=0.1, help="raster line spacing (mm)")
+    args = parser.parse_args(argv)
+
+    try:
+        mach = machine(accel=args.accel, junction_deviation=args.junction_deviation, rapid_feed=args.rapid_feed)
+    except ValueError as e:
+        print(f"Invalid machine settings: {e}")
+        return 1
+    cut = dict(feed=args.cut_feed, passes=args.cut_passes)
+    options = dict(line_step=args.line_step, optimise_order=args.optimise_order, **cut)
+
+    if args.validate:
+        try:
+            rows = validate(args.manifest, mach, **options)
+        except (OSError, ValueError) as e:
+            print(f"Could not validate: {e}")
+            return 1
+        print_validation(rows)
+        return 0
+
+    try:
+        specs = box_batch.load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"Could not read manifest: {e}")
+        return 1
+
+    if args.sheet is None:
+        for spec in specs:
+            try:
+                lcf.validate_box_dimensions(spec.length, spec.width, spec.height)
+                est = estimate_box(spec, mach, **options)
+            except ValueError as e:
+                print(f"{spec.name}: {e} Skipping.")
+                continue
+            print_time_report(spec.name, est)
+        return 0
+
+    parts = nesting.manifest_parts(specs)
+    result = nesting.nest_parts(parts, *args.sheet, spacing=args.spacing)
+    for s in result.sheets:
+        print_time_report(f"sheet {s.index + 1} {nesting.sheet_label(s)}", estimate_sheet(s, mach, **cut))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,576 @@
+#Vihaan Shah
+#UNI: vvs2119
+#MECE4606 Digital Manufacturing
+#Laser Cutting Project - SHEET NESTING
+#
+# Packs panel outlines from any number of boxes onto fixed-size stock sheets
+# instead of the fixed 3-column grid in laser_cutting_fixed.py.
+#
+# Packer: skyline bottom-left. Candidate positions come from the skyline
+# (one per skyline step) plus the corners of parts already placed, which
+# lets small panels drop into holes under overhangs. Every candidate is
+# checked against a uniform-grid spatial index of the placed parts, so a
+# collision check only looks at the few parts in the same grid cells.
+# Parts may be turned 90 degrees. Spacing is the kerf/web left between parts.
+# Parts of different materials or thicknesses never share a sheet: each
+# (material, thickness) group is packed onto its own sheets.
+#
+# Usage:
+#   python nesting.py boxes.csv --sheet 600x400 --spacing 3 --out nested
+
+import argparse
+import math
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+
+import common_line
+import cut_order
+import kerf
+import laser_cutting_fixed as lcf
+import panel_cache
+import polygon_check
+import profiling
+
+# =========================
+# Parts
+# =========================
+def polygon_area(points):
+    """Shoelace area of a closed outline (list of (x, y) or (N, 2) array)."""
+    pts = np.asarray(points, dtype=float)
+    x = pts[:, 0]
+    y = pts[:, 1]
+    return 0.5 * abs(float(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))))
+
+def make_part(part_id, points, box=None, panel=None, material=None, thickness=None):
+    """
+    Wraps one generate_panel outline for nesting.
+    box/panel are free-form labels carried through to the placements.
+    material/thickness decide which sheets the part may go on (see nest_parts).
+    """
+    pts = np.asarray(points, dtype=float)
+    lo = pts.min(axis=0)
+    hi = pts.max(axis=0)
+    return SimpleNamespace(
+        id=part_id,
+        box=box,
+        panel=panel,
+        material=material,
+        thickness=thickness,
+        points=pts,
+        min_x=float(lo[0]),
+        min_y=float(lo[1]),
+        w=float(hi[0] - lo[0]),
+        h=float(hi[1] - lo[1]),
+        area=polygon_area(pts),
+    )
+
+def box_parts(box_name, w, h, d, mt=lcf.mt, tw=lcf.tw, kerf_mm=0.0, cache=None, material=None):
+    """
+    The six panels of one box as nesting parts, ids like "box_0001/FRONT".
+    kerf_mm > 0 grows the outlines by half the kerf (kerf.py) before packing.
+    cache: optional panel_cache.PanelCache shared across boxes.
+    material: kerf.py MATERIALS name (or None), kept with the thickness mt.
+    """
+    panels = kerf.apply_kerf(lcf.generate_box_panels(w, h, d, mt=mt, tw=tw, cache=cache), kerf_mm)
+    return [make_part(f"{box_name}/{name}", panels[name], box=box_name, panel=name,
+                      material=material, thickness=mt)
+            for name in lcf.PANEL_NAMES]
+
+def manifest_parts(specs, cache=None):
+    """
+    Parts for every box_batch spec. Boxes that fail
+    lcf.validate_box_dimensions are reported and skipped, as box_batch does.
+    """
+    parts = []
+    for spec in specs:
+        try:
+            lcf.validate_box_dimensions(spec.length, spec.width, spec.height)
+        except ValueError as e:
+            print(f"{spec.name}: {e} Skipping.")
+            continue
+        parts.extend(box_parts(spec.name, spec.width, spec.height, spec.length,
+                               mt=spec.material_thickness, tw=spec.tab_width, kerf_mm=spec.kerf,
+                               cache=cache, material=spec.material))
+    return parts
+
+def sheet_label(sheet):
+    """'plywood_3mm (3 mm)', or just '3 mm' for parts without a material name."""
+    if sheet.thickness is None:
+        return sheet.material or "unlabelled"
+    if sheet.material is None:
+        return f"{sheet.thickness:g} mm"
+    return f"{sheet.material} ({sheet.thickness:g} mm)"
+
+# =========================
+# Spatial index
+# =========================
+class GridIndex:
+    """Uniform grid over a sheet; each cell lists the rectangles touching it."""
+
+    def __init__(self, cell):
+        self.cell = cell
+        self.cells = {}
+        self.rects = []
+
+    def _cell_range(self, x0, y0, x1, y1):
+        c = self.cell
+        return (range(int(x0 // c), int(math.ceil(x1 / c))),
+                range(int(y0 // c), int(math.ceil(y1 / c))))
+
+    def insert(self, x0, y0, x1, y1):
+        idx = len(self.rects)
+        self.rects.append((x0, y0, x1, y1))
+        cols, rows = self._cell_range(x0, y0, x1, y1)
+        for i in cols:
+            for j in rows:
+                self.cells.setdefault((i, j), []).append(idx)
+
+    def collides(self, x0, y0, x1, y1, eps=1e-9):
+        cols, rows = self._cell_range(x0, y0, x1, y1)
+        seen = set()
+        for i in cols:
+            for j in rows:
+                for idx in self.cells.get((i, j), ()):
+                    if idx in seen:
+                        continue
+                    seen.add(idx)
+                    rx0, ry0, rx1, ry1 = self.rects[idx]
+                    if x0 < rx1 - eps and rx0 < x1 - eps and y0 < ry1 - eps and ry0 < y1 - eps:
+                        return True
+        return False
+
+# =========================
+# One sheet
+# =========================
+class _Sheet:
+    """
+    Packing state for one sheet. Coordinates are SVG-style (y grows down),
+    so "bottom-left" here means lowest y, then lowest x. Every part is
+    stored inflated by the spacing on its right and lower side, inside a
+    region that is spacing wider/taller than the usable area.
+    """
+
+    def __init__(self, index, width, height, margin, spacing, cell):
+        self.index = index
+        self.width = width
+        self.height = height
+        self.material = None
+        self.thickness = None
+        self.margin = margin
+        self.spacing = spacing
+        self.region_w = width - 2 * margin + spacing
+        self.region_h = height - 2 * margin + spacing
+        self.skyline = [[0.0, 0.0, self.region_w]]  # [x, y, length] steps
+        self.grid = GridIndex(cell)
+        self.corners = []
+        self.placements = []
+        # Sizes find() had no room for. Placing parts only takes room away,
+        # and a smaller rectangle fits wherever a larger one does, so any
+        # size at least this big in both directions cannot fit either
+        self.misses = []
+
+    def _skyline_y(self, x, w):
+        """Highest skyline level under [x, x + w)."""
+        y = 0.0
+        for sx, sy, sl in self.skyline:
+            if sx + sl <= x or sx >= x + w:
+                continue
+            y = max(y, sy)
+        return y
+
+    def _candidates(self, w, h):
+        for sx, _sy, _sl in self.skyline:
+            yield sx, self._skyline_y(sx, w)
+        for cx, cy in self.corners:
+            yield cx, cy
+
+    def find(self, w, h):
+        """Best (score, x, y) for an inflated w x h rectangle, or None."""
+        for mw, mh in self.misses:
+            if w >= mw and h >= mh:
+                return None
+        best = None
+        for x, y in self._candidates(w, h):
+            if x + w > self.region_w + 1e-9 or y + h > self.region_h + 1e-9:
+                continue
+            score = (y + h, x)
+            if best is not None and score >= best[0]:
+                continue
+            if self.grid.collides(x, y, x + w, y + h):
+                continue
+            best = (score, x, y)
+        if best is None:
+            self.misses = [(mw, mh) for mw, mh in self.misses if mw < w or mh < h]
+            self.misses.append((w, h))
+        return best
+
+    def occupy(self, x, y, w, h):
+        self.grid.insert(x, y, x + w, y + h)
+        self.corners.append((x + w, y))
+        self.corners.append((x, y + h))
+
+        # Raise the skyline over [x, x + w) to at least y + h
+        top = y + h
+        new = []
+        for sx, sy, sl in self.skyline:
+            ex = sx + sl
+            if ex <= x or sx >= x + w or sy >= top:
+                new.append([sx, sy, sl])
+                continue
+            if sx < x:
+                new.append([sx, sy, x - sx])
+            new.append([max(sx, x), top, min(ex, x + w) - max(sx, x)])
+            if ex > x + w:
+                new.append([x + w, sy, ex - (x + w)])
+        # Merge neighbouring steps at the same height
+        merged = []
+        for step in new:
+            if merged and merged[-1][1] == step[1] and abs(merged[-1][0] + merged[-1][2] - step[0]) < 1e-9:
+                merged[-1][2] += step[2]
+            else:
+                merged.append(step)
+        self.skyline = merged
+
+# =========================
+# Placement geometry
+# =========================
+def _place(part, sheet, x, y, rotated):
+    """Transforms the part outline into sheet coordinates."""
+    pts = part.points
+    if rotated:
+        # 90 degrees: (x, y) -> (-y, x)
+        pts = np.stack((-pts[:, 1], pts[:, 0]), axis=1)
+    lo = pts.min(axis=0)
+    ox = sheet.margin + x - lo[0]
+    oy = sheet.margin + y - lo[1]
+    placed = pts + np.array([ox, oy])
+    return SimpleNamespace(
+        part=part,
+        id=part.id,
+        box=part.box,
+        panel=part.panel,
+        sheet=sheet.index,
+        x=sheet.margin + x,
+        y=sheet.margin + y,
+        w=part.h if rotated else part.w,
+        h=part.w if rotated else part.h,
+        rotated=rotated,
+        # translate/rotate that maps the original (centred) outline onto the sheet
+        transform=f"translate({float(ox)}, {float(oy)})" + (" rotate(90)" if rotated else ""),
+        offset=(float(ox), float(oy)),
+        points=placed,
+    )
+
+def placed_paths(placement, paths):
+    """Polylines drawn in the part's own (centred) frame, moved onto the sheet like the outline."""
+    offset = np.array(placement.offset)
+    for path in paths:
+        pts = np.asarray(path, dtype=float)
+        if placement.rotated:
+            pts = np.stack((-pts[:, 1], pts[:, 0]), axis=1)
+        yield pts + offset
+
+def material_groups(parts):
+    """
+    Parts split by (material, thickness), in order of first appearance.
+    Returns a list of ((material, thickness), parts).
+    """
+    groups = {}
+    for part in parts:
+        key = (getattr(part, "material", None), getattr(part, "thickness", None))
+        groups.setdefault(key, []).append(part)
+    return list(groups.items())
+
+def nest_parts(parts, sheet_w, sheet_h, spacing=3.0, margin=5.0, allow_rotate=True, max_sheets=None,
+               turned=None):
+    """
+    Packs parts onto as many sheet_w x sheet_h sheets as needed (up to
+    max_sheets in all). Each (material, thickness) group gets sheets of its
+    own, numbered on from the previous group's; every sheet carries the
+    material and thickness it is cut from.
+    Within a group parts are taken largest first; each goes on the first
+    open sheet that has room, using the lowest (then left-most) position found.
+    turned: optional {part id: bool} pinning those parts to one orientation
+    (True = turned 90 degrees) instead of taking whichever sits lower.
+    Returns SimpleNamespace(sheets, unplaced, utilisation).
+    """
+    if sheet_w <= 2 * margin or sheet_h <= 2 * margin:
+        raise ValueError("sheet must be larger than twice the margin")
+    if spacing < 0:
+        raise ValueError("spacing must be >= 0")
+
+    sheets = []
+    unplaced = []
+    for (material, thickness), group in material_groups(parts):
+        limit = None if max_sheets is None else max_sheets - len(sheets)
+        packed, left = _pack_group(group, sheet_w, sheet_h, spacing, margin, allow_rotate, limit, len(sheets),
+                                   turned or {})
+        for sheet in packed:
+            sheet.material = material
+            sheet.thickness = thickness
+        sheets.extend(packed)
+        unplaced.extend(left)
+
+    results = [_sheet_result(s) for s in sheets]
+    used_area = sum(r.part_area for r in results)
+    total_area = sheet_w * sheet_h * len(results)
+    return SimpleNamespace(
+        sheets=results,
+        unplaced=unplaced,
+        utilisation=(used_area / total_area) if total_area else 0.0,
+    )
+
+def _pack_group(parts, sheet_w, sheet_h, spacing, margin, allow_rotate, max_sheets, first_index, turned):
+    """Skyline packing of parts that may share sheets; returns (sheets, unplaced)."""
+    order = sorted(parts, key=lambda p: (max(p.w, p.h), p.w * p.h), reverse=True)
+    dims = [max(p.w, p.h) for p in parts] or [100.0]
+    cell = max(10.0, float(np.median(dims)) / 2)
+
+    # smallest[k]: a square every part from order[k] on covers in any orientation
+    smallest = [0.0] * (len(order) + 1)
+    smallest[-1] = math.inf
+    for k in range(len(order) - 1, -1, -1):
+        smallest[k] = min(smallest[k + 1], min(order[k].w, order[k].h) + spacing)
+
+    sheets = []
+    open_sheets = []  # sheets that may still take a remaining part, in sheet order
+    unplaced = []
+    for k, part in enumerate(order):
+        orients = [(part.w + spacing, part.h + spacing, False)]
+        if allow_rotate and abs(part.w - part.h) > 1e-9:
+            orients.append((part.h + spacing, part.w + spacing, True))
+        if part.id in turned:
+            orients = [o for o in orients if o[2] == turned[part.id]]
+
+        target = None
+        for sheet in open_sheets:
+            if _try_sheet(sheet, part, orients):
+                target = sheet
+                break
+
+        if target is None and (max_sheets is None or len(sheets) < max_sheets):
+            sheet = _Sheet(first_index + len(sheets), sheet_w, sheet_h, margin, spacing, cell)
+            if _try_sheet(sheet, part, orients):
+                sheets.append(sheet)
+                open_sheets.append(sheet)
+                target = sheet
+
+        if target is None:
+            unplaced.append(part)
+        elif target.find(smallest[k + 1], smallest[k + 1]) is None:
+            # Free space only shrinks, and whatever fits somewhere a smaller
+            # rectangle fits too, so no later part can go on this sheet
+            open_sheets.remove(target)
+    return sheets, unplaced
+
+def _try_sheet(sheet, part, orients):
+    best = None
+    for w, h, rotated in orients:
+        found = sheet.find(w, h)
+        if found is not None and (best is None or found[0] < best[0]):
+            best = (found[0], found[1], found[2], w, h, rotated)
+    if best is None:
+        return False
+    _score, x, y, w, h, rotated = best
+    sheet.occupy(x, y, w, h)
+    sheet.placements.append(_place(part, sheet, x, y, rotated))
+    return True
+
+def _sheet_result(sheet):
+    part_area = sum(p.part.area for p in sheet.placements)
+    return SimpleNamespace(
+        index=sheet.index,
+        width=sheet.width,
+        height=sheet.height,
+        material=sheet.material,
+        thickness=sheet.thickness,
+        placements=sheet.placements,
+        part_area=part_area,
+        utilisation=part_area / (sheet.width * sheet.height),
+    )
+
+# =========================
+# Output
+# =========================
+def _ordered_paths(paths):
+    """Common-line polylines in cut order (closed ones rotated to their start)."""
+    contours = []
+    for i, path in enumerate(paths):
+        closed = len(path) > 2 and path[0] == path[-1]
+        pts = path[:-1] if closed else path
+        contours.append(cut_order.make_contour(i, pts, closed=closed))
+    result = cut_order.optimise_cut_order(contours)
+    ordered = []
+    for item in result.order:
+        pts = item.points.tolist()
+        if contours[item.index].closed:
+            pts.append(pts[0])
+        ordered.append(pts)
+    return ordered, result
+
+def _write_engraving(file, placements, art, text, layout, svg_path, image_mode):
+    """Art/text of one box on whichever placed panels they target, moved and turned with the panel."""
+    for p in placements:
+        on_art = art is not None and art.target == p.panel
+        on_text = text is not None and text.target == p.panel
+        if not (on_art or on_text):
+            continue
+        # The panel's own frame: outline centred on (0, 0), same as generate_panel
+        local = SimpleNamespace(centers={p.panel: (0.0, 0.0)}, sizes={p.panel: layout.sizes[p.panel]})
+        file.write(f'  <g transform="{p.transform}">\n')
+        if on_art:
+            lcf.write_art_block(file, art, local, svg_path, image_mode)
+        if on_text:
+            lcf.write_text_block(file, text, local)
+        file.write('  </g>\n')
+
+def write_sheet_svg(path, sheet, stroke_width=lcf.stroke_width, common_lines=False, optimise_order=False,
+                    validate=True, outline_format="polygon", precision=lcf.path_precision, expand_instances=False,
+                    art=None, text=None, layout=None, image_mode="embed"):
+    """
+    One sheet of cut lines, same conventions as write_box_svg (mm, red = cut).
+    common_lines=True cuts shared edges of touching parts once (see common_line.py).
+    optimise_order=True writes contours in the order that minimises rapid
+    travel (see cut_order.py).
+    validate=True refuses (ValueError) to write overlapping parts (polygon_check.py).
+    outline_format="path" writes each part as a compact <path> in sheet
+    coordinates (lcf.points_to_path_d) instead of a transformed <polygon>.
+    Identical parts are written once as a <symbol> and placed with <use>
+    (see lcf.outline_symbols); expand_instances=True writes each one in full.
+    art/text (as for write_box_svg, with the box's layout for the panel
+    sizes) are engraved on the part whose panel they target; meant for the
+    panels of a single box (see tiling.py).
+    Returns SimpleNamespace(merged, order) with the results of those passes (or None).
+    """
+    lcf.check_svg_options(image_mode, outline_format, precision)
+    if (art is not None or text is not None) and layout is None:
+        raise ValueError("art/text on a sheet need the box layout for the panel sizes")
+    precision = int(precision)
+    if validate:
+        polygon_check.require_valid(polygon_check.check_sheet(sheet), os.path.basename(path))
+    view_w = sheet.width
+    view_h = sheet.height
+    merged = None
+    order = None
+    file = profiling.wrap_file(open(path, "w", encoding="utf-8"))
+    file.write('<?xml version="1.0" encoding="UTF-8" ?>\n')
+    file.write('<svg xmlns="http://www.w3.org/2000/svg" version="1.1" ')
+    file.write('xmlns:xlink="http://www.w3.org/1999/xlink" ')
+    file.write(f'viewBox="0 0 {view_w} {view_h}" width="{view_w}mm" height="{view_h}mm">\n')
+    if common_lines:
+        file.write(f'  <g stroke="red" stroke-width="{stroke_width}" fill="none">\n')
+        merged = common_line.merge_common_lines([p.points for p in sheet.placements])
+        paths = merged.paths
+        if optimise_order:
+            paths, order = _ordered_paths(paths)
+        file.write(f'    <path d="{common_line.paths_to_svg_d(paths)}" />\n')
+    else:
+        # (placement, index of the vertex the cut starts at)
+        placements = [(p, 0) for p in sheet.placements]
+        if optimise_order:
+            contours = [cut_order.make_contour(i, p.points) for i, p in enumerate(sheet.placements)]
+            order = cut_order.optimise_cut_order(contours)
+            placements = [(sheet.placements[item.index], item.start) for item in order.order]
+        if not expand_instances:
+            symbol_ids, symbols = lcf.outline_symbols([np.roll(p.part.points, -start, axis=0)
+                                                       for p, start in placements])
+            file.write('  <defs>\n')
+            boxes = {sid: lcf.write_symbol(file, sid, pts, outline_format, precision)
+                     for sid, pts in symbols.items()}
+            file.write('  </defs>\n')
+        file.write(f'  <g stroke="red" stroke-width="{stroke_width}" fill="none">\n')
+        for i, (p, start) in enumerate(placements):
+            if not expand_instances:
+                sid = symbol_ids[i]
+                file.write(f'    {lcf.use_tag(sid, boxes[sid], p.transform)}\n')
+                continue
+            if outline_format == "path":
+                # p.points is the outline already turned and moved onto the sheet
+                file.write(f'    <path d="{lcf.points_to_path_d(np.roll(p.points, -start, axis=0), precision)}" />\n')
+                continue
+            pts = np.roll(p.part.points, -start, axis=0)
+            file.write(f'    <g transform="{p.transform}">\n')
+            file.write(f'      <polygon points="{lcf.points_to_polyline(pts.tolist())}" />\n')
+            file.write('    </g>\n')
+    file.write('  </g>\n')
+    if art is not None or text is not None:
+        _write_engraving(file, sheet.placements, art, text, layout, path, image_mode)
+    file.write('</svg>\n')
+    file.close()
+    return SimpleNamespace(merged=merged, order=order)
+
+def print_nesting_report(result):
+    print("=" * 60)
+    print("NESTING SUMMARY:")
+    print("=" * 60)
+    for s in result.sheets:
+        print(f"  Sheet {s.index + 1}: {len(s.placements):3d} parts, "
+              f"utilisation {s.utilisation * 100:5.1f}%  {sheet_label(s)}")
+    print("-" * 60)
+    print(f"  Sheets used:         {len(result.sheets)}")
+    print(f"  Overall utilisation: {result.utilisation * 100:.1f}%")
+    if result.unplaced:
+        print(f"  Did not fit a sheet: {', '.join(p.id for p in result.unplaced)}")
+    print("=" * 60)
+
+def parse_sheet_size(text):
+    """'600x400' -> (600.0, 400.0)"""
+    try:
+        w, h = text.lower().split("x")
+        return float(w), float(h)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"sheet size must look like 600x400, got {text!r}")
+
+def main(argv=None):
+    import box_batch
+
+    parser = argparse.ArgumentParser(description="Nest the panels of every box in a manifest onto stock sheets.")
+    parser.add_argument("manifest", help="CSV or JSON box manifest (see box_batch.py)")
+    parser.add_argument("--sheet", type=parse_sheet_size, default=(600.0, 400.0), help="bed size in mm, e.g. 600x400")
+    parser.add_argument("--spacing", type=float, default=3.0, help="gap between parts (mm)")
+    parser.add_argument("--margin", type=float, default=5.0, help="clear border around the sheet (mm)")
+    parser.add_argument("--no-rotate", action="store_true", help="do not turn parts by 90 degrees")
+    parser.add_argument("--max-sheets", type=int, default=None)
+    parser.add_argument("--common-line", action="store_true",
+                        help="cut edges shared by touching parts only once (use with --spacing 0)")
+    parser.add_argument("--optimise-order", action="store_true", help="order contours to minimise laser head travel")
+    parser.add_argument("--compact", action="store_true", help="write outlines as compact relative <path> data")
+    parser.add_argument("--precision", type=int, default=lcf.path_precision,
+                        choices=range(lcf.MAX_PATH_PRECISION + 1), help="decimals kept with --compact")
+    parser.add_argument("--expand-instances", action="store_true",
+                        help="write every part in full instead of <symbol>/<use> (for cutters without <use>)")
+    parser.add_argument("--out", default="nested", help="output directory for sheet SVGs")
+    args = parser.parse_args(argv)
+
+    try:
+        specs = box_batch.load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"Could not read manifest: {e}")
+        return 1
+    parts = manifest_parts(specs, cache=panel_cache.PanelCache())
+
+    sheet_w, sheet_h = args.sheet
+    result = nest_parts(parts, sheet_w, sheet_h, spacing=args.spacing, margin=args.margin,
+                        allow_rotate=not args.no_rotate, max_sheets=args.max_sheets)
+
+    os.makedirs(args.out, exist_ok=True)
+    for s in result.sheets:
+        path = os.path.join(args.out, f"sheet_{s.index + 1:03d}.svg")
+        passes = write_sheet_svg(path, s, common_lines=args.common_line, optimise_order=args.optimise_order,
+                                 outline_format="path" if args.compact else "polygon", precision=args.precision,
+                                 expand_instances=args.expand_instances)
+        if passes.merged is not None or passes.order is not None:
+            print(f"Sheet {s.index + 1} ({sheet_label(s)}):")
+        if passes.merged is not None:
+            common_line.print_common_line_report(passes.merged)
+        if passes.order is not None:
+            cut_order.print_cut_order_report(passes.order)
+    print_nesting_report(result)
+    print(f"\nWrote {len(result.sheets)} sheet(s) to {args.out}")
+    return 0 if not result.unplaced else 2
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,414 @@
+#Vihaan Shah
+#UNI: vvs2119
+#MECE4606 Digital Manufacturing
+#Laser Cutting Project - GEOMETRY CHECK
+#
+# Catches bad geometry before it is written: panels whose outline crosses
+# itself (tabs overrunning the corners when the face is small or tab_width
+# is large) and parts that overlap each other on the layout or sheet.
+#
+# Segment intersections come from a sweep line over x:
+#   - horizontal edges enter the active set at their left end and leave at
+#     their right end; each vertical edge at x lists the active ones with y
+#     in its range. The set holds the horizontals' y ranks. Up to
+#     RANK_TREE_MIN horizontals it is a sorted list (bisect.insort): the
+#     insert shifts the list, so O(n^2 + k) in the worst case, but that
+#     shift is a memmove and beats anything written in Python until tens
+#     of thousands of edges are active at once. Above it the set is a
+#     Fenwick tree, O((n + k) log n).
+#   - collinear horizontal/vertical edges on the same line are checked by
+#     sorting them along that line.
+#   - any diagonal edge (none today, but kerf/lids may add some) is checked
+#     against the edges whose x-range it overlaps (sweep and prune).
+# Each contact is classified as "touch" (at an end point), "cross" (interior
+# of both edges) or "overlap" (collinear with shared length).
+#
+# Parts may touch (common-line cutting packs them edge to edge), so only
+# crossings and one part lying inside another count as an overlap.
+
+import bisect
+import math
+from types import SimpleNamespace
+
+import numpy as np
+
+EPS = 1e-9
+
+# Horizontal edges from which the sweep keeps its active set in a Fenwick
+# tree instead of a sorted list (where the list's O(n) inserts start to show)
+RANK_TREE_MIN = 20000
+
+# =========================
+# Segments
+# =========================
+def outline_segments(points):
+    """
+    (N, 4) x0, y0, x1, y1 edges of a closed outline with repeated points
+    dropped, so edge i and edge i + 1 (mod N) are neighbours.
+    """
+    pts = np.asarray(points, dtype=float).reshape(-1, 2)
+    keep = np.any(pts != np.roll(pts, 1, axis=0), axis=1)
+    if not keep.any():
+        return np.zeros((0, 4))
+    pts = pts[keep]
+    return np.hstack((pts, np.roll(pts, -1, axis=0)))
+
+def _classify(s, t):
+    """Contact between two segments: None, or (kind, x, y)."""
+    ax, ay, bx, by = s
+    cx, cy, dx, dy = t
+    rx, ry = bx - ax, by - ay
+    qx, qy = dx - cx, dy - cy
+    denom = rx * qy - ry * qx
+    wx, wy = cx - ax, cy - ay
+    if abs(denom) < EPS:
+        if abs(wx * ry - wy * rx) > EPS:
+            return None  # parallel, different lines
+        # Collinear: project onto s
+        rr = rx * rx + ry * ry
+        t0 = (wx * rx + wy * ry) / rr
+        t1 = ((dx - ax) * rx + (dy - ay) * ry) / rr
+        lo = max(0.0, min(t0, t1))
+        hi = min(1.0, max(t0, t1))
+        if hi < lo - EPS:
+            return None
+        kind = "overlap" if (hi - lo) * math.sqrt(rr) > EPS else "touch"
+        return kind, ax + lo * rx, ay + lo * ry
+    u = (wx * qy - wy * qx) / denom
+    v = (wx * ry - wy * rx) / denom
+    if u < -EPS or u > 1 + EPS or v < -EPS or v > 1 + EPS:
+        return None
+    at_end = u < EPS or u > 1 - EPS or v < EPS or v > 1 - EPS
+    return ("touch" if at_end else "cross"), ax + u * rx, ay + u * ry
+
+def _span_contact(a0, a1, b0, b1):
+    """Contact of two intervals on one line: None, "touch" or "overlap"."""
+    lo = max(a0, b0)
+    hi = min(a1, b1)
+    if hi < lo - EPS:
+        return None, lo
+    return ("overlap" if hi - lo > EPS else "touch"), lo
+
+# =========================
+# Sweep
+# =========================
+class _RankList:
+    """Set of ranks as a sorted list; same interface as _RankTree."""
+
+    def __init__(self):
+        self.ranks = []
+
+    def add(self, rank):
+        bisect.insort(self.ranks, rank)
+
+    def remove(self, rank):
+        del self.ranks[bisect.bisect_left(self.ranks, rank)]
+
+    def members(self, lo, hi):
+        """Members with lo <= rank < hi, in rank order."""
+        ranks = self.ranks
+        return ranks[bisect.bisect_left(ranks, lo):bisect.bisect_left(ranks, hi)]
+
+class _RankTree:
+    """
+    Set of ranks 0..n-1 in a Fenwick tree: add/remove in O(log n), the
+    members of a rank range listed in O((k + 1) log n).
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self.tree = [0] * (n + 1)
+        self.top = 1 << (n.bit_length() - 1) if n else 0
+
+    def _update(self, rank, delta):
+        tree, n = self.tree, self.n
+        i = rank + 1
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+
+    def add(self, rank):
+        self._update(rank, 1)
+
+    def remove(self, rank):
+        self._update(rank, -1)
+
+    def _count_below(self, rank):
+        tree = self.tree
+        total = 0
+        i = rank
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _kth(self, k):
+        """Rank of the k-th member (from 0)."""
+        tree, n = self.tree, self.n
+        pos = 0
+        step = self.top
+        while step:
+            nxt = pos + step
+            if nxt <= n and tree[nxt] <= k:
+                pos = nxt
+                k -= tree[nxt]
+            step >>= 1
+        return pos
+
+    def members(self, lo, hi):
+        """Members with lo <= rank < hi, in rank order."""
+        return [self._kth(k) for k in range(self._count_below(lo), self._count_below(hi))]
+
+def find_contacts(segs):
+    """
+    All pairs of touching/crossing segments.
+    segs: (N, 4) array. Returns a list of (i, j, kind, x, y) with i < j.
+    """
+    segs = np.asarray(segs, dtype=float)
+    x0, y0, x1, y1 = segs.T
+    horiz = np.abs(y1 - y0) <= EPS
+    vert = (np.abs(x1 - x0) <= EPS) & ~horiz
+    diag = ~(horiz | vert)
+    out = []
+
+    def add(i, j, kind, x, y):
+        if i > j:
+            i, j = j, i
+        out.append((i, j, kind, float(x), float(y)))
+
+    # Horizontal vs vertical: x sweep, active horizontals kept by y rank
+    h_idx = np.flatnonzero(horiz)
+    v_idx = np.flatnonzero(vert)
+    hx0 = np.minimum(x0[h_idx], x1[h_idx])
+    hx1 = np.maximum(x0[h_idx], x1[h_idx])
+    # Event order at equal x: insert (0), query (1), remove (2) - so end points touch
+    ev_x = np.concatenate((hx0, x0[v_idx], hx1))
+    ev_type = np.concatenate((np.zeros(len(h_idx), int), np.ones(len(v_idx), int), np.full(len(h_idx), 2)))
+    ev_ref = np.concatenate((np.arange(len(h_idx)), v_idx, np.arange(len(h_idx))))
+    order = np.lexsort((ev_type, ev_x))
+
+    # Plain lists from here on: scalar indexing into NumPy arrays is slow
+    h_ids = h_idx.tolist()
+    hy = y0[h_idx].tolist()
+    hx0 = hx0.tolist()
+    hx1 = hx1.tolist()
+    sx0, sy0, sy1 = x0.tolist(), y0.tolist(), y1.tolist()
+    # y rank of each horizontal (stable, so equal y keeps the h position order)
+    by_rank = np.argsort(y0[h_idx], kind="stable")
+    rank_of = np.empty(len(h_idx), dtype=np.int64)
+    rank_of[by_rank] = np.arange(len(h_idx))
+    ranked_y = y0[h_idx][by_rank].tolist()
+    by_rank = by_rank.tolist()
+    rank_of = rank_of.tolist()
+    active = _RankTree(len(h_ids)) if len(h_ids) >= RANK_TREE_MIN else _RankList()
+    add_h, remove_h = active.add, active.remove
+    for kind, ref in zip(ev_type[order].tolist(), ev_ref[order].tolist()):
+        if kind == 0:
+            add_h(rank_of[ref])
+        elif kind == 2:
+            remove_h(rank_of[ref])
+        else:
+            ya, yb = sy0[ref], sy1[ref]
+            if ya > yb:
+                ya, yb = yb, ya
+            lo = bisect.bisect_left(ranked_y, ya - EPS)
+            hi = bisect.bisect_right(ranked_y, yb + EPS)
+            vx = sx0[ref]
+            for rank in active.members(lo, hi):
+                hp = by_rank[rank]
+                y = hy[hp]
+                end_h = abs(vx - hx0[hp]) <= EPS or abs(vx - hx1[hp]) <= EPS
+                end_v = abs(y - ya) <= EPS or abs(y - yb) <= EPS
+                add(h_ids[hp], ref, "touch" if (end_h or end_v) else "cross", vx, y)
+
+    # Collinear horizontals (same y) and verticals (same x)
+    for idx, line, a, b, horizontal in ((h_idx, y0, x0, x1, True), (v_idx, x0, y0, y1, False)):
+        if len(idx) < 2:
+            continue
+        lo = np.minimum(a[idx], b[idx])
+        hi = np.maximum(a[idx], b[idx])
+        key = np.round(line[idx] / EPS ** 0.5).astype(np.int64)  # group lines within ~3e-5 mm
+        order = np.lexsort((lo, key)).tolist()
+        ids, at_line = idx.tolist(), line[idx].tolist()
+        lo, hi, key = lo.tolist(), hi.tolist(), key.tolist()
+        run = []  # segments on the current line still reaching the sweep point
+        for p in order:
+            if run and key[run[0]] != key[p]:
+                run = []
+            run = [r for r in run if hi[r] >= lo[p] - EPS]
+            for r in run:
+                kind, at = _span_contact(lo[r], hi[r], lo[p], hi[p])
+                if kind:
+                    if horizontal:
+                        add(ids[r], ids[p], kind, at, at_line[p])
+                    else:
+                        add(ids[r], ids[p], kind, at_line[p], at)
+            run.append(p)
+
+    # Diagonals against everything whose x-range overlaps (sweep and prune)
+    d_idx = np.flatnonzero(diag)
+    if len(d_idx):
+        xmin = np.minimum(x0, x1)
+        xmax = np.maximum(x0, x1)
+        active = []
+        for i in np.argsort(xmin, kind="stable").tolist():
+            active = [j for j in active if xmax[j] >= xmin[i] - EPS]
+            for j in active:
+                if diag[i] or diag[j]:
+                    hit = _classify(segs[i], segs[j])
+                    if hit:
+                        add(i, j, *hit)
+            active.append(i)
+
+    return out
+
+# =========================
+# Checks
+# =========================
+def self_intersections(points):
+    """
+    Contacts between edges of one closed outline other than neighbouring
+    edges meeting at their shared corner. Returns a list of (x, y, kind).
+    """
+    segs = outline_segments(points)
+    n = len(segs)
+    bad = []
+    for i, j, kind, x, y in find_contacts(segs):
+        neighbours = j == i + 1 or (i == 0 and j == n - 1)
+        if neighbours and kind == "touch":
+            continue
+        bad.append((x, y, kind))
+    return bad
+
+def _bbox_pairs(boxes):
+    """Pairs of boxes (xmin, ymin, xmax, ymax) whose interiors overlap, by sweep and prune."""
+    order = sorted(range(len(boxes)), key=lambda k: boxes[k][0])
+    active = []
+    pairs = []
+    for i in order:
+        bx0, by0, bx1, by1 = boxes[i]
+        active = [j for j in active if boxes[j][2] > bx0 + EPS]
+        for j in active:
+            if boxes[j][1] < by1 - EPS and by0 < boxes[j][3] - EPS:
+                pairs.append((min(i, j), max(i, j)))
+        active.append(i)
+    return pairs
+
+def _strictly_inside(points, poly):
+    """Which points are inside poly and not on its boundary (even-odd rule)."""
+    px = poly[:, 0]
+    py = poly[:, 1]
+    nx = np.roll(px, -1)
+    ny = np.roll(py, -1)
+    x = points[:, :1]
+    y = points[:, 1:]
+    crosses = (py > y) != (ny > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_at = px + (y - py) * (nx - px) / (ny - py)
+    inside = np.count_nonzero(crosses & (x < x_at), axis=1) % 2 == 1
+
+    # Distance to every edge, so boundary points are not counted
+    ex = nx - px
+    ey = ny - py
+    ll = ex * ex + ey * ey
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.clip(((x - px) * ex + (y - py) * ey) / ll, 0.0, 1.0)
+    t = np.where(ll > 0, t, 0.0)
+    d2 = (px + t * ex - x) ** 2 + (py + t * ey - y) ** 2
+    on_edge = (d2 <= 1e-12).any(axis=1)
+    return inside & ~on_edge
+
+def part_overlaps(outlines, names=None):
+    """
+    outlines: closed outlines already placed in one coordinate system.
+    Returns a list of SimpleNamespace(a, b, kind, x, y): "cross" when edges
+    of two parts cross, "inside" when one part's edge points lie inside the
+    other with no crossing. Touching or shared edges are allowed.
+    """
+    names = names or list(range(len(outlines)))
+    problems = []
+    if not outlines:
+        return problems
+    pts = [np.asarray(o, dtype=float).reshape(-1, 2) for o in outlines]
+    segs = [outline_segments(p) for p in pts]
+    boxes = [(p[:, 0].min(), p[:, 1].min(), p[:, 0].max(), p[:, 1].max()) for p in pts]
+
+    # Crossing edges always means overlapping boxes, so only those parts are swept
+    pairs = _bbox_pairs(boxes)
+    involved = sorted({k for pair in pairs for k in pair})
+    seen = set()
+    if involved:
+        owner = np.repeat(involved, [len(segs[k]) for k in involved])
+        for i, j, kind, x, y in find_contacts(np.vstack([segs[k] for k in involved])):
+            a, b = int(owner[i]), int(owner[j])
+            if a != b and kind == "cross" and (min(a, b), max(a, b)) not in seen:
+                seen.add((min(a, b), max(a, b)))
+                problems.append(SimpleNamespace(a=names[a], b=names[b], kind="cross", x=x, y=y))
+
+    for a, b in pairs:
+        if (a, b) in seen:
+            continue
+        for inner, outer in ((a, b), (b, a)):
+            s = segs[inner]
+            probes = np.vstack((s[:, :2], (s[:, :2] + s[:, 2:]) / 2))
+            hit = _strictly_inside(probes, pts[outer])
+            if hit.any():
+                x, y = probes[int(np.argmax(hit))]
+                problems.append(SimpleNamespace(a=names[inner], b=names[outer], kind="inside", x=float(x), y=float(y)))
+                seen.add((a, b))
+                break
+    return problems
+
+# =========================
+# Box / sheet entry points
+# =========================
+def check_box(panels, layout, mt=None, kerf=0.0):
+    """
+    Self-intersections of every panel, panels outside the canvas and overlaps
+    between the panels as laid out by layout_box. Given mt, also panels
+    reaching more than mt (+ kerf / 2 for kerf-grown outlines) past their
+    face, which only a tab overrunning the panel can do. Returns a list of
+    human-readable problem strings.
+    """
+    problems = []
+    checked = {}  # opposite faces usually share one outline; check it once
+    for name, pts in panels.items():
+        key = np.asarray(pts, dtype=float).tobytes()
+        if key not in checked:
+            checked[key] = self_intersections(pts)
+        for x, y, kind in checked[key][:3]:
+            problems.append(f"{name} outline crosses itself ({kind}) at ({x:.3f}, {y:.3f})")
+    if mt is not None:
+        reach = mt + kerf / 2
+        for name, pts in panels.items():
+            pts = np.asarray(pts, dtype=float)
+            half = np.asarray(layout.sizes[name], dtype=float) / 2 + reach
+            over = np.abs(pts) - half
+            if (over > 1e-6).any():
+                x, y = pts[int(np.argmax(over.max(axis=1)))]
+                problems.append(f"{name} outline reaches past its face + {reach:g} mm at ({x:.3f}, {y:.3f})")
+    names = list(panels)
+    placed = [np.asarray(panels[n], dtype=float) + np.asarray(layout.centers[n]) for n in names]
+    for name, pts in zip(names, placed):
+        lo = pts.min(axis=0)
+        hi = pts.max(axis=0)
+        if lo[0] < -EPS or lo[1] < -EPS or hi[0] > layout.view_w + EPS or hi[1] > layout.view_h + EPS:
+            problems.append(f"{name} extends outside the {layout.view_w:g} x {layout.view_h:g} mm canvas")
+    for p in part_overlaps(placed, names):
+        problems.append(f"{p.a} and {p.b} overlap ({p.kind}) at ({p.x:.3f}, {p.y:.3f})")
+    return problems
+
+def check_sheet(sheet):
+    """Overlaps between the parts nested on one sheet (see nesting.py)."""
+    placements = sheet.placements
+    problems = []
+    for p in part_overlaps([pl.points for pl in placements], [pl.id for pl in placements]):
+        problems.append(f"{p.a} and {p.b} overlap ({p.kind}) at ({p.x:.3f}, {p.y:.3f})")
+    return problems
+
+def require_valid(problems, what):
+    """Raises ValueError listing the first few problems, if any."""
+    if problems:
+        shown = "; ".join(problems[:5])
+        more = f" (+{len(problems) - 5} more)" if len(problems) > 5 else ""
+        raise ValueError(f"{what}: invalid geometry: {shown}{more}")
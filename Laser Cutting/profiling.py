@@ -0,0 +1,277 @@
+#Vihaan Shah
+#UNI: vvs2119
+#MECE4606 Digital Manufacturing
+#Laser Cutting Project - STAGE PROFILING
+#
+# Where does the time go in a big run? The pipeline stages are wrapped in
+# timers that count calls, nanoseconds and bytes:
+#   input_parsing       prompts, manifests and project files
+#   generate_panel      lcf.generate_panel_array
+#   points_to_polyline  outline -> "x,y x,y ..." strings for <polygon>
+#   points_to_path_d    outline -> compact relative <path> data
+#   base64              PNG encoding for embedded art
+#   file_write          every write() into an output SVG / DXF / G-code file
+#
+# Off unless the LASER_PROFILE environment variable is set. When it is off
+# the decorators hand back the undecorated function, stage() hands back one
+# shared do-nothing object and wrap_file() the file itself, so nothing is
+# timed or counted. When it is on, a JSON report is written at exit:
+#   LASER_PROFILE=1               laser_profile_<time>_<pid>.json here
+#   LASER_PROFILE=profiles/       the same name inside that directory
+#   LASER_PROFILE=run.json        exactly that file
+#
+# Times are inclusive (a stage inside another counts in both). Pool workers
+# exit without running atexit, so box_batch and box_service workers hand
+# their counters back with each result (take_stages) and the parent adds
+# them to its own (merge_stages); the report then covers every process.
+# Byte counts for text files are characters written, which is bytes for the
+# ASCII that SVG, DXF and G-code are made of.
+#
+# Usage:
+#   LASER_PROFILE=1 python box_batch.py boxes.csv --processes 4
+#   python profiling.py laser_profile_20261018-101500_4242.json
+
+import argparse
+import atexit
+import functools
+import json
+import os
+import sys
+import time
+
+ENV_VAR = "LASER_PROFILE"
+REPORT_VERSION = 1
+
+def _setting():
+    value = os.environ.get(ENV_VAR, "").strip()
+    return "" if value.lower() in ("0", "false", "no", "off") else value
+
+_SETTING = _setting()
+ENABLED = bool(_SETTING)
+
+# name -> [calls, total_ns, max_ns, bytes]
+_stages = {}
+_started = time.time()
+_started_ns = time.perf_counter_ns()
+
+def _record(name, elapsed_ns, nbytes=0):
+    entry = _stages.get(name)
+    if entry is None:
+        _stages[name] = [1, elapsed_ns, elapsed_ns, nbytes]
+        return
+    entry[0] += 1
+    entry[1] += elapsed_ns
+    if elapsed_ns > entry[2]:
+        entry[2] = elapsed_ns
+    entry[3] += nbytes
+
+def reset():
+    """Clears the counters; a forked pool worker starts with a copy of its parent's."""
+    _stages.clear()
+
+def take_stages():
+    """
+    This process's counters, which are then cleared. A pool worker sends
+    them back with its result so they are not lost when it exits.
+    """
+    stages = {name: list(entry) for name, entry in _stages.items()}
+    _stages.clear()
+    return stages
+
+def merge_stages(stages):
+    """Adds counters from take_stages() (another process's) to this one's."""
+    for name, (calls, total_ns, max_ns, nbytes) in stages.items():
+        entry = _stages.get(name)
+        if entry is None:
+            _stages[name] = [calls, total_ns, max_ns, nbytes]
+            continue
+        entry[0] += calls
+        entry[1] += total_ns
+        if max_ns > entry[2]:
+            entry[2] = max_ns
+        entry[3] += nbytes
+
+# =========================
+# Hooks
+# =========================
+class _Stage:
+    __slots__ = ("name", "nbytes", "_t0")
+
+    def __init__(self, name):
+        self.name = name
+        self.nbytes = 0
+
+    def __enter__(self):
+        self._t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        _record(self.name, time.perf_counter_ns() - self._t0, self.nbytes)
+        return False
+
+    def add_bytes(self, n):
+        self.nbytes += n
+
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add_bytes(self, n):
+        pass
+
+_NO_STAGE = _NoStage()
+
+def stage(name):
+    """
+    with stage("base64") as s: ... s.add_bytes(n)
+    Times the block as one call of the named stage.
+    """
+    return _Stage(name) if ENABLED else _NO_STAGE
+
+def timed(name, size=None):
+    """
+    Decorator timing every call as the named stage. size(result) gives the
+    bytes to count for a call (e.g. size=len for a function returning a
+    string). Disabled: the function is returned as it is.
+    """
+    def decorate(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter_ns()
+            result = func(*args, **kwargs)
+            _record(name, time.perf_counter_ns() - t0, size(result) if size is not None else 0)
+            return result
+        return wrapper
+    return decorate
+
+class _TimedFile:
+    """File proxy timing write() and counting what goes through it."""
+    __slots__ = ("_file", "_name")
+
+    def __init__(self, file, name):
+        self._file = file
+        self._name = name
+
+    def write(self, data):
+        t0 = time.perf_counter_ns()
+        n = self._file.write(data)
+        _record(self._name, time.perf_counter_ns() - t0, len(data))
+        return n
+
+    def __getattr__(self, attr):
+        return getattr(self._file, attr)
+
+    def __enter__(self):
+        self._file.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._file.__exit__(*exc)
+
+def wrap_file(file, name="file_write"):
+    """The open file, with its writes timed as the named stage when enabled."""
+    return _TimedFile(file, name) if ENABLED else file
+
+# =========================
+# Report
+# =========================
+def report():
+    """
+    This process's counters (and any merged from pool workers) as a
+    JSON-ready dict, stages by total time. wall_ns and share count from
+    when profiling was first imported, so with several workers a stage's
+    share can go over 100%.
+    """
+    wall_ns = time.perf_counter_ns() - _started_ns
+    stages = []
+    for name, (calls, total_ns, max_ns, nbytes) in _stages.items():
+        stages.append({
+            "stage": name,
+            "calls": calls,
+            "total_ns": total_ns,
+            "mean_ns": total_ns // calls,
+            "max_ns": max_ns,
+            "bytes": nbytes,
+            "share": total_ns / wall_ns if wall_ns else 0.0,
+        })
+    stages.sort(key=lambda s: s["total_ns"], reverse=True)
+    return {
+        "version": REPORT_VERSION,
+        "run_id": f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(_started))}_{os.getpid()}",
+        "script": os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else "",
+        "argv": sys.argv[1:],
+        "pid": os.getpid(),
+        "started": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(_started)),
+        "wall_ns": wall_ns,
+        "stages": stages,
+    }
+
+def report_path(setting=None):
+    """Where LASER_PROFILE says the report goes (see the top of the file)."""
+    setting = _SETTING if setting is None else setting
+    name = f"laser_profile_{time.strftime('%Y%m%d-%H%M%S', time.localtime(_started))}_{os.getpid()}.json"
+    if setting.lower().endswith(".json"):
+        return setting
+    if setting.lower() in ("1", "true", "yes", "on"):
+        return name
+    return os.path.join(setting, name)
+
+def write_report(path=None):
+    """Writes report() as JSON; returns the path, or None if nothing was timed."""
+    if not _stages:
+        return None
+    path = path or report_path()
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report(), f, indent=2)
+    return path
+
+def _write_at_exit():
+    try:
+        write_report()
+    except OSError as e:
+        print(f"Could not write the profile report: {e}", file=sys.stderr)
+
+if ENABLED:
+    atexit.register(_write_at_exit)
+
+def print_profile_report(data):
+    print("=" * 60)
+    print(f"PROFILE: {data['script'] or '?'} ({data['run_id']})")
+    print("=" * 60)
+    print(f"  {'stage':<20} {'calls':>8} {'total ms':>10} {'mean us':>10} {'MB':>8} {'share':>7}")
+    print("-" * 60)
+    for s in data["stages"]:
+        print(f"  {s['stage']:<20} {s['calls']:>8} {s['total_ns'] / 1e6:>10.2f} {s['mean_ns'] / 1e3:>10.1f} "
+              f"{s['bytes'] / 1e6:>8.2f} {s['share'] * 100:>6.1f}%")
+    print("-" * 60)
+    print(f"  Wall time: {data['wall_ns'] / 1e6:.1f} ms")
+    print("=" * 60)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print profile reports written with LASER_PROFILE set.")
+    parser.add_argument("reports", nargs="+", help="laser_profile_*.json files")
+    args = parser.parse_args(argv)
+
+    for path in args.reports:
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"{path}: {e}")
+            return 1
+        print_profile_report(data)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
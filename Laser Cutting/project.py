@@ -0,0 +1,431 @@
+#Vihaan Shah
+#UNI: vvs2119
+#MECE4606 Digital Manufacturing
+#Laser Cutting Project - PROJECT FILE / INCREMENTAL REBUILD
+#
+# A project file (JSON) keeps the answers to the laser_cutting_fixed.py
+# prompts, so a box can be edited and rebuilt without typing them again.
+# It also records how the last output was built: for every block of the
+# SVG (header, cut lines, image, text) a key hashing that block's inputs and
+# the byte range it occupies in the file, plus a content hash per panel.
+#
+# A rebuild only re-renders the blocks whose key changed and copies the
+# others byte for byte out of the previous file. Changing the text leaves
+# the panel geometry, the outline check and a large base64 image alone;
+# moving the image re-encodes the image only. If the SVG on disk is not the
+# one the project file describes (size or mtime differ) everything is
+# rebuilt.
+#
+# Usage:
+#   python project.py gcode_file.project.json --prompt        (the laser_cutting_fixed.py questions)
+#   python project.py box.json --length 150 --width 200 --height 120 --text HELLO --text-target FRONT
+#   python project.py box.json --text WORLD                    (text block only)
+#   python project.py box.json --art logo.png --art-target TOP (image block only)
+#   python project.py box.json --no-text --full
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import stat
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+import laser_cutting_fixed as lcf
+import polygon_check
+import profiling
+
+PROJECT_VERSION = 1
+STAGES = ("header", "cut", "art", "text", "footer")
+COPY_CHUNK = 1024 * 1024
+
+def new_project(length, width, height, output="gcode_file.svg", mt=lcf.mt, tw=lcf.tw):
+    """Project dict for a plain box; art/text/options can be filled in afterwards."""
+    return {
+        "version": PROJECT_VERSION,
+        "inputs": {
+            "length": float(length),
+            "width": float(width),
+            "height": float(height),
+            "material_thickness": float(mt),
+            "tab_width": float(tw),
+            "art": None,                # {"path", "target"}
+            "text": None,               # {"content", "target", "font_size" (None = auto)}
+            "output": output,
+            "optimise_order": False,
+            "image_mode": "embed",
+            "outline_format": "polygon",
+            "precision": lcf.path_precision,
+            "expand_instances": False,
+        },
+        "built": None,
+    }
+
+@profiling.timed("input_parsing")
+def load_project(path):
+    with open(path, encoding="utf-8") as f:
+        project = json.load(f)
+    if project.get("version") != PROJECT_VERSION or "inputs" not in project:
+        raise ValueError(f"{path}: not a version {PROJECT_VERSION} project file")
+    return project
+
+def _replace(tmp, path):
+    """
+    os.replace(tmp, path), giving tmp the mode of the file it replaces, or
+    what open() would have given a new file (mkstemp makes it 0600).
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    os.chmod(tmp, mode)
+    os.replace(tmp, path)
+
+def save_project(project, path):
+    # Same temp-and-rename as the output, so a crash never leaves half a project
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(project, f, indent=2)
+        f.write("\n")
+    _replace(tmp, path)
+
+def output_path(project, project_path=None):
+    """The output path is stored relative to the project file."""
+    out = project["inputs"]["output"]
+    if project_path is None or os.path.isabs(out):
+        return out
+    return os.path.join(os.path.dirname(os.path.abspath(project_path)), out)
+
+# =========================
+# Stage keys
+# =========================
+def _key(*parts):
+    return hashlib.blake2b(json.dumps(parts, sort_keys=True).encode("utf-8"), digest_size=12).hexdigest()
+
+def file_hash(path, known=None):
+    """
+    blake2b of a file's bytes. known is the previous {"size", "mtime_ns", "hash"}
+    record; when size and mtime still match it is returned without rereading.
+    """
+    st = os.stat(path)
+    if known and known.get("size") == st.st_size and known.get("mtime_ns") == st.st_mtime_ns:
+        return known
+    h = hashlib.blake2b(digest_size=12)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(COPY_CHUNK), b""):
+            h.update(chunk)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "hash": h.hexdigest()}
+
+def panel_hashes(panels):
+    return {name: hashlib.blake2b(np.asarray(pts, dtype=float).tobytes(), digest_size=8).hexdigest()
+            for name, pts in panels.items()}
+
+def stage_keys(inputs, layout, svg_path, art_file=None):
+    """Key per SVG block; a block is reused when its key matches the last build."""
+    geometry = _key(inputs["width"], inputs["height"], inputs["length"],
+                    inputs["material_thickness"], inputs["tab_width"], lcf.cl, lcf.cr)
+    keys = {
+        "geometry": geometry,
+        "header": _key(layout.view_w, layout.view_h),
+        "cut": _key(geometry, inputs["optimise_order"], inputs["outline_format"], inputs["precision"],
+                    inputs["expand_instances"]),
+        "art": None,
+        "text": None,
+        "footer": _key(lcf.SVG_FOOTER),
+    }
+    art = inputs["art"]
+    if art is not None:
+        target = art["target"]
+        link = None
+        if inputs["image_mode"] == "link":
+            # The href is relative to the SVG, so moving either changes the block
+            link = os.path.relpath(os.path.abspath(art["path"]), os.path.dirname(os.path.abspath(svg_path)))
+        keys["art"] = _key(art_file["hash"], target, layout.centers[target], layout.sizes[target],
+                           inputs["image_mode"], link, lcf.art_margin)
+    text = inputs["text"]
+    if text is not None:
+        target = text["target"]
+        keys["text"] = _key(text["content"], target, text["font_size"], layout.centers[target],
+                            layout.sizes[target])
+    return keys
+
+# =========================
+# Build
+# =========================
+def resolve_inputs(inputs):
+    """Validated inputs -> (layout, art, text) in the shapes write_box_svg takes."""
+    lcf.validate_box_dimensions(inputs["length"], inputs["width"], inputs["height"])
+    lcf.check_svg_options(inputs["image_mode"], inputs["outline_format"], inputs["precision"])
+    layout = lcf.layout_box(inputs["width"], inputs["height"], inputs["length"], mt=inputs["material_thickness"])
+
+    art = None
+    if inputs["art"] is not None:
+        if inputs["art"]["target"] not in lcf.PANEL_NAMES:
+            raise ValueError(f"unknown art target {inputs['art']['target']!r}")
+        art = lcf.load_art(inputs["art"]["path"], inputs["art"]["target"])
+        if art is None:
+            raise ValueError(f"could not read PNG {inputs['art']['path']!r}")
+
+    text = None
+    if inputs["text"] is not None:
+        target = inputs["text"]["target"]
+        if target not in lcf.PANEL_NAMES:
+            raise ValueError(f"unknown text target {target!r}")
+        content = inputs["text"]["content"]
+        if not content:
+            raise ValueError("text is empty")
+        font_size = inputs["text"]["font_size"]
+        if font_size is None:
+            font_size = lcf.calculate_auto_font_size(content, *layout.sizes[target])
+        text = SimpleNamespace(content=content, target=target, font_size=font_size)
+    return layout, art, text
+
+def _previous_blocks(built, path):
+    """{stage: (key, start, end)} of the last build, or {} if the SVG on disk is not that build."""
+    if not built:
+        return {}
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {}
+    if st.st_size != built["size"] or st.st_mtime_ns != built["mtime_ns"]:
+        return {}
+    return {b["stage"]: (b["key"], b["start"], b["end"]) for b in built["blocks"]}
+
+def _copy_range(src, dst, start, end):
+    src.seek(start)
+    left = end - start
+    while left > 0:
+        chunk = src.read(min(COPY_CHUNK, left))
+        if not chunk:
+            raise ValueError("previous output is shorter than its project record")
+        dst.write(chunk)
+        left -= len(chunk)
+
+def build(project, project_path=None, full=False):
+    """
+    Brings the project's SVG up to date with its inputs, reusing unchanged
+    blocks of the previous output unless full=True. Updates project["built"]
+    (save it with save_project) and returns
+    SimpleNamespace(path, stages, elapsed) where stages is a list of
+    (stage, "rendered" | "reused", seconds).
+    """
+    t_start = time.perf_counter()
+    inputs = project["inputs"]
+    path = output_path(project, project_path)
+    layout, art, text = resolve_inputs(inputs)
+
+    built = project.get("built")
+    art_file = None
+    if art is not None:
+        known = built.get("art_file") if built else None
+        if known and known.get("path") != os.path.abspath(art.path):
+            known = None
+        art_file = file_hash(art.path, known)
+        art_file["path"] = os.path.abspath(art.path)
+
+    keys = stage_keys(inputs, layout, path, art_file)
+    previous = {} if full else _previous_blocks(built, path)
+    old_keys = built.get("keys", {}) if previous else {}
+
+    panels = None
+    hashes = built.get("panels") if previous else None
+    if keys["geometry"] != old_keys.get("geometry") or previous.get("cut", (None,))[0] != keys["cut"]:
+        panels = lcf.generate_box_panels(inputs["width"], inputs["height"], inputs["length"],
+                                         mt=inputs["material_thickness"], tw=inputs["tab_width"])
+        if keys["geometry"] != old_keys.get("geometry"):
+            polygon_check.require_valid(polygon_check.check_box(panels, layout, mt=inputs["material_thickness"]),
+                                        os.path.basename(path))
+        hashes = panel_hashes(panels)
+
+    renderers = {
+        "header": lambda f: lcf.write_svg_header(f, layout),
+        "cut": lambda f: lcf.write_cut_block(f, panels, layout, inputs["optimise_order"], inputs["outline_format"],
+                                             inputs["precision"], inputs["expand_instances"]),
+        "art": lambda f: lcf.write_art_block(f, art, layout, path, inputs["image_mode"]),
+        "text": lambda f: lcf.write_text_block(f, text, layout),
+        "footer": lambda f: f.write(lcf.SVG_FOOTER),
+    }
+
+    stages = []
+    blocks = []
+    old = open(path, "rb") if previous else None
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            out = profiling.wrap_file(io.TextIOWrapper(raw, encoding="utf-8", write_through=True))
+            for stage in STAGES:
+                if keys[stage] is None:
+                    continue
+                t0 = time.perf_counter()
+                start = raw.tell()
+                if stage in previous and previous[stage][0] == keys[stage]:
+                    _copy_range(old, profiling.wrap_file(raw), previous[stage][1], previous[stage][2])
+                    how = "reused"
+                else:
+                    renderers[stage](out)
+                    out.flush()
+                    how = "rendered"
+                blocks.append({"stage": stage, "key": keys[stage], "start": start, "end": raw.tell()})
+                stages.append((stage, how, time.perf_counter() - t0))
+            out.detach()
+        _replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    finally:
+        if old is not None:
+            old.close()
+
+    st = os.stat(path)
+    project["built"] = {
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "keys": keys,
+        "blocks": blocks,
+        "panels": hashes,
+        "art_file": art_file,
+    }
+    return SimpleNamespace(path=path, stages=stages, elapsed=time.perf_counter() - t_start)
+
+def build_from_prompts(length, width, height, art, text, project_path):
+    """
+    Project for the answers to the laser_cutting_fixed.py prompts
+    (lcf.prompt_box): builds its SVG in full and saves the project file.
+    art/text are the prompt results (or None); a text size that was not
+    typed in is stored as None so rebuilds recompute it.
+    """
+    project = new_project(length, width, height)
+    if art is not None:
+        project["inputs"]["art"] = {"path": os.path.abspath(art.path), "target": art.target}
+    if text is not None:
+        project["inputs"]["text"] = {"content": text.content, "target": text.target,
+                                     "font_size": None if text.auto_size else text.font_size}
+    result = build(project, project_path, full=True)
+    save_project(project, project_path)
+    return result
+
+def print_build_report(result):
+    print("=" * 60)
+    print("PROJECT BUILD:")
+    print("=" * 60)
+    for stage, how, seconds in result.stages:
+        print(f"  {stage:<8} {how:<9} {seconds * 1000:8.2f} ms")
+    print(f"  Total:   {result.elapsed * 1000:.2f} ms -> {result.path}")
+    print("=" * 60)
+
+# =========================
+# CLI
+# =========================
+def apply_args(project, args):
+    """Copies the CLI options that were given into project["inputs"]."""
+    inputs = project["inputs"]
+    for name in ("length", "width", "height", "output"):
+        if getattr(args, name) is not None:
+            inputs[name] = getattr(args, name)
+    if args.mt is not None:
+        inputs["material_thickness"] = args.mt
+    if args.tw is not None:
+        inputs["tab_width"] = args.tw
+    if args.optimise_order is not None:
+        inputs["optimise_order"] = args.optimise_order
+    if args.link_image is not None:
+        inputs["image_mode"] = "link" if args.link_image else "embed"
+    if args.compact is not None:
+        inputs["outline_format"] = "path" if args.compact else "polygon"
+    if args.precision is not None:
+        inputs["precision"] = args.precision
+    if args.expand_instances is not None:
+        inputs["expand_instances"] = args.expand_instances
+
+    if args.no_art:
+        inputs["art"] = None
+    elif args.art is not None or args.art_target is not None:
+        art = dict(inputs["art"] or {"path": None, "target": "FRONT"})
+        if args.art is not None:
+            art["path"] = os.path.abspath(args.art)  # reruns may start from another directory
+        if args.art_target is not None:
+            art["target"] = args.art_target.upper()
+        if art["path"] is None:
+            raise ValueError("--art-target needs an image (--art)")
+        inputs["art"] = art
+
+    if args.no_text:
+        inputs["text"] = None
+    elif args.text is not None or args.text_target is not None or args.font_size is not None:
+        text = dict(inputs["text"] or {"content": None, "target": "FRONT", "font_size": None})
+        if args.text is not None:
+            text["content"] = args.text
+        if args.text_target is not None:
+            text["target"] = args.text_target.upper()
+        if args.font_size is not None:
+            text["font_size"] = args.font_size if args.font_size > 0 else None
+        if text["content"] is None:
+            raise ValueError("--text-target/--font-size need text (--text)")
+        inputs["text"] = text
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create or edit a box project and rebuild only what changed.")
+    parser.add_argument("project", help="project JSON file (created if missing)")
+    parser.add_argument("--prompt", action="store_true",
+                        help="start a new project from the laser_cutting_fixed.py questions")
+    parser.add_argument("--length", type=float)
+    parser.add_argument("--width", type=float)
+    parser.add_argument("--height", type=float)
+    parser.add_argument("--mt", type=float, help="material thickness (mm)")
+    parser.add_argument("--tw", type=float, help="tab width (mm)")
+    parser.add_argument("--output", help="SVG path, relative to the project file")
+    parser.add_argument("--art", help="PNG to raster engrave")
+    parser.add_argument("--art-target", help="panel for the image")
+    parser.add_argument("--no-art", action="store_true")
+    parser.add_argument("--text", help="text to vector engrave")
+    parser.add_argument("--text-target", help="panel for the text")
+    parser.add_argument("--font-size", type=float, help="mm, 0 for the automatic size")
+    parser.add_argument("--no-text", action="store_true")
+    parser.add_argument("--optimise-order", action=argparse.BooleanOptionalAction, default=None)
+    parser.add_argument("--link-image", action=argparse.BooleanOptionalAction, default=None)
+    parser.add_argument("--compact", action=argparse.BooleanOptionalAction, default=None)
+    parser.add_argument("--precision", type=int, choices=range(lcf.MAX_PATH_PRECISION + 1))
+    parser.add_argument("--expand-instances", action=argparse.BooleanOptionalAction, default=None)
+    parser.add_argument("--full", action="store_true", help="ignore the previous output and rebuild everything")
+    args = parser.parse_args(argv)
+
+    if args.prompt:
+        box = lcf.prompt_box()
+        try:
+            result = build_from_prompts(box.length, box.width, box.height, box.art, box.text, args.project)
+        except (OSError, ValueError) as e:
+            print(f"Could not build: {e}")
+            return 1
+        lcf.print_assembly_guide(box.art, box.text)
+        print_build_report(result)
+        return 0
+
+    try:
+        if os.path.exists(args.project):
+            project = load_project(args.project)
+        else:
+            if None in (args.length, args.width, args.height):
+                print(f"{args.project} does not exist yet: give --length, --width and --height")
+                return 1
+            project = new_project(args.length, args.width, args.height)
+        apply_args(project, args)
+        result = build(project, args.project, full=args.full)
+    except (OSError, ValueError) as e:
+        print(f"Could not build: {e}")
+        return 1
+
+    save_project(project, args.project)
+    print_build_report(result)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
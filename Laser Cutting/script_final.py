@@ -9,6 +9,8 @@
 import base64
 import os
 
+import laser_cutting_fixed as lcf
+
 # =========================
 # Gather Input
 # =========================
@@ -31,6 +33,11 @@ if stroke_width <= 0:
     print("Invalid input. Stroke width must be greater than 0.")
     exit()
 
+# Identical outlines (lcf.outline_symbols compares the points themselves)
+# are written once as a <symbol> and placed with <use>. Set to True for
+# laser software that does not understand <use>.
+expand_instances = False
+
 # =========================
 # Layout sizing
 # =========================
@@ -243,10 +250,6 @@ rect_pts_B = generate_panel(w, h, EDGE_MAP_RECT)
 # squares: slots start on ODD segments so they align to rect odd tabs
 square_pts = generate_panel(w, w, EDGE_MAP_SQUARE, slot_parity=1)
 
-rect_points_str_A = points_to_polyline(rect_pts_A)
-rect_points_str_B = points_to_polyline(rect_pts_B)
-square_points_str = points_to_polyline(square_pts)
-
 # =========================
 # Ask for optional PNG artwork
 # =========================
@@ -328,32 +331,33 @@ file.write('<svg xmlns="http://www.w3.org/2000/svg" version="1.1" ')
 file.write('xmlns:xlink="http://www.w3.org/1999/xlink" ')
 file.write(f'viewBox="0 0 {view_w} {view_h}" width="{view_w}mm" height="{view_h}mm">\n')
 
+# ---- Outlines, once each ----
+panel_outlines = [
+    ("A1", rect_pts_A),
+    ("A2", rect_pts_B),
+    ("B1", rect_pts_B),
+    ("B2", rect_pts_A),
+    ("S1", square_pts),
+    ("S2", square_pts),
+]
+if not expand_instances:
+    symbol_ids, symbols = lcf.outline_symbols([pts for _name, pts in panel_outlines])
+    file.write('  <defs>\n')
+    symbol_boxes = {sid: lcf.write_symbol(file, sid, pts) for sid, pts in symbols.items()}
+    file.write('  </defs>\n')
+
 # ---- CUT LINES group (red) ----
 file.write(f'  <g stroke="red" stroke-width="{stroke_width}" fill="none">\n')
 
-file.write(f'    <g transform="translate({panel_centers["A1"][0]}, {panel_centers["A1"][1]})">\n')
-file.write(f'      <polygon points="{rect_points_str_A}" />\n')
-file.write('    </g>\n')
-
-file.write(f'    <g transform="translate({panel_centers["A2"][0]}, {panel_centers["A2"][1]})">\n')
-file.write(f'      <polygon points="{rect_points_str_B}" />\n')
-file.write('    </g>\n')
-
-file.write(f'    <g transform="translate({panel_centers["B1"][0]}, {panel_centers["B1"][1]})">\n')
-file.write(f'      <polygon points="{rect_points_str_B}" />\n')
-file.write('    </g>\n')
-
-file.write(f'    <g transform="translate({panel_centers["B2"][0]}, {panel_centers["B2"][1]})">\n')
-file.write(f'      <polygon points="{rect_points_str_A}" />\n')
-file.write('    </g>\n')
-
-file.write(f'    <g transform="translate({panel_centers["S1"][0]}, {panel_centers["S1"][1]})">\n')
-file.write(f'      <polygon points="{square_points_str}" />\n')
-file.write('    </g>\n')
-
-file.write(f'    <g transform="translate({panel_centers["S2"][0]}, {panel_centers["S2"][1]})">\n')
-file.write(f'      <polygon points="{square_points_str}" />\n')
-file.write('    </g>\n')
+for i, (name, pts) in enumerate(panel_outlines):
+    transform = f"translate({panel_centers[name][0]}, {panel_centers[name][1]})"
+    if not expand_instances:
+        sid = symbol_ids[i]
+        file.write(f'    {lcf.use_tag(sid, symbol_boxes[sid], transform)}\n')
+        continue
+    file.write(f'    <g transform="{transform}">\n')
+    file.write(f'      <polygon points="{points_to_polyline(pts)}" />\n')
+    file.write('    </g>\n')
 
 file.write('  </g>\n')  # end cut group
 
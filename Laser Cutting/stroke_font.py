@@ -0,0 +1,196 @@
+#Vihaan Shah
+#UNI: vvs2119
+#MECE4606 Digital Manufacturing
+#Laser Cutting Project - SINGLE-STROKE FONT
+#
+# Built-in single-line font for engraving text, so the SVG/G-code carries
+# plain polylines instead of a <text> element the laser software has to
+# outline with whatever fonts are installed on the laser PC.
+#
+# Glyphs are the block style from the embroidery project (jef_final.py),
+# stored with their own width so narrow characters (I, 1, ., !) take less
+# room. Each glyph cell has y up, baseline at 0 and cap height 1.
+# Lowercase letters are drawn as small capitals. Characters with no glyph
+# (accented letters, emoji, ...) raise ValueError rather than being swapped
+# for a placeholder, so nothing is engraved that was not asked for.
+#
+# font_size means the same as the old SVG font-size (mm per em): the cap
+# height is CAP_HEIGHT * font_size, close to Arial's.
+
+from functools import lru_cache
+from types import SimpleNamespace
+
+CAP_HEIGHT = 0.7         # cap height as a fraction of font_size
+LETTER_GAP = 0.25        # space after each glyph, in cap heights
+SPACE_ADVANCE = 0.6      # advance of " ", in cap heights
+SMALL_CAPS = 0.75        # lowercase scale
+
+# =========================
+# Glyph table
+# =========================
+# {char: (width, strokes)} in cap-height units, y up
+GLYPHS = {}
+
+def _add(ch, width, strokes):
+    GLYPHS[ch] = (width, strokes)
+
+# --- Uppercase letters (block style, continuous strokes) ---
+_add("A", 1.0, [[(0, 0), (0, 1)], [(0, 1), (1, 1)], [(1, 1), (1, 0)], [(0, 0.5), (1, 0.5)]])
+_add("B", 0.8, [[(0, 0), (0, 1), (0.7, 1), (0.8, 0.9), (0.8, 0.6), (0.7, 0.5),
+                 (0, 0.5), (0.7, 0.5), (0.8, 0.4), (0.8, 0.1), (0.7, 0), (0, 0)]])
+_add("C", 1.0, [[(1, 1), (0.3, 1), (0, 0.7), (0, 0.3), (0.3, 0), (1, 0)]])
+_add("D", 1.0, [[(0, 0), (0, 1), (0.6, 1), (1, 0.7), (1, 0.3), (0.6, 0), (0, 0)]])
+_add("E", 1.0, [[(1, 1), (0, 1), (0, 0), (1, 0)], [(0, 0.5), (0.7, 0.5)]])
+_add("F", 1.0, [[(0, 0), (0, 1), (1, 1)], [(0, 0.5), (0.7, 0.5)]])
+_add("G", 1.0, [[(1, 1), (0.3, 1), (0, 0.7), (0, 0.3), (0.3, 0),
+                 (1, 0), (1, 0.5), (0.5, 0.5)]])
+_add("H", 1.0, [[(0, 0), (0, 1)], [(1, 0), (1, 1)], [(0, 0.5), (1, 0.5)]])
+_add("I", 0.6, [[(0, 1), (0.6, 1)], [(0.3, 1), (0.3, 0)], [(0, 0), (0.6, 0)]])
+_add("J", 0.7, [[(0.1, 1), (0.7, 1)], [(0.4, 1), (0.4, 0.2), (0.2, 0), (0, 0.2)]])
+_add("K", 1.0, [[(0, 0), (0, 1)], [(1, 1), (0, 0.5), (1, 0)]])
+_add("L", 1.0, [[(0, 1), (0, 0), (1, 0)]])
+_add("M", 1.0, [[(0, 0), (0, 1), (0.5, 0.5), (1, 1), (1, 0)]])
+_add("N", 1.0, [[(0, 0), (0, 1), (1, 0), (1, 1)]])
+_add("O", 1.0, [[(0, 0.3), (0, 0.7), (0.3, 1), (0.7, 1), (1, 0.7),
+                 (1, 0.3), (0.7, 0), (0.3, 0), (0, 0.3)]])
+_add("P", 1.0, [[(0, 0), (0, 1), (0.7, 1), (1, 0.8), (0.7, 0.5), (0, 0.5)]])
+_add("Q", 1.0, [[(0, 0.3), (0, 0.7), (0.3, 1), (0.7, 1), (1, 0.7),
+                 (1, 0.3), (0.7, 0), (0.3, 0), (0, 0.3)], [(0.6, 0.2), (1.0, -0.1)]])
+_add("R", 1.0, [[(0, 0), (0, 1), (0.7, 1), (1, 0.8), (0.7, 0.5), (0, 0.5)],
+                [(0.5, 0.5), (1, 0)]])
+_add("S", 1.0, [[(1, 1), (0.3, 1), (0, 0.8), (0.3, 0.5), (0.7, 0.5),
+                 (1, 0.2), (0.7, 0), (0, 0)]])
+_add("T", 1.0, [[(0, 1), (1, 1)], [(0.5, 1), (0.5, 0)]])
+_add("U", 1.0, [[(0, 1), (0, 0.3), (0.3, 0), (0.7, 0), (1, 0.3), (1, 1)]])
+_add("V", 1.0, [[(0, 1), (0.5, 0), (1, 1)]])
+_add("W", 1.0, [[(0, 1), (0.2, 0), (0.5, 0.6), (0.8, 0), (1, 1)]])
+_add("X", 1.0, [[(0, 1), (1, 0)], [(0, 0), (1, 1)]])
+_add("Y", 1.0, [[(0, 1), (0.5, 0.5), (1, 1)], [(0.5, 0.5), (0.5, 0)]])
+_add("Z", 1.0, [[(0, 1), (1, 1), (0, 0), (1, 0)]])
+
+# --- Digits ---
+_add("0", 1.0, [[(0, 0.3), (0, 0.7), (0.3, 1), (0.7, 1), (1, 0.7),
+                 (1, 0.3), (0.7, 0), (0.3, 0), (0, 0.3)]])
+_add("1", 0.6, [[(0.1, 0.8), (0.3, 1), (0.3, 0)], [(0, 0), (0.6, 0)]])
+_add("2", 1.0, [[(0, 0.8), (0.3, 1), (0.7, 1), (1, 0.8), (0, 0), (1, 0)]])
+_add("3", 1.0, [[(0, 0.8), (0.3, 1), (0.7, 1), (1, 0.8), (0.7, 0.5),
+                 (0.3, 0.5), (0.7, 0.5), (1, 0.2), (0.7, 0), (0.3, 0), (0, 0.2)]])
+_add("4", 1.0, [[(0, 1), (0, 0.5), (1, 0.5)], [(0.8, 1), (0.8, 0)]])
+_add("5", 1.0, [[(1, 1), (0, 1), (0, 0.5), (0.7, 0.5), (1, 0.3), (0.7, 0), (0, 0)]])
+_add("6", 1.0, [[(0.7, 1), (0.3, 1), (0, 0.7), (0, 0.3), (0.3, 0), (0.7, 0),
+                 (1, 0.3), (0.7, 0.5), (0, 0.5)]])
+_add("7", 1.0, [[(0, 1), (1, 1), (0.4, 0)]])
+_add("8", 1.0, [[(0.3, 0.5), (0, 0.3), (0.3, 0), (0.7, 0), (1, 0.3), (0.7, 0.5),
+                 (0.3, 0.5), (0, 0.7), (0.3, 1), (0.7, 1), (1, 0.7), (0.7, 0.5)]])
+_add("9", 1.0, [[(0.3, 0), (0.7, 0), (1, 0.3), (1, 0.7), (0.7, 1), (0.3, 1),
+                 (0, 0.7), (0.3, 0.5), (1, 0.5)]])
+
+# --- Punctuation ---
+_add(".", 0.2, [[(0, 0), (0.2, 0), (0.2, 0.1), (0, 0.1), (0, 0)]])
+_add(",", 0.2, [[(0.2, 0.1), (0.2, 0), (0, -0.2)]])
+_add(":", 0.2, [[(0, 0.6), (0.2, 0.6), (0.2, 0.7), (0, 0.7), (0, 0.6)],
+                [(0, 0), (0.2, 0), (0.2, 0.1), (0, 0.1), (0, 0)]])
+_add(";", 0.2, [[(0, 0.6), (0.2, 0.6), (0.2, 0.7), (0, 0.7), (0, 0.6)],
+                [(0.2, 0.1), (0.2, 0), (0, -0.2)]])
+_add("!", 0.1, [[(0.05, 1), (0.05, 0.3)], [(0.05, 0.1), (0.05, 0)]])
+_add("?", 0.8, [[(0, 0.8), (0.2, 1), (0.6, 1), (0.8, 0.8), (0.8, 0.6), (0.4, 0.4), (0.4, 0.25)],
+                [(0.4, 0.1), (0.4, 0)]])
+_add("'", 0.1, [[(0.05, 1), (0.05, 0.75)]])
+_add('"', 0.4, [[(0.05, 1), (0.05, 0.75)], [(0.35, 1), (0.35, 0.75)]])
+_add("-", 0.6, [[(0, 0.5), (0.6, 0.5)]])
+_add("_", 1.0, [[(0, -0.1), (1, -0.1)]])
+_add("+", 0.8, [[(0, 0.5), (0.8, 0.5)], [(0.4, 0.1), (0.4, 0.9)]])
+_add("=", 0.8, [[(0, 0.65), (0.8, 0.65)], [(0, 0.35), (0.8, 0.35)]])
+_add("/", 0.7, [[(0, 0), (0.7, 1)]])
+_add("(", 0.4, [[(0.4, 1.1), (0.1, 0.8), (0, 0.5), (0.1, 0.2), (0.4, -0.1)]])
+_add(")", 0.4, [[(0, 1.1), (0.3, 0.8), (0.4, 0.5), (0.3, 0.2), (0, -0.1)]])
+_add("<", 0.7, [[(0.7, 0.9), (0, 0.5), (0.7, 0.1)]])
+_add(">", 0.7, [[(0, 0.9), (0.7, 0.5), (0, 0.1)]])
+_add("&", 1.0, [[(1, 0), (0.2, 0.7), (0.3, 1), (0.6, 1), (0.7, 0.8), (0, 0.3),
+                 (0.2, 0), (0.6, 0), (1, 0.4)]])
+_add("#", 1.0, [[(0.3, 0), (0.4, 1)], [(0.6, 0), (0.7, 1)], [(0, 0.65), (1, 0.65)], [(0, 0.35), (1, 0.35)]])
+
+def glyph(ch):
+    """(width, strokes, scale) for ch; lowercase maps to small capitals."""
+    if ch in GLYPHS:
+        return GLYPHS[ch][0], GLYPHS[ch][1], 1.0
+    upper = ch.upper()
+    if upper != ch and upper in GLYPHS:
+        return GLYPHS[upper][0], GLYPHS[upper][1], SMALL_CAPS
+    raise ValueError(f"no engraving glyph for {ch!r}")
+
+def unsupported(text):
+    """Characters of text the font cannot draw, in order of first use."""
+    missing = []
+    for ch in text:
+        if ch != " " and ch not in GLYPHS and ch.upper() not in GLYPHS and ch not in missing:
+            missing.append(ch)
+    return missing
+
+def check_text(text):
+    """ValueError naming every character of text the font cannot draw."""
+    missing = unsupported(text)
+    if missing:
+        raise ValueError(f"The engraving font has no glyph for {', '.join(map(repr, missing))}.")
+
+# =========================
+# Sized glyphs (cached)
+# =========================
+@lru_cache(maxsize=4096)
+def glyph_paths(ch, font_size):
+    """
+    One character at font_size, in mm with y down (SVG), origin at the left
+    end of the baseline. Returns (width, advance, strokes) with strokes a
+    tuple of tuples of (x, y). Cached per (character, size).
+    """
+    if ch == " ":
+        return 0.0, SPACE_ADVANCE * CAP_HEIGHT * font_size, ()
+    width, strokes, scale = glyph(ch)
+    k = CAP_HEIGHT * font_size * scale
+    sized = tuple(tuple((x * k, -y * k) for x, y in stroke) for stroke in strokes)
+    return width * k, (width + LETTER_GAP) * CAP_HEIGHT * font_size * scale, sized
+
+def text_width(text, font_size):
+    """
+    Exact ink width of a line: from the left edge of the first glyph to the
+    right edge of the last one (gaps and spaces at either end not counted).
+    Raises ValueError for characters the font cannot draw.
+    """
+    check_text(text)
+    x = 0.0
+    left = None
+    right = 0.0
+    for ch in text:
+        width, advance, strokes = glyph_paths(ch, font_size)
+        if strokes:
+            if left is None:
+                left = x
+            right = x + width
+        x += advance
+    return 0.0 if left is None else right - left
+
+def text_height(font_size):
+    return CAP_HEIGHT * font_size
+
+def render_text(text, font_size, cx, cy):
+    """
+    Lays the line out centred on (cx, cy) (cap height centred vertically).
+    Returns SimpleNamespace(paths, width, height) where paths is a list of
+    polylines (lists of (x, y)) in mm, in writing order.
+    Raises ValueError for characters the font cannot draw.
+    """
+    width = text_width(text, font_size)
+    height = text_height(font_size)
+    x = cx - width / 2.0
+    baseline = cy + height / 2.0
+
+    # Leading spaces are not ink, so the first glyph starts at the left edge
+    x -= sum(glyph_paths(ch, font_size)[1] for ch in text[:len(text) - len(text.lstrip(" "))])
+
+    paths = []
+    for ch in text:
+        _width, advance, strokes = glyph_paths(ch, font_size)
+        for stroke in strokes:
+            paths.append([(x + sx, baseline + sy) for sx, sy in stroke])
+        x += advance
+    return SimpleNamespace(paths=paths, width=width, height=height)
@@ -0,0 +1,297 @@
+#Vihaan Shah
+#UNI: vvs2119
+#MECE4606 Digital Manufacturing
+#Laser Cutting Project - MULTI-SHEET TILING FOR ONE BOX
+#
+# laser_cutting_fixed.py puts all six panels on one canvas about
+# 3 * w + 2 * gap wide, so faces of 600 mm give a canvas over 2 m wide that
+# no laser bed can take. This splits one box's panels across as few
+# bed-sized sheets as possible and writes one SVG per sheet plus a
+# manifest.json saying which panel went where. Art and text engraving move
+# (and turn) with the panel they belong to.
+#
+# Assignment of panels to sheets:
+#   - first-fit-decreasing: nesting.nest_parts (largest part first, first
+#     sheet with room, skyline placement)
+#   - exact search, for up to EXACT_LIMIT parts: every way of grouping the
+#     parts is tried (branch and bound, largest part first), stopping as
+#     soon as the area lower bound is reached. A group counts as fitting
+#     one sheet when nest_parts can place all of it with some choice of
+#     orientations: its own choice first, then every turned/not-turned
+#     combination of the group's parts. So "exact" is exact over the
+#     grouping and orientations, with the same packer placing each sheet.
+#
+# Usage:
+#   python tiling.py --length 600 --width 600 --height 600 --bed 600x400 --out tiles
+#   python tiling.py --check   (known boxes that must reach their sheet count)
+#   python tiling.py --project gcode_file.project.json --bed 1000x600 --out tiles
+
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import laser_cutting_fixed as lcf
+import nesting
+import project
+
+EXACT_LIMIT = 10
+
+# (length, width, height, bed) -> sheets the exact search must reach
+KNOWN_CASES = [
+    ((350, 300, 250), (600, 400), 3),
+    ((600, 600, 600), (1000, 700), 6),
+]
+
+# =========================
+# Assignment
+# =========================
+def usable_area(sheet_w, sheet_h, margin):
+    return max(0.0, sheet_w - 2 * margin) * max(0.0, sheet_h - 2 * margin)
+
+def sheet_lower_bound(parts, sheet_w, sheet_h, margin):
+    """No packing can use fewer sheets than total part area / usable sheet area."""
+    if not parts:
+        return 0
+    return max(1, math.ceil(sum(p.area for p in parts) / usable_area(sheet_w, sheet_h, margin) - 1e-9))
+
+def _renumber(sheets):
+    """nest_parts numbers each packing's sheets from 0; make them 0..n-1 across groups."""
+    for i, s in enumerate(sheets):
+        s.index = i
+        for p in s.placements:
+            p.sheet = i
+    return sheets
+
+def exact_groups(parts, fits, upper, lower_bound=1):
+    """
+    Fewest groups of part indices such that fits(frozenset) holds for each,
+    by branch and bound. upper is a known solution (list of sets) to beat;
+    it is returned unchanged if nothing better exists. The search stops at
+    the first solution with lower_bound groups.
+    """
+    order = sorted(range(len(parts)), key=lambda i: parts[i].area, reverse=True)
+    best = [list(map(set, upper))]
+    groups = []
+
+    def search(k):
+        if len(groups) >= len(best[0]) or len(best[0]) <= lower_bound:
+            return
+        if k == len(order):
+            best[0] = [set(g) for g in groups]
+            return
+        i = order[k]
+        for g in groups:
+            g.add(i)
+            if fits(frozenset(g)):
+                search(k + 1)
+            g.discard(i)
+        # A new sheet for this part
+        groups.append({i})
+        search(k + 1)
+        groups.pop()
+
+    search(0)
+    return best[0]
+
+def fit_one_sheet(parts, sheet_w, sheet_h, spacing=3.0, margin=5.0, allow_rotate=True):
+    """
+    One sheet holding all of parts, or None. nest_parts picks each part's
+    orientation greedily, which can block a later part; when it fails, every
+    turned/not-turned combination of the non-square parts is tried.
+    """
+    if sum(p.area for p in parts) > usable_area(sheet_w, sheet_h, margin):
+        return None
+    trial = nesting.nest_parts(parts, sheet_w, sheet_h, spacing=spacing, margin=margin,
+                               allow_rotate=allow_rotate, max_sheets=1)
+    if not trial.unplaced:
+        return trial.sheets[0]
+    if not allow_rotate:
+        return None
+    turnable = [p.id for p in parts if abs(p.w - p.h) > 1e-9]
+    for combo in itertools.product((False, True), repeat=len(turnable)):
+        trial = nesting.nest_parts(parts, sheet_w, sheet_h, spacing=spacing, margin=margin, max_sheets=1,
+                                   turned=dict(zip(turnable, combo)))
+        if not trial.unplaced:
+            return trial.sheets[0]
+    return None
+
+def tile_parts(parts, sheet_w, sheet_h, spacing=3.0, margin=5.0, allow_rotate=True, exact=True,
+               exact_limit=EXACT_LIMIT):
+    """
+    Packs parts onto the fewest sheet_w x sheet_h sheets found.
+    exact=True runs the exact grouping search when there are at most
+    exact_limit parts and first-fit-decreasing did not already reach the
+    lower bound.
+    Returns SimpleNamespace(sheets, unplaced, utilisation, method,
+    lower_bound, ffd_sheets, groups_tried, elapsed).
+    """
+    t0 = time.perf_counter()
+    pack = lambda group: nesting.nest_parts(group, sheet_w, sheet_h, spacing=spacing, margin=margin,
+                                            allow_rotate=allow_rotate)
+    ffd = pack(parts)
+    result = SimpleNamespace(sheets=ffd.sheets, unplaced=ffd.unplaced, method="first-fit-decreasing",
+                             lower_bound=sheet_lower_bound(parts, sheet_w, sheet_h, margin),
+                             ffd_sheets=len(ffd.sheets), groups_tried=0)
+
+    # Parts that do not fit an empty sheet are left out of the search
+    placeable = [p for p in parts if p not in ffd.unplaced]
+    if exact and placeable and len(placeable) <= exact_limit and len(ffd.sheets) > result.lower_bound:
+        index = {p.id: i for i, p in enumerate(placeable)}
+        ffd_groups = [{index[pl.id] for pl in s.placements} for s in ffd.sheets]
+
+        # group -> the sheet that holds it, or None
+        cache = {}
+        def fits(group):
+            if group not in cache:
+                cache[group] = fit_one_sheet([placeable[i] for i in sorted(group)], sheet_w, sheet_h,
+                                             spacing=spacing, margin=margin, allow_rotate=allow_rotate)
+            return cache[group] is not None
+
+        groups = exact_groups(placeable, fits, ffd_groups, result.lower_bound)
+        result.groups_tried = len(cache)
+        if len(groups) < len(ffd.sheets):
+            # Single-part groups were never tried; they go on a sheet of their own
+            result.sheets = [cache.get(frozenset(g)) or pack([placeable[i] for i in sorted(g)]).sheets[0]
+                             for g in groups]
+            result.method = "exact"
+
+    _renumber(result.sheets)
+    used = sum(s.part_area for s in result.sheets)
+    total = sheet_w * sheet_h * len(result.sheets)
+    result.utilisation = used / total if total else 0.0
+    result.elapsed = time.perf_counter() - t0
+    return result
+
+def tile_box(w, h, d, sheet_w, sheet_h, mt=lcf.mt, tw=lcf.tw, **options):
+    """tile_parts for the six panels of one box (parts labelled by panel name)."""
+    panels = lcf.generate_box_panels(w, h, d, mt=mt, tw=tw)
+    parts = [nesting.make_part(name, panels[name], box="box", panel=name) for name in lcf.PANEL_NAMES]
+    return tile_parts(parts, sheet_w, sheet_h, **options)
+
+# =========================
+# Output
+# =========================
+def write_tiles(result, out_dir, layout=None, art=None, text=None, image_mode="embed", **svg_options):
+    """
+    One SVG per sheet (sheet_001.svg, ...) plus manifest.json in out_dir.
+    svg_options go to nesting.write_sheet_svg. Returns the manifest dict.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    sheets = []
+    for s in result.sheets:
+        name = f"sheet_{s.index + 1:03d}.svg"
+        nesting.write_sheet_svg(os.path.join(out_dir, name), s, art=art, text=text, layout=layout,
+                                image_mode=image_mode, **svg_options)
+        sheets.append({
+            "file": name,
+            "width": s.width,
+            "height": s.height,
+            "utilisation": s.utilisation,
+            "parts": [{
+                "panel": p.panel,
+                "x": p.x,
+                "y": p.y,
+                "w": p.w,
+                "h": p.h,
+                "rotated": p.rotated,
+                "transform": p.transform,
+                "engrave": [kind for kind, item in (("art", art), ("text", text))
+                            if item is not None and item.target == p.panel],
+            } for p in s.placements],
+        })
+    manifest = {
+        "method": result.method,
+        "sheet_count": len(result.sheets),
+        "lower_bound": result.lower_bound,
+        "first_fit_decreasing_sheets": result.ffd_sheets,
+        "utilisation": result.utilisation,
+        "sheets": sheets,
+        "unplaced": [p.panel for p in result.unplaced],
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def print_tiling_report(result, bed):
+    print("=" * 60)
+    print(f"TILING ON A {bed[0]:g} x {bed[1]:g} mm BED:")
+    print("=" * 60)
+    for s in result.sheets:
+        parts = ", ".join(p.panel + (" (turned)" if p.rotated else "") for p in s.placements)
+        print(f"  Sheet {s.index + 1}: {parts}  [{s.utilisation * 100:.1f}% used]")
+    print("-" * 60)
+    print(f"  Sheets:      {len(result.sheets)} ({result.method}; first-fit-decreasing {result.ffd_sheets}, "
+          f"lower bound {result.lower_bound})")
+    if result.groups_tried:
+        print(f"  Exact search: {result.groups_tried} panel groups tried")
+    print(f"  Utilisation: {result.utilisation * 100:.1f}%")
+    print(f"  Time:        {result.elapsed * 1000:.1f} ms")
+    if result.unplaced:
+        print(f"  Larger than the bed: {', '.join(p.panel for p in result.unplaced)}")
+    print("=" * 60)
+
+def check():
+    """Tiles every KNOWN_CASES box; returns the (box, bed, expected, got) that missed."""
+    missed = []
+    for (length, width, height), (bed_w, bed_h), expected in KNOWN_CASES:
+        result = tile_box(width, height, length, bed_w, bed_h)
+        print(f"  {length:g} x {width:g} x {height:g} on {bed_w:g} x {bed_h:g}: "
+              f"{len(result.sheets)} sheet(s), expected {expected} ({result.method})")
+        if len(result.sheets) != expected:
+            missed.append(((length, width, height), (bed_w, bed_h), expected, len(result.sheets)))
+    return missed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Split one box's panels across bed-sized sheets.")
+    parser.add_argument("--project", default=None, help="project file (project.py); takes the box, art and text from it")
+    parser.add_argument("--length", type=float)
+    parser.add_argument("--width", type=float)
+    parser.add_argument("--height", type=float)
+    parser.add_argument("--bed", type=nesting.parse_sheet_size, default=(600.0, 400.0), help="bed size in mm, e.g. 600x400")
+    parser.add_argument("--spacing", type=float, default=3.0, help="gap between parts (mm)")
+    parser.add_argument("--margin", type=float, default=5.0, help="clear border around each sheet (mm)")
+    parser.add_argument("--no-rotate", action="store_true", help="do not turn panels by 90 degrees")
+    parser.add_argument("--no-exact", action="store_true", help="first-fit-decreasing only")
+    parser.add_argument("--compact", action="store_true", help="write outlines as compact relative <path> data")
+    parser.add_argument("--out", default="tiles", help="output directory for the sheets and manifest.json")
+    parser.add_argument("--check", action="store_true", help="tile the known boxes and compare sheet counts")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        return 1 if check() else 0
+
+    try:
+        if args.project:
+            inputs = project.load_project(args.project)["inputs"]
+            layout, art, text = project.resolve_inputs(inputs)
+            w, h, d = inputs["width"], inputs["height"], inputs["length"]
+            mt, tw = inputs["material_thickness"], inputs["tab_width"]
+            image_mode = inputs["image_mode"]
+        else:
+            if None in (args.length, args.width, args.height):
+                print("Give --project or --length, --width and --height")
+                return 1
+            lcf.validate_box_dimensions(args.length, args.width, args.height)
+            w, h, d, mt, tw = args.width, args.height, args.length, lcf.mt, lcf.tw
+            layout, art, text, image_mode = lcf.layout_box(w, h, d), None, None, "embed"
+
+        bed_w, bed_h = args.bed
+        result = tile_box(w, h, d, bed_w, bed_h, mt=mt, tw=tw, spacing=args.spacing, margin=args.margin,
+                          allow_rotate=not args.no_rotate, exact=not args.no_exact)
+        write_tiles(result, args.out, layout=layout, art=art, text=text, image_mode=image_mode,
+                    outline_format="path" if args.compact else "polygon")
+    except (OSError, ValueError) as e:
+        print(f"Could not tile: {e}")
+        return 1
+
+    print_tiling_report(result, args.bed)
+    print(f"\nWrote {len(result.sheets)} sheet(s) and manifest.json to {args.out}")
+    return 0 if not result.unplaced else 2
+
+if __name__ == "__main__":
+    sys.exit(main())